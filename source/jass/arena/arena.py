@@ -230,7 +230,6 @@ class Arena:
         for cards in range(36):
             player_rnd.set_from_round(self._rnd)
             card_action = self._players[player_rnd.player].play_card(player_rnd)
-            print(card_action)
             self._play_card_strat(card_action)
 
     def play_game(self):
@@ -246,11 +245,14 @@ class Arena:
         for game_id in range(self._nr_games_to_play):
             self.play_game()
             if self.nr_games_played % self._print_every_x_games == 0:
-                points_to_write = int(self.nr_games_played / self._nr_games_to_play * 40)
-                spaces_to_write = 40 - points_to_write
-                sys.stdout.write("\r[{}{}] {:4}/{:4} games played\n".format('.' * points_to_write,
-                                                                          ' ' * spaces_to_write,
-                                                                          self.nr_games_played,
-                                                                          self._nr_games_to_play))
+                self._print_progress()
         sys.stdout.write('\n')
 
+    def _print_progress(self) -> None:
+        points_to_write = int(self.nr_games_played / self._nr_games_to_play * 40)
+        spaces_to_write = 40 - points_to_write
+        sys.stdout.write("\r[{}{}] {:4}/{:4} games played\n".format('.' * points_to_write,
+                                                                  ' ' * spaces_to_write,
+                                                                  self.nr_games_played,
+                                                                  self._nr_games_to_play))
+
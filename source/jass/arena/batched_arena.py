@@ -0,0 +1,221 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Batched arena, which plays many games in lock-step to reduce the overhead per card for players that are cheap to
+evaluate or that can evaluate many rounds at once.
+"""
+import sys
+
+import numpy as np
+
+from source.jass.arena.arena import Arena
+from source.jass.arena.play_game_nr_rounds_strategy import PlayNrRoundsStrategy
+from source.jass.arena.trump_selection_strategy import TrumpStrategy
+from source.jass.base.batch_playout import get_valid_cards_batch, calc_winners_batch
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+
+
+class BatchedArena(Arena):
+    """
+    Arena that plays a batch of games at the same time. A game consists of a number of rounds, as with the
+    PlayNrRoundsStrategy.
+
+    All the rounds of a batch are played in lock-step, so the same number of cards is played in every round at each
+    step. The state of the rounds is kept in arrays (hands, tricks, points...) with the round as first dimension, and
+    the cards are played and the tricks evaluated by vectorized operations on all rounds (see
+    jass.base.batch_playout). At each step, the players are asked for the cards of all the rounds in which it is their
+    turn by one call of Player.play_cards_batch.
+
+    Trump is still determined for each round separately by the trump strategy. The rules of the batched operations
+    are the rules of Schieber, so only the Schieber jass types are supported.
+    """
+
+    def __init__(self, jass_type: str, trump_strategy: TrumpStrategy, nr_rounds: int = 4, batch_size: int = 64,
+                 print_every_x_games: int = 1, check_move_validity=True):
+        """
+        Args:
+            jass_type: the jass type, JASS_SCHIEBER_1000 or JASS_SCHIEBER_2500
+            trump_strategy: the strategy to determine trump
+            nr_rounds: the number of rounds in a game
+            batch_size: the number of games that are played at the same time
+            print_every_x_games: print the progress after this number of games (only after complete batches)
+            check_move_validity: check that the cards played by the players are valid
+        """
+        if jass_type not in [JASS_SCHIEBER_1000, JASS_SCHIEBER_2500]:
+            raise ValueError('Batched arena not supported for type of jass: {}'.format(jass_type))
+        super().__init__(jass_type, trump_strategy, PlayNrRoundsStrategy(nr_rounds),
+                         print_every_x_games=print_every_x_games, check_move_validity=check_move_validity)
+        self._nr_rounds = nr_rounds
+        self._batch_size = batch_size
+        self._check_move_validity = check_move_validity
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    def deal_cards_batch(self, nr_rounds: int) -> np.ndarray:
+        """
+        Deal the cards of a number of rounds randomly.
+
+        Args:
+            nr_rounds: the number of rounds
+
+        Returns:
+            the 1-hot encoded hands of the rounds, array of shape [nr_rounds, 4, 36]
+        """
+        cards = np.argsort(np.random.random([nr_rounds, 36]), axis=1)
+        hands = np.zeros([nr_rounds, 4, 36], dtype=np.int32)
+        rounds = np.arange(nr_rounds)[:, np.newaxis]
+        hands[rounds, np.arange(36)[np.newaxis, :] // 9, cards] = 1
+        return hands
+
+    def play_rounds_batch(self, dealer: int, nr_rounds: int) -> np.ndarray:
+        """
+        Play a number of complete rounds with the same dealer in lock-step.
+
+        Args:
+            dealer: the dealer of the rounds
+            nr_rounds: the number of rounds to play
+
+        Returns:
+            the points of team 0 and team 1 in each round, array of shape [nr_rounds, 2]
+        """
+        rounds = np.arange(nr_rounds)
+        hands = self.deal_cards_batch(nr_rounds)
+
+        # determine trump for each round, using a Round object so that the trump strategies can be used unchanged
+        trump = np.zeros(nr_rounds, dtype=np.int32)
+        player = np.zeros(nr_rounds, dtype=np.int32)
+        player_rnds = []
+        for i in rounds:
+            self._init_round(dealer)
+            self._rnd.set_hands(hands[i])
+            self._trump_strategy.determine_trump(rnd=self._rnd, arena=self)
+            trump[i] = self._rnd.trump
+            player[i] = self._rnd.player
+            player_rnds.append(PlayerRound(dealer=dealer, trump=self._rnd.trump, forehand=self._rnd.forehand,
+                                           declared_trump=self._rnd.declared_trump,
+                                           jass_type=self._jass_type, rule=self._rnd.rule))
+
+        # state of the rounds
+        tricks = np.full([nr_rounds, 9, 4], -1, dtype=np.int32)
+        trick_winner = np.full([nr_rounds, 9], -1, dtype=np.int32)
+        trick_points = np.zeros([nr_rounds, 9], dtype=np.int32)
+        trick_first_player = np.full([nr_rounds, 9], -1, dtype=np.int32)
+        trick_first_player[:, 0] = player
+        points = np.zeros([nr_rounds, 2], dtype=np.int32)
+
+        # the arrays of the player rounds are views into arrays for all rounds, which are copied from the state of
+        # the rounds at each step, so that the players can not change the state of the rounds
+        view_hand = np.zeros([nr_rounds, 36], dtype=np.int32)
+        view_tricks = np.zeros([nr_rounds, 9, 4], dtype=np.int32)
+        view_trick_winner = np.zeros([nr_rounds, 9], dtype=np.int32)
+        view_trick_points = np.zeros([nr_rounds, 9], dtype=np.int32)
+        view_trick_first_player = np.zeros([nr_rounds, 9], dtype=np.int32)
+        for i, player_rnd in enumerate(player_rnds):
+            player_rnd.hand = view_hand[i]
+            player_rnd.tricks = view_tricks[i]
+            player_rnd.trick_winner = view_trick_winner[i]
+            player_rnd.trick_points = view_trick_points[i]
+            player_rnd.trick_first_player = view_trick_first_player[i]
+
+        cards = np.zeros(nr_rounds, dtype=np.int32)
+        for nr_played_cards in range(36):
+            nr_tricks, nr_cards_in_trick = divmod(nr_played_cards, 4)
+            view_hand[:] = hands[rounds, player]
+            view_tricks[:] = tricks
+            view_trick_winner[:] = trick_winner
+            view_trick_points[:] = trick_points
+            view_trick_first_player[:] = trick_first_player
+            for i, player_rnd in enumerate(player_rnds):
+                player_rnd.player = int(player[i])
+                player_rnd.nr_tricks = nr_tricks
+                player_rnd.nr_cards_in_trick = nr_cards_in_trick
+                player_rnd.nr_played_cards = nr_played_cards
+                player_rnd.current_trick = view_tricks[i, nr_tricks]
+                player_rnd.points_team_0 = int(points[i, 0])
+                player_rnd.points_team_1 = int(points[i, 1])
+
+            for seat in range(4):
+                at_seat = np.flatnonzero(player == seat)
+                if len(at_seat) > 0:
+                    cards[at_seat] = self._players[seat].play_cards_batch([player_rnds[i] for i in at_seat])
+
+            if self._check_move_validity:
+                valid_cards = self._get_valid_cards(hands[rounds, player], tricks[:, nr_tricks], nr_cards_in_trick,
+                                                    trump)
+                invalid = np.flatnonzero(valid_cards[rounds, cards] == 0)
+                assert len(invalid) == 0, 'Invalid card played: {}, valid cards: {}'.format(
+                    cards[invalid[0]], np.flatnonzero(valid_cards[invalid[0]]))
+
+            hands[rounds, player, cards] = 0
+            tricks[:, nr_tricks, nr_cards_in_trick] = cards
+
+            if nr_cards_in_trick < 3:
+                player = (player + 3) % 4
+            else:
+                winner = self._calc_winners(tricks[:, nr_tricks], trick_first_player[:, nr_tricks], trump)
+                points_of_trick = card_values[trump[:, np.newaxis], tricks[:, nr_tricks]].sum(axis=1)
+                if nr_tricks == 8:
+                    points_of_trick += 5
+                trick_winner[:, nr_tricks] = winner
+                trick_points[:, nr_tricks] = points_of_trick
+                points[rounds, winner % 2] += points_of_trick
+                if nr_tricks < 8:
+                    trick_first_player[:, nr_tricks + 1] = winner
+                player = winner
+        return points
+
+    @staticmethod
+    def _get_valid_cards(hands: np.ndarray, tricks: np.ndarray, move_nr: int, trump: np.ndarray) -> np.ndarray:
+        valid_cards = np.zeros_like(hands)
+        for t in np.unique(trump):
+            with_trump = trump == t
+            valid_cards[with_trump] = get_valid_cards_batch(hands[with_trump], tricks[with_trump], move_nr, t)
+        return valid_cards
+
+    @staticmethod
+    def _calc_winners(tricks: np.ndarray, first_player: np.ndarray, trump: np.ndarray) -> np.ndarray:
+        winners = np.zeros(len(tricks), dtype=np.int32)
+        for t in np.unique(trump):
+            with_trump = trump == t
+            winners[with_trump] = calc_winners_batch(tricks[with_trump], first_player[with_trump], t)
+        return winners
+
+    def play_games_batch(self, nr_games: int) -> None:
+        """
+        Play a number of games at the same time and add the results to the statistics.
+
+        Args:
+            nr_games: the number of games
+        """
+        points = np.zeros([nr_games, 2], dtype=np.int32)
+        dealer = NORTH
+        for _ in range(self._nr_rounds):
+            points += self.play_rounds_batch(dealer, nr_games)
+            dealer = next_player[dealer]
+
+        for points_team_0, points_team_1 in points.tolist():
+            delta_points = points_team_0 - points_team_1
+            if points_team_0 > points_team_1:
+                self.add_win_team_0(delta_points)
+            elif points_team_1 > points_team_0:
+                self.add_win_team_1(delta_points)
+            else:
+                self.add_draw()
+
+    def play_all_games(self) -> None:
+        """
+        Play the number of games in batches.
+        """
+        nr_games_printed = 0
+        while self.nr_games_played < self._nr_games_to_play:
+            self.play_games_batch(min(self._batch_size, self._nr_games_to_play - self.nr_games_played))
+            if self.nr_games_played - nr_games_printed >= self._print_every_x_games or \
+                    self.nr_games_played == self._nr_games_to_play:
+                nr_games_printed = self.nr_games_played
+                self._print_progress()
+        sys.stdout.write('\n')
@@ -0,0 +1,176 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Duplicate arena, which plays every deal twice with the teams swapped, as in duplicate bridge.
+"""
+import sys
+
+import numpy as np
+
+from source.jass.arena.arena import Arena
+from source.jass.arena.paired_statistics import PairedStatistics
+from source.jass.arena.play_game_nr_rounds_strategy import PlayNrRoundsStrategy
+from source.jass.arena.sequential_testing import ConfidenceIntervalTest
+from source.jass.arena.trump_selection_strategy import TrumpStrategy
+from source.jass.base.const import *
+
+
+class DuplicateArena(Arena):
+    """
+    Arena in which each game consists of a number of seeded deals (rounds, with the dealer starting at NORTH as in
+    PlayNrRoundsStrategy), that are played twice: first with the players as set, then with the teams swapped, so that
+    each team plays the cards that the other team had in the first half.
+
+    The luck of the cards cancels out in the difference of the points of the two halves, so the result of a game is
+    the paired difference:
+        (points of team 0 - points of team 1 in the first half) + (points of team 0 - points of team 1 in the second
+        half, where team 0 plays the seats of team 1)
+    which has a much lower variance than the result of a game with random cards. A positive difference is a win for
+    team 0 (the players set at NORTH and SOUTH).
+
+    The deals of a game only depend on the seed and the number of the game, so two arenas with the same seed play
+    the same deals, for example to compare different players against the same opponents.
+
+    The statistics of the differences are kept in a PairedStatistics object. Optionally, the arena stops playing
+    games as soon as the confidence interval of the mean difference does not contain 0 (see ConfidenceIntervalTest).
+    As the interval is checked after every game, the probability to stop on a difference although the players are
+    equally strong is much higher than for a single interval: for differences without a real difference, an interval
+    of 95% checked from game 10 on excludes 0 at some point in about 34% of the runs of 100 games and 49% of the runs
+    of 1000 games. The interval used for the early stop has therefore a higher confidence of 99.9% by default, which
+    keeps this error at about 3% for 100 games and 4% for 1000 games.
+    """
+
+    def __init__(self, jass_type: str, trump_strategy: TrumpStrategy, nr_rounds: int = 4, seed: int = 0,
+                 confidence: float = 0.95, early_stop: bool = False, early_stop_confidence: float = 0.999,
+                 min_games: int = 10, print_every_x_games: int = 1, check_move_validity=True):
+        """
+        Args:
+            jass_type: the jass type
+            trump_strategy: the strategy to determine trump
+            nr_rounds: the number of deals in a game
+            seed: the seed, from which the deals are generated
+            confidence: the confidence level of the confidence interval
+            early_stop: stop when the mean difference is significant at the early stop confidence level
+            early_stop_confidence: the confidence level of the interval that is checked after every game for the
+            early stop
+            min_games: the minimal number of games before stopping early
+            print_every_x_games: print the progress after this number of games
+            check_move_validity: check that the cards played by the players are valid
+        """
+        super().__init__(jass_type, trump_strategy, PlayNrRoundsStrategy(nr_rounds),
+                         print_every_x_games=print_every_x_games, check_move_validity=check_move_validity)
+        self._nr_rounds = nr_rounds
+        self._seed = seed
+        self._confidence = confidence
+        self._early_stop = early_stop
+        self._early_stop_confidence = early_stop_confidence
+        self._min_games = min_games
+
+        # the deals of the current game and the number of the next deal
+        self._deals = None                              # type: np.ndarray
+        self._deal_nr = 0
+
+        self._statistics = PairedStatistics()
+        self._early_stop_test = ConfidenceIntervalTest(early_stop_confidence, min_games)
+
+    @property
+    def statistics(self) -> PairedStatistics:
+        return self._statistics
+
+    @property
+    def early_stop_test(self) -> ConfidenceIntervalTest:
+        return self._early_stop_test
+
+    @property
+    def mean_difference(self) -> float:
+        return self._statistics.mean
+
+    @property
+    def confidence_interval(self) -> (float, float):
+        return self._statistics.confidence_interval(self._confidence)
+
+    @property
+    def is_significant(self) -> bool:
+        return self._statistics.is_significant(self._confidence)
+
+    def reset_stat(self) -> None:
+        super().reset_stat()
+        self._statistics = PairedStatistics()
+        self._early_stop_test = ConfidenceIntervalTest(self._early_stop_confidence, self._min_games)
+
+    def generate_deals(self, game_id: int) -> np.ndarray:
+        """
+        Generate the deals of a game.
+
+        Args:
+            game_id: the number of the game
+
+        Returns:
+            the 1-hot encoded hands of the deals, array of shape [nr_rounds, 4, 36]
+        """
+        rng = np.random.default_rng([self._seed, game_id])
+        deals = np.zeros([self._nr_rounds, 4, 36], dtype=np.int32)
+        for deal in deals:
+            cards = rng.permutation(36)
+            for player in range(4):
+                deal[player, cards[player * 9:(player + 1) * 9]] = 1
+        return deals
+
+    def deal_cards(self):
+        """
+        Deal the cards of the next deal of the current game.
+        """
+        self._rnd.set_hands(self._deals[self._deal_nr])
+        self._deal_nr += 1
+
+    def _play_deals(self) -> int:
+        # play all deals of the game and return the points of team 0 minus the points of team 1
+        self._deal_nr = 0
+        delta_points = 0
+        dealer = NORTH
+        for _ in range(self._nr_rounds):
+            self.play_round(dealer)
+            delta_points += self._rnd.points_team_0 - self._rnd.points_team_1
+            dealer = next_player[dealer]
+        return delta_points
+
+    def play_game(self):
+        """
+        Play one game, i.e. the deals of the game once with the players as set and once with the teams swapped.
+        """
+        self._deals = self.generate_deals(self.nr_games_played)
+        players = list(self._players)
+
+        delta_points = self._play_deals()
+        # the players of team 1 take the seats of team 0 and vice versa
+        self._players = [players[EAST], players[NORTH], players[WEST], players[SOUTH]]
+        try:
+            delta_points -= self._play_deals()
+        finally:
+            self._players = players
+
+        self._statistics.add(delta_points)
+        if delta_points > 0:
+            self.add_win_team_0(delta_points)
+            self._early_stop_test.add_game(0, delta_points)
+        elif delta_points < 0:
+            self.add_win_team_1(delta_points)
+            self._early_stop_test.add_game(1, delta_points)
+        else:
+            self.add_draw()
+            self._early_stop_test.add_game(None, delta_points)
+
+    def play_all_games(self):
+        """
+        Play the number of games, or less if early stop is enabled and the difference is significant at the early
+        stop confidence level.
+        """
+        while self.nr_games_played < self._nr_games_to_play:
+            self.play_game()
+            if self.nr_games_played % self._print_every_x_games == 0:
+                self._print_progress()
+            if self._early_stop and self._early_stop_test.decision is not None:
+                break
+        sys.stdout.write('\n')
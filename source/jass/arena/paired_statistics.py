@@ -0,0 +1,77 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Statistics of paired comparisons, for example the differences of points in duplicate games.
+"""
+import math
+from statistics import NormalDist
+
+
+class PairedStatistics:
+    """
+    Running mean and variance of the paired differences (using Welford's algorithm) and the confidence interval of
+    the mean difference, using the normal approximation.
+    """
+
+    def __init__(self):
+        self._nr_samples = 0
+        self._mean = 0.0
+        # sum of the squared differences from the mean
+        self._m2 = 0.0
+
+    def add(self, difference: float) -> None:
+        """
+        Add the difference of a pair.
+        """
+        self._nr_samples += 1
+        delta = difference - self._mean
+        self._mean += delta / self._nr_samples
+        self._m2 += delta * (difference - self._mean)
+
+    @property
+    def nr_samples(self) -> int:
+        return self._nr_samples
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        """
+        Sample standard deviation of the differences, 0 for less than 2 samples.
+        """
+        if self._nr_samples < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self._nr_samples - 1))
+
+    @property
+    def std_error(self) -> float:
+        """
+        Standard error of the mean difference, infinite for less than 2 samples.
+        """
+        if self._nr_samples < 2:
+            return math.inf
+        return self.std / math.sqrt(self._nr_samples)
+
+    def confidence_interval(self, confidence: float = 0.95) -> (float, float):
+        """
+        Get the confidence interval of the mean difference.
+
+        Args:
+            confidence: the confidence level
+
+        Returns:
+            the lower and upper bound of the interval
+        """
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return self._mean - z * self.std_error, self._mean + z * self.std_error
+
+    def is_significant(self, confidence: float = 0.95) -> bool:
+        """
+        Returns true if the confidence interval of the mean difference does not contain 0.
+        """
+        low, high = self.confidence_interval(confidence)
+        return low > 0 or high < 0
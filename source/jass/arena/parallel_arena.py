@@ -0,0 +1,167 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Parallel arena, which plays the games of an arena in a pool of worker processes.
+
+Each worker process creates its own arena and players once (from factories, as the players can not be shared
+between processes) and then plays the games it is given. Every game is played with random generators seeded from
+the seed of the arena and the number of the game, so the results do not depend on the number of workers or on the
+order in which the games are played (as long as the players do not keep state between games).
+"""
+import logging
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+from source.jass.arena.arena import Arena
+from source.jass.player.player import Player
+
+# the arena of the worker process, created by _init_worker
+_worker_arena = None
+
+
+def game_seed(seed: int, game_id: int) -> int:
+    """
+    Get the seed of the random generators for a game.
+
+    Args:
+        seed: the seed of the arena
+        game_id: the number of the game
+
+    Returns:
+        the seed for the game
+    """
+    return int(np.random.SeedSequence([seed, game_id]).generate_state(1)[0])
+
+
+def _init_worker(arena_factory: Callable[[], Arena], player_factory: Callable[[], List[Player]]) -> None:
+    global _worker_arena
+    _worker_arena = arena_factory()
+    _worker_arena.set_players(*player_factory())
+
+
+def play_games(arena: Arena, seed: int, game_ids: List[int]) -> List[tuple]:
+    """
+    Play games in the arena, each with its own seed.
+
+    Args:
+        arena: the arena with the players set
+        seed: the seed of the parallel arena
+        game_ids: the numbers of the games to play
+
+    Returns:
+        a list with the game id, the winning team (0 or 1, None for a draw) and the delta points of each game
+    """
+    results = []
+    for game_id in game_ids:
+        seed_of_game = game_seed(seed, game_id)
+        np.random.seed(seed_of_game)
+        random.seed(seed_of_game)
+        arena.reset_stat()
+        arena.play_game()
+        if arena.nr_wins_team_0 == 1:
+            winner = 0
+        elif arena.nr_wins_team_1 == 1:
+            winner = 1
+        else:
+            winner = None
+        results.append((game_id, winner, arena.delta_points))
+    return results
+
+
+def _play_games_in_worker(seed: int, game_ids: List[int]) -> List[tuple]:
+    return play_games(_worker_arena, seed, game_ids)
+
+
+class ParallelArena:
+    """
+    Plays a number of games of an arena in parallel and aggregates the statistics in the same way as Arena
+    (wins of each team, draws and delta points).
+
+    The arena and the players are created in each worker process by the factories, which must be picklable (for
+    example module level functions or functools.partial objects of them).
+    """
+
+    def __init__(self, arena_factory: Callable[[], Arena], player_factory: Callable[[], List[Player]],
+                 nr_games_to_play: int, seed: int = 0, max_workers: int = None, games_per_task: int = None,
+                 print_progress: bool = True):
+        """
+        Args:
+            arena_factory: function that creates the arena (without players)
+            player_factory: function that creates the 4 players (north, east, south, west)
+            nr_games_to_play: the number of games to play
+            seed: the seed, from which the seeds of the games are derived
+            max_workers: the number of worker processes, or None for the number of cpus
+            games_per_task: the number of games sent to a worker at once, or None to choose it from the number of
+            games and workers
+            print_progress: print the number of games played
+        """
+        self._arena_factory = arena_factory
+        self._player_factory = player_factory
+        self._nr_games_to_play = nr_games_to_play
+        self._seed = seed
+        self._max_workers = max_workers if max_workers is not None else os.cpu_count()
+        if games_per_task is None:
+            games_per_task = max(1, nr_games_to_play // (4 * self._max_workers))
+        self._games_per_task = games_per_task
+        self._print_progress = print_progress
+        self._logger = logging.getLogger(__name__)
+
+        # winner (0, 1 or None) and delta points of each game, in the order of the games
+        self._results = []                              # type: List[tuple]
+
+    @property
+    def nr_games_to_play(self) -> int:
+        return self._nr_games_to_play
+
+    @property
+    def results(self) -> List[tuple]:
+        return self._results
+
+    @property
+    def nr_games_played(self) -> int:
+        return len(self._results)
+
+    @property
+    def nr_wins_team_0(self) -> int:
+        return sum(1 for winner, _ in self._results if winner == 0)
+
+    @property
+    def nr_wins_team_1(self) -> int:
+        return sum(1 for winner, _ in self._results if winner == 1)
+
+    @property
+    def nr_draws(self) -> int:
+        return sum(1 for winner, _ in self._results if winner is None)
+
+    @property
+    def delta_points(self) -> int:
+        return sum(delta_points for _, delta_points in self._results)
+
+    def play_all_games(self) -> None:
+        """
+        Play the games in the worker processes and collect the results.
+        """
+        game_ids = list(range(self._nr_games_to_play))
+        tasks = [game_ids[start:start + self._games_per_task]
+                 for start in range(0, len(game_ids), self._games_per_task)]
+        results = {}
+        with ProcessPoolExecutor(max_workers=self._max_workers, initializer=_init_worker,
+                                 initargs=(self._arena_factory, self._player_factory)) as executor:
+            futures = [executor.submit(_play_games_in_worker, self._seed, task) for task in tasks]
+            for future in futures:
+                for game_id, winner, delta_points in future.result():
+                    results[game_id] = (winner, delta_points)
+                if self._print_progress:
+                    sys.stdout.write('\r{:6}/{:6} games played'.format(len(results), self._nr_games_to_play))
+        if self._print_progress:
+            sys.stdout.write('\n')
+        self._results = [results[game_id] for game_id in game_ids]
+        self._logger.info('Team 0: {} wins, Team 1: {} wins, {} draws, delta points: {}'.format(
+            self.nr_wins_team_0, self.nr_wins_team_1, self.nr_draws, self.delta_points))
@@ -0,0 +1,20 @@
+# HSLU
+#
+# Created by Thomas Koller on 05.09.18
+#
+
+
+class PlayGameStrategy:
+    """
+    Base class to implement different strategies for playing a game in the arena, for example a fixed number of
+    rounds or up to a number of points.
+    """
+
+    def play_game(self, arena) -> None:
+        """
+        Play one game. Must be implemented in the derived class. The result of the game must be added to the arena
+        by add_win_team_0, add_win_team_1 or add_draw.
+        Args:
+            arena: the arena for which to play the game
+        """
+        raise NotImplementedError
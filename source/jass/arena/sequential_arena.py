@@ -0,0 +1,79 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Driver that plays the games of an arena until a sequential test reaches a decision.
+"""
+import logging
+
+from source.jass.arena.arena import Arena
+from source.jass.arena.sequential_testing import SequentialTest
+
+
+class SequentialArena:
+    """
+    Plays the games of an arena in chunks and stops as soon as the sequential test has reached a decision (checked
+    after each chunk), or after the maximal number of games.
+
+    The result of each game is taken from the statistics of the arena, so any arena can be used, for example a
+    DuplicateArena to test the paired point differences.
+    """
+
+    def __init__(self, arena: Arena, test: SequentialTest, chunk_size: int = 10, max_games: int = 10000):
+        """
+        Args:
+            arena: the arena with the players set
+            test: the sequential test
+            chunk_size: the number of games played between the checks of the test
+            max_games: the maximal number of games
+        """
+        self._arena = arena
+        self._test = test
+        self._chunk_size = chunk_size
+        self._max_games = max_games
+        self._nr_games_played = 0
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def test(self) -> SequentialTest:
+        return self._test
+
+    @property
+    def nr_games_played(self) -> int:
+        return self._nr_games_played
+
+    @property
+    def decision(self) -> int or None:
+        return self._test.decision
+
+    def play_game(self) -> None:
+        """
+        Play one game in the arena and add the result to the test.
+        """
+        arena = self._arena
+        nr_wins_team_0 = arena.nr_wins_team_0
+        nr_wins_team_1 = arena.nr_wins_team_1
+        delta_points = arena.delta_points
+        arena.play_game()
+        if arena.nr_wins_team_0 > nr_wins_team_0:
+            winner = 0
+        elif arena.nr_wins_team_1 > nr_wins_team_1:
+            winner = 1
+        else:
+            winner = None
+        self._test.add_game(winner, arena.delta_points - delta_points)
+        self._nr_games_played += 1
+
+    def play_until_decision(self) -> int or None:
+        """
+        Play games until the test reaches a decision or the maximal number of games is played.
+
+        Returns:
+            the decision of the test, None if it was not reached
+        """
+        while self._test.decision is None and self._nr_games_played < self._max_games:
+            for _ in range(min(self._chunk_size, self._max_games - self._nr_games_played)):
+                self.play_game()
+        self._logger.info('Decision {} after {} games'.format(self._test.decision, self._nr_games_played))
+        return self._test.decision
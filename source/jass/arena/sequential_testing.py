@@ -0,0 +1,145 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Sequential tests that decide after each game whether the result of a comparison of two teams is already known, so
+that an evaluation can stop as soon as possible instead of playing a fixed number of games.
+"""
+import math
+
+from source.jass.arena.paired_statistics import PairedStatistics
+
+# decisions of the tests (None if no decision has been reached yet)
+TEAM_0_BETTER = 0
+TEAM_1_BETTER = 1
+NO_DIFFERENCE = 2
+
+
+class SequentialTest:
+    """
+    Base class of the sequential tests. The result of each game is added to the test, which reaches a decision at
+    some point.
+    """
+
+    def add_game(self, winner: int or None, delta_points: int) -> None:
+        """
+        Add the result of a game. Must be implemented in the derived class.
+
+        Args:
+            winner: the team that won the game (0 or 1), None for a draw
+            delta_points: the points of team 0 minus the points of team 1
+        """
+        raise NotImplementedError()
+
+    @property
+    def decision(self) -> int or None:
+        """
+        The decision of the test, TEAM_0_BETTER, TEAM_1_BETTER or NO_DIFFERENCE, or None if the test needs more
+        games. Must be implemented in the derived class.
+        """
+        raise NotImplementedError()
+
+
+class SPRT(SequentialTest):
+    """
+    Sequential probability ratio test on the win rate of team 0, where a draw counts as half a win and half a loss.
+
+    The test compares the hypothesis H0: win rate = p0 with H1: win rate = p1 (with p1 > p0). If H1 is accepted,
+    team 0 is better (TEAM_0_BETTER), if H0 is accepted, team 0 is not better by the margin (NO_DIFFERENCE). The
+    probability to accept H1 if H0 is true is at most alpha, the probability to accept H0 if H1 is true at most beta.
+    """
+
+    def __init__(self, p0: float = 0.5, p1: float = 0.55, alpha: float = 0.05, beta: float = 0.05):
+        """
+        Args:
+            p0: the win rate of H0
+            p1: the win rate of H1, larger than p0
+            alpha: the probability of a false positive
+            beta: the probability of a false negative
+        """
+        if not 0 < p0 < p1 < 1:
+            raise ValueError('Win rates must satisfy 0 < p0 < p1 < 1: {}, {}'.format(p0, p1))
+        self._llr_win = math.log(p1 / p0)
+        self._llr_loss = math.log((1 - p1) / (1 - p0))
+        self._lower_bound = math.log(beta / (1 - alpha))
+        self._upper_bound = math.log((1 - beta) / alpha)
+        # log likelihood ratio of H1 against H0
+        self._llr = 0.0
+
+    @property
+    def llr(self) -> float:
+        return self._llr
+
+    @property
+    def bounds(self) -> (float, float):
+        return self._lower_bound, self._upper_bound
+
+    def add_game(self, winner: int or None, delta_points: int) -> None:
+        if winner == 0:
+            self._llr += self._llr_win
+        elif winner == 1:
+            self._llr += self._llr_loss
+        else:
+            self._llr += (self._llr_win + self._llr_loss) / 2
+
+    @property
+    def decision(self) -> int or None:
+        if self._llr >= self._upper_bound:
+            return TEAM_0_BETTER
+        if self._llr <= self._lower_bound:
+            return NO_DIFFERENCE
+        return None
+
+
+class ConfidenceIntervalTest(SequentialTest):
+    """
+    Test on the confidence interval of the mean point difference (or of the mean score, 1 for a win, 0.5 for a draw
+    and 0 for a loss, minus 0.5). The test decides for the better team as soon as the interval does not contain 0, and
+    for NO_DIFFERENCE if the interval is smaller than the margin (as it then can only contain differences that do not
+    matter).
+
+    As the interval is checked after every game, the probability of a false positive is higher than 1 - confidence,
+    so the confidence should be chosen higher than for a single test.
+    """
+
+    def __init__(self, confidence: float = 0.99, min_games: int = 20, on_points: bool = True,
+                 margin: float = None):
+        """
+        Args:
+            confidence: the confidence level of the interval
+            min_games: the minimal number of games before a decision
+            on_points: test the point difference if true, the score otherwise
+            margin: the width of the interval below which there is no difference, None to never decide for
+            NO_DIFFERENCE
+        """
+        self._confidence = confidence
+        self._min_games = min_games
+        self._on_points = on_points
+        self._margin = margin
+        self._statistics = PairedStatistics()
+
+    @property
+    def statistics(self) -> PairedStatistics:
+        return self._statistics
+
+    def add_game(self, winner: int or None, delta_points: int) -> None:
+        if self._on_points:
+            self._statistics.add(delta_points)
+        elif winner is None:
+            self._statistics.add(0.0)
+        else:
+            self._statistics.add(0.5 if winner == 0 else -0.5)
+
+    @property
+    def decision(self) -> int or None:
+        if self._statistics.nr_samples < self._min_games:
+            return None
+        low, high = self._statistics.confidence_interval(self._confidence)
+        if low > 0:
+            return TEAM_0_BETTER
+        if high < 0:
+            return TEAM_1_BETTER
+        if self._margin is not None and high - low < self._margin:
+            return NO_DIFFERENCE
+        return None
@@ -0,0 +1,186 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Vectorized random playouts of many deals at the same time.
+
+All the deals are played in lock-step: as every deal starts from the same played cards (the trick history of the
+player round), all deals have the same number of cards played at each step and only the current player, the
+cards in the tricks and the points differ between the deals. Each step (valid cards, random selection, playing the
+card, winner and points of a trick) is a small number of numpy operations on all deals together.
+
+The rules implemented are the rules of RuleSchieber.
+"""
+
+import numpy as np
+
+from source.jass.base.const import card_values, color_masks, color_of_card, offset_of_card, higher_trump, \
+    lower_trump, J_offset, OBE_ABE, UNE_UFE, MAX_TRUMP
+from source.jass.base.player_round import PlayerRound
+
+# rank of the trump cards by offset in the color (jack, nine, ace, king, queen, ten, eight, seven, six)
+_trump_rank_of_offset = np.array([6, 5, 4, 8, 3, 7, 2, 1, 0], dtype=np.int32)
+
+# strength of each card in a trick for each trump, without considering the color of the first card:
+# trumps are stronger than all other cards, the other cards are ranked according to the order of obe or une
+_card_strength = np.zeros([MAX_TRUMP + 1, 36], dtype=np.int32)
+for _trump in range(MAX_TRUMP + 1):
+    if _trump == UNE_UFE:
+        _card_strength[_trump, :] = offset_of_card
+    else:
+        _card_strength[_trump, :] = 8 - offset_of_card
+    if _trump < OBE_ABE:
+        _trump_cards = color_of_card == _trump
+        _card_strength[_trump, _trump_cards] = 200 + _trump_rank_of_offset[offset_of_card[_trump_cards]]
+
+# bonus in strength for the cards that have the color of the first card of the trick
+_FIRST_COLOR_BONUS = 100
+
+
+def calc_winners_batch(tricks: np.ndarray, first_players: np.ndarray, trump: int) -> np.ndarray:
+    """
+    Calculate the winners of many completed tricks with the same trump.
+
+    Args:
+        tricks: the completed tricks, array of shape [N, 4]
+        first_players: the first players of the tricks, array of shape [N]
+        trump: the trump
+
+    Returns:
+        the winners of the tricks, array of shape [N]
+    """
+    first_color = color_of_card[tricks[:, 0]]
+    strength = _card_strength[trump, tricks] + \
+        _FIRST_COLOR_BONUS * (color_of_card[tricks] == first_color[:, np.newaxis])
+    return (first_players - np.argmax(strength, axis=1)) % 4
+
+
+def calc_points_batch(tricks: np.ndarray, is_last: bool, trump: int) -> np.ndarray:
+    """
+    Calculate the points of many completed tricks with the same trump.
+
+    Args:
+        tricks: the completed tricks, array of shape [N, 4]
+        is_last: true if these are the last tricks
+        trump: the trump
+
+    Returns:
+        the points of the tricks, array of shape [N]
+    """
+    return card_values[trump, tricks].sum(axis=1) + (5 if is_last else 0)
+
+
+def get_valid_cards_batch(hands: np.ndarray, tricks: np.ndarray, move_nr: int, trump: int) -> np.ndarray:
+    """
+    Get the valid cards for the hands of many players with the same trump and the same number of cards in the
+    current trick. This is the vectorized version of RuleSchieber.get_valid_cards.
+
+    Args:
+        hands: 1-hot encoded hands of the players to play, array of shape [N, 36]
+        tricks: the current tricks, array of shape [N, 4], only the first move_nr cards are used
+        move_nr: number of cards already played in the current tricks
+        trump: the trump
+
+    Returns:
+        1-hot encoded valid cards, array of shape [N, 36]
+    """
+    if move_nr == 0:
+        return hands
+
+    color_played = color_of_card[tricks[:, 0]]
+    color_cards = hands * color_masks[color_played, :]
+    have_color_played = color_cards.any(axis=1)[:, np.newaxis]
+
+    if trump >= OBE_ABE:
+        return np.where(have_color_played, color_cards, hands)
+
+    trump_cards = hands * color_masks[trump, :]
+    number_of_trumps = trump_cards.sum(axis=1)
+    number_of_cards = hands.sum(axis=1)
+
+    # the played color was trump: play a trump, unless we do not have any or have only the jack
+    play_anything = (number_of_trumps == 0) | ((number_of_trumps == 1) & (hands[:, trump * 9 + J_offset] == 1))
+    valid_trump_played = np.where(play_anything[:, np.newaxis], hands, trump_cards)
+
+    # the played color was not trump: find the (by index) lowest trump played by player 1 or 2
+    lowest_trump_played = np.full(hands.shape[0], -1, dtype=np.int32)
+    for i in range(1, move_nr):
+        card = tricks[:, i]
+        is_trump = color_of_card[card] == trump
+        lowest_trump_played = np.where(is_trump & (card > lowest_trump_played), card, lowest_trump_played)
+    trump_played = (lowest_trump_played >= 0)[:, np.newaxis]
+
+    # nobody played a trump: give color or any trump, or anything if we do not have the color
+    valid_no_trump = np.where(have_color_played, color_cards + trump_cards, hands)
+
+    # somebody played a trump: we can not play a lower trump, unless we only have trumps
+    lowest_index = np.maximum(lowest_trump_played, 0)
+    higher_trump_cards = trump_cards * higher_trump[lowest_index, :]
+    lower_trump_cards = trump_cards * lower_trump[lowest_index, :]
+    valid_trump = np.where(have_color_played, color_cards + higher_trump_cards, hands * (1 - lower_trump_cards))
+    valid_trump = np.where((number_of_trumps == number_of_cards)[:, np.newaxis], hands, valid_trump)
+
+    valid_other_color = np.where(trump_played, valid_trump, valid_no_trump)
+    return np.where((color_played == trump)[:, np.newaxis], valid_trump_played, valid_other_color)
+
+
+def play_random_batch(player_rnd: PlayerRound, hands: np.ndarray, rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Play N deals from the state of the player round to the end of the round with random valid cards.
+
+    Preconditions:
+        trump has been declared in player_rnd
+        player_rnd.nr_played_cards < 36
+
+    Args:
+        player_rnd: the player round, that defines the trump, the cards played so far and the points made
+        hands: the hands of all players for each of the N deals, 1-hot encoded array of shape [N, 4, 36], the
+        hand of the current player is taken from player_rnd
+        rng: the random generator to use, or None to create a new one
+
+    Returns:
+        the points of team 0 and team 1 at the end of the round for each deal, array of shape [N, 2]
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    trump = player_rnd.trump
+    nr_deals = hands.shape[0]
+    deals = np.arange(nr_deals)
+
+    hands = hands.astype(np.int32)
+    hands[:, player_rnd.player, :] = player_rnd.hand
+
+    points = np.zeros([nr_deals, 2], dtype=np.int32)
+    points[:, 0] = player_rnd.points_team_0
+    points[:, 1] = player_rnd.points_team_1
+
+    player = np.full(nr_deals, player_rnd.player, dtype=np.int32)
+    if player_rnd.nr_cards_in_trick == 0:
+        first_player = player.copy()
+    else:
+        first_player = np.full(nr_deals, player_rnd.trick_first_player[player_rnd.nr_tricks], dtype=np.int32)
+    tricks = np.zeros([nr_deals, 4], dtype=np.int32)
+    tricks[:, 0:player_rnd.nr_cards_in_trick] = player_rnd.current_trick[0:player_rnd.nr_cards_in_trick]
+
+    for nr_played_cards in range(player_rnd.nr_played_cards, 36):
+        move_nr = nr_played_cards % 4
+        hand = hands[deals, player, :]
+        valid_cards = get_valid_cards_batch(hand, tricks, move_nr, trump)
+
+        # select a random valid card by the maximum of random noise on the valid cards
+        card = np.argmax(np.where(valid_cards == 1, rng.random([nr_deals, 36]), -1.0), axis=1)
+
+        hands[deals, player, card] = 0
+        tricks[:, move_nr] = card
+
+        if move_nr < 3:
+            # next player (see const.next_player)
+            player = (player + 3) % 4
+        else:
+            winner = calc_winners_batch(tricks, first_player, trump)
+            trick_points = calc_points_batch(tricks, nr_played_cards == 35, trump)
+            points[deals, winner % 2] += trick_points
+            player = winner
+            first_player = winner
+    return points
@@ -0,0 +1,202 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Bitboard representation of card sets for the jass game.
+
+A set of cards is represented by a single python int, where bit i is set if the card with index i (as defined in
+jass.base.const) is in the set. As there are only 36 cards, all set operations (union, intersection, difference,
+test for membership) are single integer operations, which is much faster than the numpy operations on the
+1-hot encoded arrays for the small sizes used in the game.
+
+The masks in this module are calculated from the 1-hot encoded tables in jass.base.const, so both representations
+always describe the same rules.
+"""
+
+from typing import List
+
+import numpy as np
+
+from source.jass.base.const import color_masks, card_values, higher_trump, lower_trump, color_of_card, \
+    J_offset, Nine_offset, color_offset
+
+# set with no cards
+EMPTY = 0
+
+# set with all 36 cards
+ALL_CARDS = (1 << 36) - 1
+
+# mask for the 9 cards of a color, when shifted to the start of that color
+COLOR_BITS = (1 << 9) - 1
+
+# powers of 2 for all the cards, used for the conversion from 1-hot encoded arrays
+_card_powers = np.array([1 << i for i in range(36)], dtype=np.int64)
+
+# shifts for all the cards, used for the conversion to 1-hot encoded arrays
+_card_shifts = np.arange(36, dtype=np.int64)
+
+
+def _bits_from_array(cards: np.ndarray) -> int:
+    # (helper used to build the tables below, cards is a 1-hot encoded array)
+    return int(np.dot(cards.astype(np.int64), _card_powers))
+
+
+# bit of each single card
+card_bits = [1 << card for card in range(36)]       # type: List[int]
+
+# color of each card as list (lookups of single values in a list are faster than in a numpy array)
+color_of_card_list = color_of_card.tolist()     # type: List[int]
+
+# masks of the cards of each color (D, H, S, C)
+color_masks_bits = [_bits_from_array(color_masks[color, :]) for color in range(4)]     # type: List[int]
+
+# mask of the jack of each color
+jack_bits = [1 << int(color_offset[color] + J_offset) for color in range(4)]      # type: List[int]
+
+# mask of the nine of each color
+nine_bits = [1 << int(color_offset[color] + Nine_offset) for color in range(4)]   # type: List[int]
+
+# higher_trump_bits[card] is the mask of trump cards that are higher than card (see const.higher_trump)
+higher_trump_bits = [_bits_from_array(higher_trump[card, :]) for card in range(36)]    # type: List[int]
+
+# lower_trump_bits[card] is the mask of trump cards that are lower than card, including the card itself
+# (see const.lower_trump)
+lower_trump_bits = [_bits_from_array(lower_trump[card, :]) for card in range(36)]      # type: List[int]
+
+# points_of_color_bits[trump][color][bits] are the points for the cards of the given color when the 9 bits of the
+# color are given by bits, i.e. (cards >> color_offset[color]) & COLOR_BITS. This allows to sum up the points of a
+# set of cards with 4 table lookups.
+points_of_color_bits = [
+    [
+        [int(sum(card_values[trump, color_offset[color] + i] for i in range(9) if (bits >> i) & 1))
+         for bits in range(1 << 9)]
+        for color in range(4)
+    ]
+    for trump in range(6)
+]   # type: List[List[List[int]]]
+
+
+def get_cards_bits(cards: List[int]) -> int:
+    """
+    Get the bitboard of the cards in the list.
+
+    Args:
+        cards: the cards, int encoded
+
+    Returns:
+        bitboard of the cards
+    """
+    result = 0
+    for card in cards:
+        result |= 1 << card
+    return result
+
+
+def convert_one_hot_encoded_cards_to_bits(cards: np.ndarray) -> int:
+    """
+    Get the bitboard of a 1-hot encoded array of cards.
+
+    Args:
+        cards: the cards, 1-hot encoded array of length 36
+
+    Returns:
+        bitboard of the cards
+    """
+    return int(np.dot(cards.astype(np.int64, copy=False), _card_powers))
+
+
+def convert_bits_to_one_hot_encoded_cards(bits: int) -> np.ndarray:
+    """
+    Get the 1-hot encoded array of the cards in a bitboard.
+
+    Args:
+        bits: bitboard of the cards
+
+    Returns:
+        1-hot encoded array of type np.int32 of the cards
+    """
+    return ((np.int64(bits) >> _card_shifts) & 1).astype(np.int32)
+
+
+def convert_bits_to_int_encoded_list(bits: int) -> List[int]:
+    """
+    Get the list of the cards in a bitboard, in ascending order of the card index.
+
+    Args:
+        bits: bitboard of the cards
+
+    Returns:
+        list of the cards, int encoded
+    """
+    result = []
+    while bits:
+        lowest = bits & -bits
+        result.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return result
+
+
+def count_cards(bits: int) -> int:
+    """
+    Count the number of cards in a bitboard.
+
+    Args:
+        bits: bitboard of the cards
+
+    Returns:
+        the number of cards in the set
+    """
+    return bin(bits).count('1')
+
+
+def lowest_card(bits: int) -> int:
+    """
+    Get the card with the lowest index in the set, which is the highest ranked card of its color in the
+    normal (non trump, not une-ufe) order.
+
+    Precondition:
+        bits != 0
+
+    Args:
+        bits: bitboard of the cards
+
+    Returns:
+        the card with the lowest index
+    """
+    return (bits & -bits).bit_length() - 1
+
+
+def highest_card(bits: int) -> int:
+    """
+    Get the card with the highest index in the set, which is the lowest ranked card of its color in the
+    normal (non trump, not une-ufe) order.
+
+    Precondition:
+        bits != 0
+
+    Args:
+        bits: bitboard of the cards
+
+    Returns:
+        the card with the highest index
+    """
+    return bits.bit_length() - 1
+
+
+def sum_card_values_bits(cards: int, trump: int) -> int:
+    """
+    Calculate the sum of the card values of the cards in the set for the given trump.
+
+    Args:
+        cards: bitboard of the cards
+        trump: the trump (0..5)
+
+    Returns:
+        the points of the cards
+    """
+    table = points_of_color_bits[trump]
+    return table[0][cards & COLOR_BITS] + \
+        table[1][(cards >> 9) & COLOR_BITS] + \
+        table[2][(cards >> 18) & COLOR_BITS] + \
+        table[3][(cards >> 27) & COLOR_BITS]
@@ -0,0 +1,349 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Compact, mutable representation of a round for simulations (rollouts) and tree search.
+"""
+from typing import List
+
+import numpy as np
+
+from source.jass.base.const import next_player
+from source.jass.base.bitboard import convert_one_hot_encoded_cards_to_bits, convert_bits_to_one_hot_encoded_cards
+from source.jass.base.round import Round
+from source.jass.base.round_factory import get_round
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.player_round_cheating import PlayerRoundCheating
+
+
+class FastRound:
+    """
+    Class for the card play phase of a round, that holds the same information as Round, but is optimized for
+    playing many cards in simulations:
+        - the hands are bitboards (see jass.base.bitboard), one int per player
+        - the tricks are stored as a flat list of 36 cards in the order they are played (-1 if not played yet)
+        - the information about the tricks are lists of 9 entries
+        - no numpy arrays are allocated, so creating and copying an object is cheap
+
+    Cards are played with play(card) and can be taken back with undo(), both are O(1) and do not allocate any
+    memory. This allows to walk a single object up and down a search tree. Independent copies are created by clone().
+
+    The class uses __slots__, so no other attributes can be added. Conversion from and to Round, PlayerRound and
+    PlayerRoundCheating is lossless.
+    """
+    __slots__ = ['dealer', 'player', 'trump', 'forehand', 'declared_trump', 'jass_type', 'rule',
+                 'hands', 'tricks', 'trick_first_player', 'trick_winner', 'trick_points',
+                 'nr_played_cards', 'points_team_0', 'points_team_1']
+
+    def __init__(self, dealer=None, jass_type=None, rule=None) -> None:
+        """
+        Initialize an empty round, the other values must be set from a Round or PlayerRound or directly.
+
+        Args:
+            dealer: the dealer or None if it should remain uninitialized
+            jass_type: the jass type
+            rule: the rule object, which must support the bitboard methods of Rule
+        """
+        self.dealer = dealer                # type: int
+        self.player = None                  # type: int
+        self.trump = None                   # type: int
+        self.forehand = None                # type: bool
+        self.declared_trump = None          # type: int
+        self.jass_type = jass_type          # type: str
+        self.rule = rule
+
+        # hands of the players as bitboards
+        self.hands = [0, 0, 0, 0]           # type: List[int]
+
+        # cards played so far, in the order they were played (i.e. the card of move i is in tricks[i])
+        self.tricks = [-1] * 36             # type: List[int]
+
+        # the first player, the winner and the points of the tricks
+        self.trick_first_player = [-1] * 9  # type: List[int]
+        self.trick_winner = [-1] * 9        # type: List[int]
+        self.trick_points = [0] * 9         # type: List[int]
+
+        self.nr_played_cards = 0            # type: int
+        self.points_team_0 = 0              # type: int
+        self.points_team_1 = 0              # type: int
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of the round.
+
+        Returns:
+            String describing the round
+        """
+        return str({name: getattr(self, name) for name in self.__slots__})
+
+    # derived properties, named as in Round
+    @property
+    def nr_tricks(self) -> int:
+        return self.nr_played_cards >> 2
+
+    @property
+    def nr_cards_in_trick(self) -> int:
+        return self.nr_played_cards & 3
+
+    @property
+    def current_trick(self) -> List[int] or None:
+        """
+        The cards played in the current trick (as a new list, i.e. without the cards not played yet), or None at the
+        end of the round.
+        """
+        if self.nr_played_cards == 36:
+            return None
+        start = self.nr_played_cards & ~3
+        return self.tricks[start:self.nr_played_cards]
+
+    def get_points_for_player(self, player: int) -> int:
+        """
+        Get the points for the team of the specific player
+        Returns:
+            The points for the player
+        """
+        if player == 0 or player == 2:
+            return self.points_team_0
+        else:
+            return self.points_team_1
+
+    def get_valid_cards(self) -> int:
+        """
+        Get the valid cards for the current player.
+
+        Returns:
+            bitboard of the valid cards
+        """
+        n = self.nr_played_cards
+        start = n & ~3
+        return self.rule.get_valid_cards_bits(self.hands[self.player], self.tricks[start:n], n - start, self.trump)
+
+    def play(self, card: int) -> None:
+        """
+        Play a card as the current player and update the state of the round.
+
+        Preconditions:
+            self.nr_played_cards < 36
+            card is in self.hands[self.player]
+
+        Args:
+            card: The card to play
+        """
+        # (cards obtained from numpy arrays must be converted, so that the bitboards remain python ints)
+        card = int(card)
+        player = self.player
+        self.hands[player] &= ~(1 << card)
+        n = self.nr_played_cards
+        self.tricks[n] = card
+        self.nr_played_cards = n + 1
+
+        move_in_trick = n & 3
+        if move_in_trick < 3:
+            if move_in_trick == 0:
+                self.trick_first_player[n >> 2] = player
+            self.player = next_player[player]
+            return
+
+        # end of the trick
+        nr_trick = n >> 2
+        start = n - 3
+        trick = self.tricks[start:n + 1]
+        is_last = n == 35
+        points = self.rule.calc_points_bits((1 << trick[0]) | (1 << trick[1]) | (1 << trick[2]) | (1 << card),
+                                            is_last, self.trump)
+        winner = self.rule.calc_winner_bits(trick, self.trick_first_player[nr_trick], self.trump)
+        self.trick_points[nr_trick] = points
+        self.trick_winner[nr_trick] = winner
+        if winner == 0 or winner == 2:
+            self.points_team_0 += points
+        else:
+            self.points_team_1 += points
+
+        if is_last:
+            self.player = None
+        else:
+            self.trick_first_player[nr_trick + 1] = winner
+            self.player = winner
+
+    def undo(self) -> int:
+        """
+        Take back the last card played and restore the state before it was played.
+
+        Precondition:
+            self.nr_played_cards > 0
+
+        Returns:
+            the card that was taken back
+        """
+        n = self.nr_played_cards - 1
+        card = self.tricks[n]
+        self.tricks[n] = -1
+        self.nr_played_cards = n
+
+        if n & 3 == 3:
+            # the card completed a trick, so the trick result must be removed
+            nr_trick = n >> 2
+            points = self.trick_points[nr_trick]
+            if self.trick_winner[nr_trick] == 0 or self.trick_winner[nr_trick] == 2:
+                self.points_team_0 -= points
+            else:
+                self.points_team_1 -= points
+            self.trick_points[nr_trick] = 0
+            self.trick_winner[nr_trick] = -1
+            if nr_trick < 8:
+                self.trick_first_player[nr_trick + 1] = -1
+            # last player of the trick (the players play in the order of next_player)
+            player = (self.trick_first_player[nr_trick] + 1) % 4
+        else:
+            # previous player
+            player = (self.player + 1) % 4
+        self.player = player
+        self.hands[player] |= 1 << card
+        return card
+
+    def clone(self) -> 'FastRound':
+        """
+        Create an independent copy of the round.
+
+        Returns:
+            a copy of the round
+        """
+        other = FastRound.__new__(FastRound)
+        other.dealer = self.dealer
+        other.player = self.player
+        other.trump = self.trump
+        other.forehand = self.forehand
+        other.declared_trump = self.declared_trump
+        other.jass_type = self.jass_type
+        other.rule = self.rule
+        other.hands = self.hands[:]
+        other.tricks = self.tricks[:]
+        other.trick_first_player = self.trick_first_player[:]
+        other.trick_winner = self.trick_winner[:]
+        other.trick_points = self.trick_points[:]
+        other.nr_played_cards = self.nr_played_cards
+        other.points_team_0 = self.points_team_0
+        other.points_team_1 = self.points_team_1
+        return other
+
+    def _set_from(self, rnd: Round or PlayerRound) -> None:
+        # copy the information that is common to Round and PlayerRound
+        self.dealer = rnd.dealer
+        self.player = rnd.player
+        self.trump = rnd.trump
+        self.forehand = rnd.forehand
+        self.declared_trump = rnd.declared_trump
+        self.jass_type = rnd.jass_type
+        self.rule = rnd.rule
+        self.tricks = rnd.tricks.flatten().tolist()
+        self.trick_first_player = rnd.trick_first_player.tolist()
+        self.trick_winner = rnd.trick_winner.tolist()
+        self.trick_points = rnd.trick_points.tolist()
+        self.nr_played_cards = int(rnd.nr_played_cards)
+        self.points_team_0 = int(rnd.points_team_0)
+        self.points_team_1 = int(rnd.points_team_1)
+
+    def _copy_to(self, rnd: Round or PlayerRound) -> None:
+        # copy the information that is common to Round and PlayerRound
+        rnd.dealer = self.dealer
+        rnd.player = self.player
+        rnd.trump = self.trump
+        rnd.forehand = self.forehand
+        rnd.declared_trump = self.declared_trump
+        rnd.jass_type = self.jass_type
+        rnd.rule = self.rule
+        rnd.tricks[:, :] = np.array(self.tricks, dtype=np.int32).reshape([9, 4])
+        rnd.trick_first_player[:] = self.trick_first_player
+        rnd.trick_winner[:] = self.trick_winner
+        rnd.trick_points[:] = self.trick_points
+        rnd.nr_tricks = self.nr_tricks
+        rnd.nr_cards_in_trick = self.nr_cards_in_trick
+        rnd.nr_played_cards = self.nr_played_cards
+        rnd.points_team_0 = self.points_team_0
+        rnd.points_team_1 = self.points_team_1
+        # current trick is a view into tricks
+        if self.nr_played_cards < 36:
+            rnd.current_trick = rnd.tricks[self.nr_tricks, :]
+        else:
+            rnd.current_trick = None
+
+    @staticmethod
+    def from_round(rnd: Round) -> 'FastRound':
+        """
+        Create a FastRound from a Round, after trump has been declared.
+
+        Args:
+            rnd: the round
+
+        Returns:
+            a FastRound with the same information as the round
+        """
+        fast_rnd = FastRound()
+        fast_rnd._set_from(rnd)
+        fast_rnd.hands = [convert_one_hot_encoded_cards_to_bits(rnd.hands[i, :]) for i in range(4)]
+        return fast_rnd
+
+    @staticmethod
+    def from_player_round(player_rnd: PlayerRound, hands: np.ndarray = None) -> 'FastRound':
+        """
+        Create a FastRound from a PlayerRound and the hands of all the players. The hands must be consistent with
+        the player round, the hand of the current player is taken from the player round.
+
+        Args:
+            player_rnd: the player round
+            hands: the hands of all players as 4x36 1-hot encoded array, or None if the player round is a
+            PlayerRoundCheating that contains the hands
+
+        Returns:
+            a FastRound with the information from the player round and the hands
+        """
+        if hands is None:
+            hands = player_rnd.hands
+        fast_rnd = FastRound()
+        fast_rnd._set_from(player_rnd)
+        fast_rnd.hands = [convert_one_hot_encoded_cards_to_bits(hands[i, :]) for i in range(4)]
+        if player_rnd.player is not None and player_rnd.nr_played_cards < 36:
+            fast_rnd.hands[player_rnd.player] = convert_one_hot_encoded_cards_to_bits(player_rnd.hand)
+        return fast_rnd
+
+    def to_round(self) -> Round:
+        """
+        Create a Round with the same information.
+
+        Returns:
+            the round of the type given by the jass type
+        """
+        rnd = get_round(self.jass_type, self.dealer)
+        self._copy_to(rnd)
+        for i in range(4):
+            rnd.hands[i, :] = convert_bits_to_one_hot_encoded_cards(self.hands[i])
+        return rnd
+
+    def to_player_round(self) -> PlayerRound:
+        """
+        Create a PlayerRound for the current player.
+
+        Returns:
+            the player round
+        """
+        player_rnd = PlayerRound(jass_type=self.jass_type, rule=self.rule)
+        self._copy_to(player_rnd)
+        if self.player is not None:
+            player_rnd.hand[:] = convert_bits_to_one_hot_encoded_cards(self.hands[self.player])
+        return player_rnd
+
+    def to_player_round_cheating(self) -> PlayerRoundCheating:
+        """
+        Create a PlayerRoundCheating for the current player.
+
+        Returns:
+            the player round including the hands of all the players
+        """
+        player_rnd = PlayerRoundCheating(jass_type=self.jass_type, rule=self.rule)
+        self._copy_to(player_rnd)
+        for i in range(4):
+            player_rnd.hands[i, :] = convert_bits_to_one_hot_encoded_cards(self.hands[i])
+        if self.player is not None:
+            player_rnd.hand = player_rnd.hands[self.player, :]
+        return player_rnd
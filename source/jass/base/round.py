@@ -3,6 +3,7 @@
 # Created by Thomas Koller on 24.07.18
 #
 from source.jass.base.const import *
+from source.jass.base.zobrist import calc_zobrist_hash, zobrist_delta
 
 
 class Round:
@@ -104,6 +105,10 @@ class Round:
         # the jass_type (as used by the round_factory to create this type of round)
         self.jass_type = None
 
+        # zobrist hash of the state (see jass.base.zobrist), it is calculated when the first card is played and
+        # updated by action_play_card and pop_card afterwards, None if it has not been calculated
+        self.zobrist_hash = None  # type: int
+
     def __eq__(self, other: 'Round'):
         """
         Compare two instances. Useful for tests when the representations are encoded and decoded. The objects are
@@ -171,6 +176,7 @@ class Round:
         self.hands[1, cards[9:18]] = 1
         self.hands[2, cards[18:27]] = 1
         self.hands[3, cards[27:39]] = 1
+        self.zobrist_hash = None
 
     def set_hands(self, hands: np.array) -> None:
         """
@@ -179,6 +185,7 @@ class Round:
             hands: The hands
         """
         self.hands[:, :] = hands[:, :]
+        self.zobrist_hash = None
 
     def action_trump(self, action: int) -> None:
         """
@@ -207,6 +214,13 @@ class Round:
         Args:
             card: The card to play
         """
+        if self.zobrist_hash is None:
+            self.zobrist_hash = calc_zobrist_hash(self)
+        player = self.player
+        position = self.nr_cards_in_trick
+        points_team_0 = self.points_team_0
+        trick = self.current_trick
+
         # remove card from player
         self.hands[self.player, card] = 0
 
@@ -226,6 +240,73 @@ class Round:
             # finish current trick
             self._end_trick()
 
+        self.zobrist_hash ^= zobrist_delta(player, card, position, trick, points_team_0, self.points_team_0,
+                                           self.player)
+
+    def push_card(self, card: int) -> None:
+        """
+        Play a card as the current player, so that it can be taken back later using pop_card. This allows search
+        algorithms to move one round object up and down a search tree instead of copying it.
+
+        Preconditions:
+            see action_play_card
+
+        Args:
+            card: The card to play
+        """
+        self.action_play_card(card)
+
+    def pop_card(self) -> int:
+        """
+        Take back the last card played and restore the state of the round before the card was played, including
+        the hand of the player, the trick winner and points, the points of the teams, the current player and the
+        current trick.
+
+        Preconditions:
+            self.nr_played_cards > 0
+
+        Postconditions:
+            see assert_invariants
+
+        Returns:
+            the card that was taken back
+        """
+        next_player_nr = self.player
+        points_team_0 = self.points_team_0
+        self.nr_played_cards -= 1
+        nr_trick, move_in_trick = divmod(self.nr_played_cards, 4)
+        card = self.tricks[nr_trick, move_in_trick]
+        self.tricks[nr_trick, move_in_trick] = -1
+
+        if move_in_trick == 3:
+            # the card completed the trick, so the result of the trick must be removed
+            if self.trick_winner[nr_trick] == NORTH or self.trick_winner[nr_trick] == SOUTH:
+                self.points_team_0 -= self.trick_points[nr_trick]
+            else:
+                self.points_team_1 -= self.trick_points[nr_trick]
+            self.trick_points[nr_trick] = 0
+            self.trick_winner[nr_trick] = -1
+            if nr_trick < 8:
+                self.trick_first_player[nr_trick + 1] = -1
+            self.nr_tricks = nr_trick
+            self.current_trick = self.tricks[nr_trick, :]
+            # the last player of the trick is the player before the first player (in the order of next_player)
+            self.player = (self.trick_first_player[nr_trick] + 1) % 4
+        else:
+            # previous player (in the order of next_player)
+            self.player = (self.player + 1) % 4
+        self.nr_cards_in_trick = move_in_trick
+
+        # give the card back to the player
+        self.hands[self.player, card] = 1
+
+        if self.zobrist_hash is None:
+            self.zobrist_hash = calc_zobrist_hash(self)
+        else:
+            self.zobrist_hash ^= zobrist_delta(self.player, card, move_in_trick, self.tricks[nr_trick],
+                                               self.points_team_0, points_team_0, next_player_nr)
+        return card
+
     def get_valid_cards(self):
         """
         Get the valid cards for the current player.
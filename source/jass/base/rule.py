@@ -14,8 +14,21 @@ class Rule:
     in a trick, to determine the winner of a trick and the points of a trick.
 
     This in an abstract base class that defines the interface.
+
+    Subclasses can use a precomputed table of the trick outcomes (see jass.base.trick_table) for calc_points and
+    calc_winner, if one is set in trick_table.
     """
 
+    def __init__(self, trick_table=None):
+        """
+        Initialize the rule.
+
+        Args:
+            trick_table: table of trick outcomes (TrickTable) to use in calc_points and calc_winner, or None to
+            calculate them
+        """
+        self.trick_table = trick_table
+
     def get_valid_cards(self, hand: np.array,
                         current_trick: np.ndarray or list,
                         move_nr: int,
@@ -61,5 +74,49 @@ class Rule:
         """
         raise NotImplementedError
 
+    def get_valid_cards_bits(self, hand: int,
+                             current_trick: np.ndarray or list,
+                             move_nr: int,
+                             trump: int or None) -> int:
+        """
+        Get the valid cards that can be played by the current player, using bitboards for the card sets (see
+        jass.base.bitboard). The result must be the same as the one from get_valid_cards for the same arguments.
+
+        Args:
+            hand: bitboard of the cards owned by the player
+            current_trick: array with the indices of the cards for the previous moves in the current trick
+            move_nr: which move the player has to make in the current trick, 0 for first move, 1 for second and so on
+            trump: trump color (if used by the rule)
+
+        Returns:
+            bitboard of the valid moves
+        """
+        raise NotImplementedError()
+
+    def calc_points_bits(self, trick: int, is_last: bool, trump: int = -1) -> int:
+        """
+        Calculate the points from the cards in the trick, given as bitboard. Must be implemented in subclass
+
+        Args:
+            trick: bitboard of the cards of the trick
+            is_last: true if this is the last trick
+            trump: the trump for the round (if needed by the rules)
+        """
+        raise NotImplementedError
+
+    def calc_winner_bits(self, trick: np.ndarray or list, first_player: int, trump: int = -1) -> int:
+        """
+        Calculate the winner of a completed trick using bitboard operations. Must be implemented in subclass. The
+        result must be the same as the one from calc_winner.
 
+        Precondition:
+            0 <= trick[i] <= 35, for i = 0..3
+        Args:
+            trick: the completed trick
+            first_player: the first player of the trick
+            trump: the trump for the round (if needed by the rules)
 
+        Returns:
+            the player who won this trick
+        """
+        raise NotImplementedError
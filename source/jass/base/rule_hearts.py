@@ -4,6 +4,7 @@
 
 import numpy as np
 from source.jass.base.const import color_of_card, color_masks, HEARTS, SQ
+from source.jass.base.bitboard import color_masks_bits, color_of_card_list, count_cards, lowest_card, card_bits
 from source.jass.base.rule import Rule
 
 
@@ -58,6 +59,8 @@ class RuleHearts(Rule):
             is_last: true if this is the last trick, ignored for hearts
             trump: not used for hearts
         """
+        if self.trick_table is not None:
+            return self.trick_table.points(trick)
         hearts = color_masks[HEARTS, :]
         points = -hearts[trick].sum()
         if trick[0] == SQ or trick[1] == SQ or trick[2] == SQ or trick[3] == SQ:
@@ -77,6 +80,9 @@ class RuleHearts(Rule):
         Returns:
             the player who won this trick
         """
+        if self.trick_table is not None:
+            return (first_player - self.trick_table.winner_offset(trick)) % 4
+
         color_of_first_card = color_of_card[trick[0]]
         # highest card of first color wins
         winner = 0
@@ -86,3 +92,61 @@ class RuleHearts(Rule):
                 highest_card = trick[i]
                 winner = i
         return (first_player - winner) % 4
+
+    def get_valid_cards_bits(self, hand: int,
+                             current_trick: np.ndarray or list,
+                             move_nr: int,
+                             trump: int or None) -> int:
+        """
+        Get the valid cards that can be played by the current player using bitboards.
+
+        Args:
+            hand: bitboard of the cards owned by the player
+            current_trick: array with the indices of the cards for the previous moves in the current trick
+            move_nr: which move the player has to make in the current trick, 0 for first move, 1 for second and so on
+            trump: not used for hearts
+
+        Returns:
+            bitboard of the valid moves
+        """
+        # play anything on the first move
+        if move_nr == 0:
+            return hand
+
+        # must give the correct color, if we have it
+        color_cards = hand & color_masks_bits[color_of_card_list[current_trick[0]]]
+        return color_cards if color_cards else hand
+
+    def calc_points_bits(self, trick: int, is_last: bool, trump: int = -1) -> int:
+        """
+        Calculate the (negative) penalty points from the cards in the trick, given as bitboard.
+
+        Args:
+            trick: bitboard of the cards of the trick
+            is_last: true if this is the last trick, ignored for hearts
+            trump: not used for hearts
+        """
+        points = -count_cards(trick & color_masks_bits[HEARTS])
+        if trick & card_bits[SQ]:
+            points -= 9
+        return points
+
+    def calc_winner_bits(self, trick: np.ndarray or list, first_player: int, trump: int = -1) -> int:
+        """
+        Calculate the winner of a completed trick using bitboards.
+
+        Precondition:
+            0 <= trick[i] <= 35, for i = 0..3
+        Args:
+            trick: the completed trick
+            first_player: the first player of the trick
+            trump: not used for hearts
+        Returns:
+            the player who won this trick
+        """
+        if isinstance(trick, np.ndarray):
+            trick = trick.tolist()
+        trick_bits = (1 << trick[0]) | (1 << trick[1]) | (1 << trick[2]) | (1 << trick[3])
+        # highest card of first color wins
+        winning_card = lowest_card(trick_bits & color_masks_bits[color_of_card_list[trick[0]]])
+        return (first_player - trick.index(winning_card)) % 4
@@ -5,6 +5,8 @@
 """ Implementation of rules of jass game"""
 
 from source.jass.base.const import *
+from source.jass.base.bitboard import color_masks_bits, jack_bits, nine_bits, higher_trump_bits, \
+    lower_trump_bits, color_of_card_list, sum_card_values_bits, lowest_card, highest_card
 from source.jass.base.rule import Rule
 
 
@@ -153,6 +155,8 @@ class RuleSchieber(Rule):
             is_last: true if this is the last trick
             trump: trump for the round
         """
+        if self.trick_table is not None:
+            return self.trick_table.points(trick, trump) + (5 if is_last else 0)
         return int(np.sum(card_values[trump, trick])) + (5 if is_last else 0)
 
     def calc_winner(self, trick: np.ndarray, first_player: int, trump: int = -1) -> int:
@@ -171,6 +175,9 @@ class RuleSchieber(Rule):
         Returns:
             the player who won this trick
         """
+        if self.trick_table is not None:
+            return (first_player - self.trick_table.winner_offset(trick, trump)) % 4
+
         color_of_first_card = color_of_card[trick[0]]
         if trump == UNE_UFE:
             # lowest card of first color wins
@@ -227,4 +234,112 @@ class RuleSchieber(Rule):
                         highest_card = trick[i]
                         winner = i
         # adjust actual winner by first player
-        return (first_player - winner) % 4
\ No newline at end of file
+        return (first_player - winner) % 4
+
+    def get_valid_cards_bits(self, hand: int,
+                             current_trick: np.ndarray or list,
+                             move_nr: int,
+                             trump: int or None) -> int:
+        """
+        Get the valid cards that can be played by the current player using bitboards. This follows exactly the
+        same logic as get_valid_cards, but all the card sets are ints.
+
+        Args:
+            hand: bitboard of the cards owned by the player
+            current_trick: array with the indices of the cards for the previous moves in the current trick
+            move_nr: which move the player has to make in the current trick, 0 for first move, 1 for second and so on
+            trump: trump color (or 'obe', 'une')
+
+        Returns:
+            bitboard of the valid moves
+        """
+        # play anything on the first move
+        if move_nr == 0:
+            return hand
+
+        # get the color of the first played card and the cards of that color we have
+        color_played = color_of_card_list[current_trick[0]]
+        color_cards = hand & color_masks_bits[color_played]
+
+        if trump >= 4:
+            # obe or une declared, must give the correct color if we have it
+            return color_cards if color_cards else hand
+
+        trump_cards = hand & color_masks_bits[trump]
+
+        if color_played == trump:
+            # no more trumps or only the trump jack: play anything, otherwise we must play a trump
+            if trump_cards == 0 or trump_cards == jack_bits[trump]:
+                return hand
+            return trump_cards
+
+        # check if anybody else (player 1 or player 2) played a trump (same logic as in get_valid_cards)
+        lowest_trump_played = -1
+        if move_nr > 1:
+            if color_of_card_list[current_trick[1]] == trump:
+                lowest_trump_played = current_trick[1]
+            if move_nr == 3 and color_of_card_list[current_trick[2]] == trump:
+                if current_trick[2] > lowest_trump_played:
+                    lowest_trump_played = current_trick[2]
+
+        if lowest_trump_played == -1:
+            # must give a color or can give any trump, or anything if we do not have the color
+            return (color_cards | trump_cards) if color_cards else hand
+
+        if trump_cards == hand:
+            # we have only trump left, so we can give any of them
+            return hand
+
+        if color_cards:
+            # must give a color or a higher trump
+            return color_cards | (trump_cards & higher_trump_bits[lowest_trump_played])
+        else:
+            # play anything except a lower trump
+            return hand & ~(trump_cards & lower_trump_bits[lowest_trump_played])
+
+    def calc_points_bits(self, trick: int, is_last: bool, trump: int = -1) -> int:
+        """
+        Calculate the points from the cards in the trick according to the given trump
+
+        Args:
+            trick: bitboard of the cards of the trick
+            is_last: true if this is the last trick
+            trump: trump for the round
+        """
+        return sum_card_values_bits(trick, trump) + (5 if is_last else 0)
+
+    def calc_winner_bits(self, trick: np.ndarray or list, first_player: int, trump: int = -1) -> int:
+        """
+        Calculate the winner of a completed trick using bitboards: the winning card is determined directly from
+        the set of trumps or the set of cards of the first color in the trick, without comparing the cards pairwise.
+
+        Precondition:
+            0 <= trick[i] <= 35, for i = 0..3
+        Args:
+            trick: the completed trick
+            first_player: the first player of the trick
+            trump: trump for the round
+        Returns:
+            the player who won this trick
+        """
+        if isinstance(trick, np.ndarray):
+            trick = trick.tolist()
+        trick_bits = (1 << trick[0]) | (1 << trick[1]) | (1 << trick[2]) | (1 << trick[3])
+
+        trumps = trick_bits & color_masks_bits[trump] if trump < OBE_ABE else 0
+        if trumps:
+            # highest trump wins: jack, nine and then the other cards in normal order
+            if trumps & jack_bits[trump]:
+                winning_card = trump * 9 + J_offset
+            elif trumps & nine_bits[trump]:
+                winning_card = trump * 9 + Nine_offset
+            else:
+                winning_card = lowest_card(trumps)
+        else:
+            color_cards = trick_bits & color_masks_bits[color_of_card_list[trick[0]]]
+            if trump == UNE_UFE:
+                # lowest card of first color wins (lower card values have a higher card index)
+                winning_card = highest_card(color_cards)
+            else:
+                winning_card = lowest_card(color_cards)
+        return (first_player - trick.index(winning_card)) % 4
@@ -0,0 +1,184 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Precomputed tables of the outcome of all tricks.
+
+For each trump mode and each ordered sequence of 4 cards, the table contains the position of the winning card in the
+trick and the points of the trick (without the bonus for the last trick). Sequences that contain a card twice can
+not occur in a game, but are included to allow simple indexing: the trick (c0, c1, c2, c3) is found at index
+((c0 * 36 + c1) * 36 + c2) * 36 + c3.
+
+The tables are generated once and saved to disk as .npy files, which are then memory mapped, so that several
+processes can share the same table. A table can be set on RuleSchieber and RuleHearts (Rule.trick_table), the rules
+then use the table in calc_winner and calc_points.
+"""
+import logging
+import os
+
+import numpy as np
+
+from source.jass.base.const import color_masks, card_values, HEARTS, SQ, OBE_ABE, MAX_TRUMP
+from source.jass.base.batch_playout import calc_winners_batch
+
+# number of ordered tricks (including the impossible ones with duplicate cards)
+NR_TRICKS = 36 ** 4
+
+# version of the table format, part of the file name so that old files are not used
+_TABLE_VERSION = 1
+
+# default directory for the tables, can be overridden by the environment variable JASS_TABLE_DIR
+DEFAULT_TABLE_DIR = os.environ.get('JASS_TABLE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'jass'))
+
+# tables already loaded in this process, by file name
+_loaded_tables = {}
+
+
+class TrickTable:
+    """
+    Table of the winner and points of all tricks for a number of modes (the trumps for Schieber, one mode for hearts).
+    """
+
+    def __init__(self, table: np.ndarray):
+        """
+        Initialize from an array of shape [nr_modes, 2, NR_TRICKS], where [mode, 0, :] contains the position of the
+        winning card in the trick and [mode, 1, :] the points of the trick.
+
+        Args:
+            table: the table array, possibly memory mapped
+        """
+        self._table = table
+        self._nr_modes = table.shape[0]
+
+    @property
+    def table(self) -> np.ndarray:
+        return self._table
+
+    @staticmethod
+    def index(trick: np.ndarray or list) -> int:
+        """
+        Get the index of the trick in the table.
+
+        Args:
+            trick: the 4 cards of a complete trick
+
+        Returns:
+            the index in the table
+        """
+        return ((int(trick[0]) * 36 + int(trick[1])) * 36 + int(trick[2])) * 36 + int(trick[3])
+
+    def _mode(self, trump: int) -> int:
+        # tables with only one mode do not depend on the trump
+        return trump if self._nr_modes > 1 else 0
+
+    def winner_offset(self, trick: np.ndarray or list, trump: int = -1) -> int:
+        """
+        Get the position of the winning card in the trick.
+
+        Args:
+            trick: the 4 cards of a complete trick
+            trump: the trump (ignored for tables with only one mode)
+
+        Returns:
+            the position of the winning card (0..3)
+        """
+        return int(self._table[self._mode(trump), 0, TrickTable.index(trick)])
+
+    def points(self, trick: np.ndarray or list, trump: int = -1) -> int:
+        """
+        Get the points of the trick, without the bonus for the last trick.
+
+        Args:
+            trick: the 4 cards of a complete trick
+            trump: the trump (ignored for tables with only one mode)
+
+        Returns:
+            the points
+        """
+        return int(self._table[self._mode(trump), 1, TrickTable.index(trick)])
+
+
+def _all_tricks() -> np.ndarray:
+    # array of shape [NR_TRICKS, 4] with all ordered tricks, in the order of TrickTable.index
+    return np.indices([36, 36, 36, 36], dtype=np.int8).reshape(4, NR_TRICKS).T
+
+
+def create_table_schieber() -> np.ndarray:
+    """
+    Calculate the table for the rules of Schieber, with one mode for each trump.
+
+    Returns:
+        the table array of shape [MAX_TRUMP + 1, 2, NR_TRICKS]
+    """
+    tricks = _all_tricks().astype(np.intp)
+    first_players = np.zeros(NR_TRICKS, dtype=np.int32)
+    table = np.zeros([MAX_TRUMP + 1, 2, NR_TRICKS], dtype=np.int8)
+    for trump in range(MAX_TRUMP + 1):
+        # the winner of a trick with first player 0 is the negative of the position
+        table[trump, 0, :] = (-calc_winners_batch(tricks, first_players, trump)) % 4
+        table[trump, 1, :] = card_values[trump, tricks].sum(axis=1)
+    return table
+
+
+def create_table_hearts() -> np.ndarray:
+    """
+    Calculate the table for the rules of hearts (see RuleHearts), which does not depend on trump.
+
+    Returns:
+        the table array of shape [1, 2, NR_TRICKS]
+    """
+    tricks = _all_tricks().astype(np.intp)
+    first_players = np.zeros(NR_TRICKS, dtype=np.int32)
+    table = np.zeros([1, 2, NR_TRICKS], dtype=np.int8)
+    # the winner is determined as in obe
+    table[0, 0, :] = (-calc_winners_batch(tricks, first_players, OBE_ABE)) % 4
+    table[0, 1, :] = -color_masks[HEARTS, tricks].sum(axis=1) - 9 * (tricks == SQ).any(axis=1)
+    return table
+
+
+def _load_or_create(name: str, create, directory: str or None) -> TrickTable:
+    if directory is None:
+        directory = DEFAULT_TABLE_DIR
+    file_name = os.path.join(directory, 'trick_table_{}_v{}.npy'.format(name, _TABLE_VERSION))
+    if file_name in _loaded_tables:
+        return _loaded_tables[file_name]
+
+    if not os.path.exists(file_name):
+        logging.getLogger(__name__).info('Creating trick table {}'.format(file_name))
+        os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first, so that other processes never see a partial file
+        tmp_file_name = '{}.{}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file_name, 'wb') as file:
+            np.save(file, create())
+        os.replace(tmp_file_name, file_name)
+
+    table = TrickTable(np.load(file_name, mmap_mode='r'))
+    _loaded_tables[file_name] = table
+    return table
+
+
+def get_trick_table_schieber(directory: str = None) -> TrickTable:
+    """
+    Get the trick table for Schieber, it is created and saved in the directory if it does not exist yet.
+
+    Args:
+        directory: the directory of the table files, or None for the default directory
+
+    Returns:
+        the (memory mapped) table
+    """
+    return _load_or_create('schieber', create_table_schieber, directory)
+
+
+def get_trick_table_hearts(directory: str = None) -> TrickTable:
+    """
+    Get the trick table for hearts, it is created and saved in the directory if it does not exist yet.
+
+    Args:
+        directory: the directory of the table files, or None for the default directory
+
+    Returns:
+        the (memory mapped) table
+    """
+    return _load_or_create('hearts', create_table_hearts, directory)
@@ -0,0 +1,85 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Zobrist hashing of the state of a round.
+
+The hash of a state is the xor of random 64 bit keys for each of its parts:
+    - each card in the hand of each player
+    - each card in the trick in progress, by its position in the trick
+    - the points of team 0 (the points of team 1 follow from the cards that are not in the hands anymore)
+    - the current player
+
+As each card that is played only changes a few parts, Round updates the hash incrementally in action_play_card and
+pop_card. Two states with the same hash are (with high probability) the same state, even if the cards were played in
+a different order, which is used by searches to share statistics between transpositions.
+
+The trump and the dealer are not part of the hash, so hashes should only be compared within one round.
+"""
+import numpy as np
+
+# number of keys for the points, the points are taken modulo this number (negative points are possible in hearts)
+NR_POINT_KEYS = 512
+
+# the keys are generated with a fixed seed, so the hashes are the same in all processes
+_keys = np.random.RandomState(20181024).randint(0, 2 ** 64, size=4 * 36 + 4 * 36 + NR_POINT_KEYS + 4,
+                                                dtype=np.uint64)
+
+# keys as python ints in lists, which is faster than numpy for the single updates in Round
+hand_keys = _keys[0:144].reshape(4, 36).tolist()                    # [player][card]
+trick_keys = _keys[144:288].reshape(4, 36).tolist()                 # [position in trick][card]
+points_keys = _keys[288:288 + NR_POINT_KEYS].tolist()               # [points of team 0 % NR_POINT_KEYS]
+player_keys = _keys[288 + NR_POINT_KEYS:].tolist()                  # [player]
+
+
+def zobrist_delta(player: int, card: int, position: int, trick, points_a: int, points_b: int,
+                  next_player_nr: int or None) -> int:
+    """
+    Get the value that changes the hash of a state before a card was played to the hash of the state after it
+    was played. As the hash is an xor, the same value also changes the hash back when the card is taken back.
+
+    Args:
+        player: the player that plays the card
+        card: the card
+        position: the position of the card in the trick
+        trick: the cards of the trick (only used if the card completes the trick)
+        points_a: the points of team 0 before the card was played
+        points_b: the points of team 0 after the card was played
+        next_player_nr: the player after the card was played, or None at the end of the round
+
+    Returns:
+        the value to xor with the hash
+    """
+    value = hand_keys[player][card] ^ player_keys[player]
+    if position < 3:
+        value ^= trick_keys[position][card]
+    else:
+        # the trick is complete, so its cards are not in the trick in progress anymore
+        value ^= trick_keys[0][trick[0]] ^ trick_keys[1][trick[1]] ^ trick_keys[2][trick[2]]
+        value ^= points_keys[points_a % NR_POINT_KEYS] ^ points_keys[points_b % NR_POINT_KEYS]
+    if next_player_nr is not None:
+        value ^= player_keys[next_player_nr]
+    return value
+
+
+def calc_zobrist_hash(rnd) -> int:
+    """
+    Calculate the hash of the state of a round from scratch.
+
+    Args:
+        rnd: the round (Round or a class with the same attributes)
+
+    Returns:
+        the hash as python int
+    """
+    value = 0
+    for player, card in zip(*np.nonzero(rnd.hands)):
+        value ^= hand_keys[player][card]
+    if rnd.nr_played_cards < 36:
+        for position in range(rnd.nr_cards_in_trick):
+            value ^= trick_keys[position][rnd.current_trick[position]]
+    value ^= points_keys[rnd.points_team_0 % NR_POINT_KEYS]
+    if rnd.player is not None:
+        value ^= player_keys[rnd.player]
+    return value
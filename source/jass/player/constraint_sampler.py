@@ -0,0 +1,196 @@
+"""
+Sampling of the hands of the other players (determinizations) that are consistent with the information of a player.
+
+The information the player has about the hands of the other players is:
+    - the cards in the own hand and the cards played so far are not in the other hands
+    - the number of cards each other player still holds
+    - a player who did not follow the color of the first card of a trick does not hold any card of that color
+      (except when playing trump, which is always allowed in Schieber)
+    - a player who did not follow trump, when trump was played first, does not hold any trump except possibly the
+      jack of trump (which never has to be played)
+    - a player who played a lower trump than a trump already in the trick only holds trumps
+
+This results in a set of possible players for each unknown card. The deals are drawn card by card, the most
+constrained cards first, for many samples at the same time with numpy operations. A card is only given to a player
+if the remaining cards can still be distributed (checked by Hall's condition on all subsets of the players), so every
+sample is consistent and no sample is rejected. Each card is given to one of the possible players with a probability
+proportional to the number of cards the player still needs, which gives uniform deals if there are no constraints.
+"""
+import numpy as np
+
+from source.jass.base.const import color_of_card, color_masks, lower_trump, J_offset, OBE_ABE
+from source.jass.base.player_round import PlayerRound
+
+# membership of the players in all the subsets of the 4 players, subset_players[s, p] is 1 if bit p is set in s
+_subset_players = np.array([[(s >> p) & 1 for p in range(4)] for s in range(16)], dtype=np.int32)
+
+
+def get_possible_players(player_rnd: PlayerRound) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Get the unknown cards, the players that can hold them and the number of cards each player holds.
+
+    Args:
+        player_rnd: the round from the view of the player
+
+    Returns:
+        the unknown cards as int encoded array of shape [N], boolean array of shape [N, 4] where [i, p] is True if
+        player p can hold card i, and the number of unknown cards of each player (0 for the player himself)
+    """
+    possible = np.ones([36, 4], dtype=bool)
+    possible[:, player_rnd.player] = False
+    possible[player_rnd.hand == 1, :] = False
+
+    nr_cards = np.full(4, 9 - player_rnd.nr_tricks, dtype=np.int32)
+    trump = player_rnd.trump
+
+    for nr_trick in range(player_rnd.nr_tricks + 1):
+        first_player = player_rnd.trick_first_player[nr_trick]
+        trick = player_rnd.tricks[nr_trick]
+        if first_player < 0 or trick[0] < 0:
+            continue
+        color_played = color_of_card[trick[0]]
+        for i in range(4):
+            card = trick[i]
+            if card < 0:
+                break
+            possible[card, :] = False
+            # the players play in the order of next_player, i.e. the i-th card is played by first_player - i
+            player = (first_player - i) % 4
+            if nr_trick == player_rnd.nr_tricks:
+                nr_cards[player] -= 1
+            color = color_of_card[card]
+            if i == 0 or color == color_played:
+                continue
+            if trump is not None and trump < OBE_ABE:
+                if color_played == trump:
+                    # did not follow trump, so the player can only hold the jack of trump
+                    void_cards = color_masks[trump, :].copy()
+                    void_cards[trump * 9 + J_offset] = 0
+                    possible[void_cards == 1, player] = False
+                elif color != trump:
+                    possible[color_masks[color_played, :] == 1, player] = False
+                else:
+                    # a trump lower than the lowest trump played before (as determined in the rule) can only be
+                    # played if the player holds only trumps
+                    trumps_played = [c for c in trick[1:i] if color_of_card[c] == trump]
+                    if len(trumps_played) > 0 and lower_trump[max(trumps_played), card] == 1:
+                        possible[color_masks[trump, :] == 0, player] = False
+            else:
+                possible[color_masks[color_played, :] == 1, player] = False
+
+    nr_cards[player_rnd.player] = 0
+    cards = np.flatnonzero(possible.any(axis=1))
+    return cards, possible[cards, :], nr_cards
+
+
+class DeterminizationGenerator:
+    """
+    Generator of batches of determinizations for one player round. The constraints are calculated once, so the
+    generator can be used to draw many batches for the same search.
+
+    If no constraints are known (besides the number of cards of each player), the deals are drawn as random
+    permutations of the unknown cards, otherwise card by card as described above.
+    """
+
+    def __init__(self, player_rnd: PlayerRound, rng=None):
+        """
+        Args:
+            player_rnd: the round from the view of the player
+            rng: a seed, a random generator (np.random.Generator or np.random.RandomState), or None to use the
+                global numpy random state
+        """
+        if rng is None:
+            rng = np.random
+        elif isinstance(rng, (int, np.integer)):
+            rng = np.random.default_rng(rng)
+        self._rng = rng
+        self._player = player_rnd.player
+        self._hand = player_rnd.hand
+
+        cards, possible, nr_cards = get_possible_players(player_rnd)
+        self._unconstrained = bool(np.all(possible == (nr_cards > 0)[np.newaxis, :]))
+        if self._unconstrained:
+            self._cards = cards
+            # the player that gets the card at each position of the permutation
+            self._owners = np.repeat(np.arange(4), nr_cards)
+            return
+
+        # the most constrained cards first
+        order = np.argsort(possible.sum(axis=1), kind='stable')
+        self._cards = cards[order]
+        self._possible = possible[order, :]
+        self._nr_cards = nr_cards
+        possible_set = self._possible.astype(np.int32) @ (1 << np.arange(4))
+
+        # need[i, s] is the number of cards after card i that can only be held by players of subset s
+        is_subset = (possible_set[:, np.newaxis] & ~np.arange(16)[np.newaxis, :]) == 0
+        need = np.cumsum(is_subset[::-1, :], axis=0)[::-1, :]
+        self._need = np.vstack([need[1:, :], np.zeros([1, 16], dtype=need.dtype)])
+
+    def hands(self, nr_samples: int) -> np.ndarray:
+        """
+        Sample the hands of all players.
+
+        Args:
+            nr_samples: the number of samples
+
+        Returns:
+            the 1-hot encoded hands of all the players (including the hand of the player), array of shape
+            [nr_samples, 4, 36] and type uint8
+        """
+        hands = np.zeros([nr_samples, 4, 36], dtype=np.uint8)
+        hands[:, self._player, :] = self._hand
+        samples = np.arange(nr_samples)
+
+        if self._unconstrained:
+            permutations = np.argsort(self._rng.random([nr_samples, len(self._cards)]), axis=1)
+            hands[samples[:, np.newaxis], self._owners[np.newaxis, :], self._cards[permutations]] = 1
+            return hands
+
+        capacity = np.repeat(self._nr_cards[np.newaxis, :], nr_samples, axis=0)
+        for i, card in enumerate(self._cards):
+            # capacity of all subsets of players if the card is given to player p: [samples, subsets, p]
+            capacity_subsets = capacity @ _subset_players.T
+            capacity_after = capacity_subsets[:, :, np.newaxis] - _subset_players[np.newaxis, :, :]
+            feasible = np.all(self._need[i, np.newaxis, :, np.newaxis] <= capacity_after, axis=1)
+            feasible &= self._possible[i, np.newaxis, :] & (capacity > 0)
+
+            # select a feasible player with probability proportional to the number of missing cards
+            weights = np.cumsum(feasible * capacity, axis=1)
+            threshold = self._rng.random(nr_samples) * weights[:, -1]
+            player = np.argmax(weights > threshold[:, np.newaxis], axis=1)
+
+            hands[samples, player, card] = 1
+            capacity[samples, player] -= 1
+        return hands
+
+    def hands_bits(self, nr_samples: int) -> np.ndarray:
+        """
+        Sample the hands of all players as bitboards (see jass.base.bitboard).
+
+        Args:
+            nr_samples: the number of samples
+
+        Returns:
+            the hands of all the players (including the hand of the player), array of shape [nr_samples, 4] and
+            type uint64
+        """
+        hands = self.hands(nr_samples).astype(np.uint64)
+        return (hands << np.arange(36, dtype=np.uint64)).sum(axis=2, dtype=np.uint64)
+
+
+def sample_hands(player_rnd: PlayerRound, nr_samples: int, rng=None) -> np.ndarray:
+    """
+    Sample the hands of all players, consistent with the information of the player.
+
+    Args:
+        player_rnd: the round from the view of the player
+        nr_samples: the number of samples
+        rng: a seed, a random generator (np.random.Generator or np.random.RandomState), or None to use the global
+            numpy random state
+
+    Returns:
+        the 1-hot encoded hands of all the players (including the hand of the player), array of shape
+        [nr_samples, 4, 36] and type uint8
+    """
+    return DeterminizationGenerator(player_rnd, rng).hands(nr_samples)
@@ -0,0 +1,192 @@
+from source.jass.base.const import card_values, color_of_card, offset_of_card, OBE_ABE, UNE_UFE, MAX_TRUMP
+from source.jass.base.fast_round import FastRound
+from source.jass.base.player_round_cheating import PlayerRoundCheating
+from source.jass.base.round import Round
+
+# cards in the order in which they are tried by the solver for each trump: trumps first, then by the points of the
+# card and then by the rank of the card, as strong cards usually decide the trick and cause earlier cut-offs
+_move_order = []
+for _trump in range(MAX_TRUMP + 1):
+    _priority = card_values[_trump, :] * 10 + (offset_of_card if _trump == UNE_UFE else 8 - offset_of_card)
+    if _trump < OBE_ABE:
+        _priority = _priority + 1000 * (color_of_card == _trump)
+    _move_order.append(sorted(range(36), key=lambda card: -_priority[card]))
+
+
+class EndgameSolver:
+    """
+    Exact solver for the card play of a fully specified deal (all hands known, as in PlayerRoundCheating or in a
+    determinization of a search), i.e. a double dummy solver.
+
+    The solver calculates the points both teams make if all players play perfectly, with a minimax search with
+    alpha-beta pruning: the players of team 0 maximize the points of team 0, the players of team 1 minimize them.
+    The cards are tried in a fixed order (trumps and high cards first) and the best card of a position is tried first
+    when the position is visited again. A transposition table stores bounds of the points of the remaining tricks
+    at the start of each trick, where the position only depends on the hands and the player to lead. As the
+    positions are stored independent of the points made so far, the table can be reused for several searches of the
+    same deal, for example for all the leaf evaluations of a monte carlo tree search.
+
+    The number of positions grows quickly with the number of cards, so the solver is intended for the last tricks
+    of a round.
+    """
+
+    def __init__(self, max_entries: int = 1000000):
+        """
+        Args:
+            max_entries: maximal number of entries in the transposition table, the table is cleared when it is full
+        """
+        self.max_entries = max_entries
+        # (trump, hands, player) -> (lower bound, upper bound, best card) of the points of team 0 in the remaining
+        # tricks
+        self._table = {}
+        # number of positions searched, for statistics
+        self.nodes = 0
+
+    def clear(self) -> None:
+        self._table.clear()
+
+    def solve(self, rnd: FastRound) -> (int, int):
+        """
+        Calculate the points of the teams at the end of the round if all players play perfectly from the state of
+        the round. The round is restored to its state before the call.
+
+        Preconditions:
+            trump has been declared
+            the hands of all players are set
+
+        Args:
+            rnd: the round
+
+        Returns:
+            the points of team 0 and team 1 at the end of the round
+        """
+        remaining_points = self._search(rnd, -1, 1000)
+        points_team_0 = rnd.points_team_0 + remaining_points
+        total = rnd.points_team_0 + rnd.points_team_1 + self._remaining_total(rnd)
+        return points_team_0, total - points_team_0
+
+    def best_card(self, rnd: FastRound) -> (int, int, int):
+        """
+        Get the best card for the current player and the resulting points of both teams.
+
+        Preconditions:
+            trump has been declared
+            the hands of all players are set
+            rnd.nr_played_cards < 36
+
+        Args:
+            rnd: the round
+
+        Returns:
+            the best card and the points of team 0 and team 1 at the end of the round
+        """
+        maximize = rnd.player % 2 == 0
+        best_card = None
+        best_value = None
+        for card in self._ordered_cards(rnd, rnd.get_valid_cards(), None):
+            before = rnd.points_team_0
+            rnd.play(card)
+            value = rnd.points_team_0 - before + self._search(rnd, -1, 1000)
+            rnd.undo()
+            if best_value is None or (value > best_value if maximize else value < best_value):
+                best_card = card
+                best_value = value
+        points_team_0 = rnd.points_team_0 + best_value
+        total = rnd.points_team_0 + rnd.points_team_1 + self._remaining_total(rnd)
+        return best_card, points_team_0, total - points_team_0
+
+    def solve_round(self, rnd: Round or PlayerRoundCheating) -> (int, int):
+        """
+        Calculate the points of the teams at the end of the round if all players play perfectly, for a Round or a
+        PlayerRoundCheating.
+
+        Args:
+            rnd: the round, that includes the hands of all the players
+
+        Returns:
+            the points of team 0 and team 1 at the end of the round
+        """
+        if isinstance(rnd, PlayerRoundCheating):
+            return self.solve(FastRound.from_player_round(rnd))
+        return self.solve(FastRound.from_round(rnd))
+
+    @staticmethod
+    def _remaining_total(rnd: FastRound) -> int:
+        # points of the cards not played yet (including the bonus for the last trick), nothing is left at the end
+        if rnd.nr_played_cards == 36:
+            return 0
+        hands = rnd.hands[0] | rnd.hands[1] | rnd.hands[2] | rnd.hands[3]
+        start = rnd.nr_played_cards & ~3
+        for card in rnd.tricks[start:rnd.nr_played_cards]:
+            hands |= 1 << card
+        return rnd.rule.calc_points_bits(hands, True, rnd.trump)
+
+    @staticmethod
+    def _ordered_cards(rnd: FastRound, valid_cards: int, first_card: int or None) -> list:
+        cards = [card for card in _move_order[rnd.trump] if (valid_cards >> card) & 1]
+        if first_card is not None and first_card in cards:
+            cards.remove(first_card)
+            cards.insert(0, first_card)
+        return cards
+
+    def _search(self, rnd: FastRound, alpha: int, beta: int) -> int:
+        """
+        Search the points of team 0 in the remaining tricks, with the alpha-beta window (alpha, beta).
+        """
+        if rnd.nr_played_cards == 36:
+            return 0
+        self.nodes += 1
+
+        key = None
+        best_card = None
+        if rnd.nr_played_cards & 3 == 0:
+            key = (rnd.trump, rnd.hands[0], rnd.hands[1], rnd.hands[2], rnd.hands[3], rnd.player)
+            entry = self._table.get(key)
+            if entry is not None:
+                lower, upper, best_card = entry
+                if lower == upper or lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                alpha = max(alpha, lower)
+                beta = min(beta, upper)
+        # (the window for the classification of the result as bound or exact value)
+        alpha_original = alpha
+        beta_original = beta
+
+        maximize = rnd.player % 2 == 0
+        best_value = -1 if maximize else 1000
+        for card in self._ordered_cards(rnd, rnd.get_valid_cards(), best_card):
+            before = rnd.points_team_0
+            rnd.play(card)
+            gained = rnd.points_team_0 - before
+            value = gained + self._search(rnd, alpha - gained, beta - gained)
+            rnd.undo()
+            if maximize:
+                if value > best_value:
+                    best_value = value
+                    best_card = card
+                    alpha = max(alpha, value)
+            else:
+                if value < best_value:
+                    best_value = value
+                    best_card = card
+                    beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if key is not None:
+            if len(self._table) >= self.max_entries:
+                self._table.clear()
+            lower, upper = -1, 1000
+            entry = self._table.get(key)
+            if entry is not None:
+                lower, upper = entry[0], entry[1]
+            if best_value <= alpha_original:
+                upper = min(upper, best_value)
+            elif best_value >= beta_original:
+                lower = max(lower, best_value)
+            else:
+                lower = upper = best_value
+            self._table[key] = (lower, upper, best_card)
+        return best_value
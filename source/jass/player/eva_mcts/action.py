@@ -8,5 +8,5 @@ class Action:
         self.round = None
         self.card = None
 
-    def incr_visit(self):
+    def increment_visit(self):
         self.visit_count += 1
\ No newline at end of file
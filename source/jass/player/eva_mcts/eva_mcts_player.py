@@ -3,7 +3,8 @@ from source.jass.base.player_round import PlayerRound
 from source.jass.player.player import Player
 from source.jass.base.rule_schieber import RuleSchieber
 from source.jass.player.eva_mcts.mcts import MCTS
-from source.jass.player.eva_mcts.mcts_threaded import MCTSThreaded
+from source.jass.player.eva_mcts.mcts_thread import MCTSThreaded
+from source.jass.player.search_budget import SearchBudget
 import logging
 
 
@@ -12,9 +13,16 @@ class EvaMCTSPlayer(Player):
     Implementation of a player to play Jass using Monte Carlo Tree Search.
     """
 
-    def __init__(self):
+    def __init__(self, budget: SearchBudget = None):
+        """
+        Args:
+            budget: the budget for the search of each move, the default is 4 seconds with early stop
+        """
         self._logger = logging.getLogger(__name__)
         self._rule = RuleSchieber()
+        self.budget = budget if budget is not None else SearchBudget(time_seconds=4)
+        # the number of simulations of the search for the last card played (read by the metrics of the service)
+        self.last_simulations = 0
 
     def select_trump(self, rnd: PlayerRound) -> int:
         """
@@ -114,18 +122,21 @@ class EvaMCTSPlayer(Player):
             print(f"Selected trump {trump_strings_german_long[best_trump]} with score {max_score_in_trump} and {max_points_in_trump} points in the cards. hand: {rnd.hand}")
         return best_trump
 
-    def play_card(self, player_rnd: PlayerRound) -> int:
+    def play_card(self, player_rnd: PlayerRound, deadline: float = None) -> int:
         """
         Player returns a card to play based on the given round information.
 
         Args:
             player_rnd: current round
+            deadline: absolute time (as from time.time()) by which the card must be selected, in addition to the
+            budget of the player
 
         Returns:
             card to play, int encoded
         """
         #best_card = MCTS.monte_carlo_tree_search(player_rnd)
-        mcts_threaded = MCTSThreaded(player_rnd)
+        mcts_threaded = MCTSThreaded(player_rnd, budget=self.budget.start(deadline))
         best_card = mcts_threaded.run()
+        self.last_simulations = mcts_threaded.simulated_rounds
 
         return best_card
\ No newline at end of file
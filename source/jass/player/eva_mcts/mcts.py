@@ -3,16 +3,19 @@ from source.jass.base.player_round import PlayerRound
 from source.jass.base.round_factory import get_round_from_player_round
 from source.jass.player.eva_mcts.sampler import Sampler
 from source.jass.player.eva_mcts.node import Node
-from source.jass.player.eva_mcts.UCB import UCB
+from source.jass.player.eva_mcts.ucb import UCB
 from source.jass.player.random_player_schieber import RandomPlayerSchieber
-import time
+from source.jass.player.search_budget import SearchBudget
 from operator import attrgetter
+import time
 
 
 class MCTS:
     @staticmethod
-    def monte_carlo_tree_search(rnd: PlayerRound, run_time_seconds=4) -> (Node, int):
-        end_time = time.time() + run_time_seconds
+    def monte_carlo_tree_search(rnd: PlayerRound, run_time_seconds=4, budget: SearchBudget = None) -> (Node, int):
+        # without a budget, the search uses the whole run time
+        if budget is None:
+            budget = SearchBudget(time_seconds=run_time_seconds, early_stop=False).start()
 
         sampled_round = Sampler.sample(rnd)
         root_node = Node()
@@ -20,7 +23,8 @@ class MCTS:
         root_node.action.round = sampled_round
 
         simulated_rounds = 0
-        while time.time() < end_time:
+        while not budget.is_done(root_node.action.visit_count,
+                                 *SearchBudget.best_two(child.action.visit_count for child in root_node.childs)):
             promising_node = MCTS._select_promising_node(root_node)
             if promising_node.action.round.nr_cards_in_trick < 4:
                 MCTS._expand_node(promising_node, sampled_round)
@@ -36,7 +40,7 @@ class MCTS:
         winner = max(root_node.childs, key=attrgetter('action.visit_count'))
 
         #winner = root_node.get_child_with_max_visit_count()
-        print(f"{simulated_rounds} rounds simulated in {run_time_seconds} seconds")
+        print(f"{simulated_rounds} rounds simulated in {time.time() - budget.start_time} seconds")
         print(f"winner: {winner.action.card} with visit count {winner.action.visit_count} ({round(winner.action.visit_count/simulated_rounds, 3)}), valid cards: {np.flatnonzero(sampled_round.get_valid_cards())}")
         return root_node
 
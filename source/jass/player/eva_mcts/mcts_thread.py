@@ -4,8 +4,9 @@ from operator import attrgetter
 from operator import itemgetter
 
 class MCTSThreaded:
-    def __init__(self, player_rnd, thread_count=8):
+    def __init__(self, player_rnd, thread_count=8, budget=None):
         self.simulated_rounds = 0
+        self.budget = budget
         self.player_rnd = player_rnd
         self.thread_count = thread_count
         self.winners = []
@@ -39,7 +40,7 @@ class MCTSThreaded:
         return winner[0]
 
     def _call_mcts(self):
-        root_node = MCTS.monte_carlo_tree_search(self.player_rnd)
+        root_node = MCTS.monte_carlo_tree_search(self.player_rnd, budget=self.budget)
         self.simulated_rounds += root_node.action.visit_count
         for card in root_node.childs:
             self.winners.append(card)
\ No newline at end of file
@@ -1,31 +1,24 @@
 import math
-import sys
+
+import numpy as np
+
 from source.jass.player.mcts.node import Node
+from source.jass.player.mcts.selection import SelectionPolicy, UCB1, log_visits
 
 
 class UCB:
-    def __init__(self, c=1) -> None:
+    def __init__(self, c=1, policy: SelectionPolicy = None) -> None:
         self.c = c
+        # the policy used to select the child, UCB1 with the constant c by default
+        self.policy = policy if policy is not None else UCB1(c)
 
     def ucb_value(self, total_visits: int, node_win_count: float, node_visits: int) -> float:
         if node_visits == 0:
             return 2147483647
-        ucb = (node_win_count / node_visits) + self.c * math.sqrt(math.log(total_visits, math.e) / node_visits)
+        ucb = (node_win_count / node_visits) + self.c * math.sqrt(log_visits(total_visits) / node_visits)
         return ucb
 
     def find_best_node_ucb(self, node: Node):
-        parent_visits = node.visit_count
-
-        best_child = None
-        best_score = -1.0
-        for child in node.childs:  # type; State
-            score = self.ucb_value(parent_visits, child.win_count, child.visit_count, c)
-            if score > best_score:
-                best_child = child
-                best_score = score
-
-        if best_child is None:
-            print("No best Children Found")
-
-        # print(f" best child: {best_child.card}, best score: {best_score}")
-        return best_child
+        wins = np.array([child.win_count for child in node.childs], dtype=np.float64)
+        visits = np.array([child.visit_count for child in node.childs], dtype=np.int64)
+        return node.childs[self.policy.select(wins, visits, node.visit_count)]
@@ -0,0 +1,136 @@
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.player.endgame_solver import EndgameSolver
+from source.jass.player.mcts.array_tree import ArrayTree
+from source.jass.player.mcts.mcts import MCTS
+from source.jass.player.mcts.sampler import Sampler
+from source.jass.player.mcts.selection import SelectionPolicy, UCB1
+from source.jass.player.mcts.transposition_table import TranspositionTable
+from source.jass.player.search_budget import SearchBudget
+
+
+class ArrayMCTS:
+    """
+    Monte carlo tree search as in MCTS, on a tree stored in an ArrayTree instead of Node objects. The search has the
+    same interface as MCTS (and mcts_cythonized), with an ArrayTree in place of the root node.
+    """
+
+    @staticmethod
+    def monte_carlo_tree_search(rnd: PlayerRound, run_time_seconds=9, ucb_c=1,
+                                budget: SearchBudget = None, tree: ArrayTree = None,
+                                exact_cards: int = 0, policy: SelectionPolicy = None,
+                                transposition_bits: int = 0) -> ArrayTree:
+        """
+        Search the tree for the current player of the player round, the arguments are as in MCTS, additionally:
+
+        Args:
+            transposition_bits: share the statistics of transpositions in a TranspositionTable of
+            2 ** transposition_bits entries for the tree, 0 for no table
+        """
+        # without a budget, the search uses the whole run time
+        if budget is None:
+            budget = SearchBudget(time_seconds=run_time_seconds, early_stop=False).start()
+
+        # as in MCTS, the sampled round is moved along the path to the selected node and back
+        if tree is None:
+            tree = ArrayTree()
+            tree.round = Sampler.sample(rnd)
+            if transposition_bits > 0:
+                tree.table = TranspositionTable(transposition_bits)
+        sampled_round = tree.round
+        root_player = sampled_round.player
+        start_visits = tree.visit_count
+        table = tree.table
+        if table is not None:
+            table.new_search()
+
+        # positions with at most exact_cards cards left are evaluated exactly instead of by a random playout
+        solver = EndgameSolver() if exact_cards > 0 else None
+        if policy is None:
+            policy = UCB1(ucb_c)
+
+        while True:
+            start, end = tree.children(tree.root)
+            if budget.is_done(tree.visit_count - start_visits,
+                              *SearchBudget.best_two(tree.visits[start:end].tolist())):
+                break
+
+            # selection, the path contains the visited nodes from the root
+            path = [tree.root]
+            node = tree.root
+            while not tree.is_leaf(node):
+                node = tree.select_child(node, policy)
+                sampled_round.push_card(int(tree.card[node]))
+                path.append(node)
+            depth = len(path) - 1
+
+            if sampled_round.nr_played_cards == 36:
+                # terminal node, nothing to expand, so evaluate the result for the player of the last card
+                card = sampled_round.pop_card()
+                player = sampled_round.player
+                sampled_round.push_card(card)
+                wins = int(MCTS._is_win(sampled_round, player, (((depth - 1 + root_player) % 2) == 0)))
+                nr_simulations = 1
+            else:
+                # expansion of all valid cards with one simulation each
+                valid_cards = np.flatnonzero(sampled_round.get_valid_cards())
+                my_play = ((depth + root_player) % 2) == 0
+                results = [MCTS._simulate_round(sampled_round, card, my_play, solver, exact_cards)
+                           for card in valid_cards]
+                keys = None
+                if table is not None:
+                    keys = np.array([ArrayMCTS._key_after(sampled_round, card) for card in valid_cards],
+                                    dtype=np.uint64)
+                    table.add(keys, 1, np.array(results, dtype=np.int32))
+                start = tree.add_children(node, valid_cards, keys)
+                end = start + len(valid_cards)
+                tree.visits[start:end] = 1
+                tree.wins[start:end] = results
+                wins = sum(results)
+                nr_simulations = len(valid_cards)
+
+            # back propagation of all simulations along the path at once
+            tree.visits[path] += nr_simulations
+            tree.wins[path] += wins
+            if table is not None and depth > 0:
+                table.add(tree.key[path[1:]], nr_simulations, wins)
+
+            for _ in range(depth):
+                sampled_round.pop_card()
+
+        return tree
+
+    @staticmethod
+    def _key_after(rnd, card: int) -> int:
+        # zobrist hash of the state after the card is played
+        rnd.push_card(card)
+        key = rnd.zobrist_hash
+        rnd.pop_card()
+        return key
+
+    @staticmethod
+    def advance_root(tree: ArrayTree, cards: list) -> ArrayTree or None:
+        """
+        Advance the root of a tree from a previous search through the cards played since then, for the use in
+        TreeCache. The nodes outside the new subtree remain in the arrays, but are not used anymore.
+
+        Args:
+            tree: the tree
+            cards: the cards played since the search
+
+        Returns:
+            the tree with the node reached by the cards as root, or None if the tree can not be reused
+        """
+        # the results in the tree depend on the parity of the depth, which must not change
+        if len(cards) % 2 != 0:
+            return None
+        node = tree.root
+        for card in cards:
+            node = tree.get_child(node, card)
+            if node is None:
+                # the card was not possible in the sampled hands of this tree
+                return None
+        for card in cards:
+            tree.round.push_card(card)
+        tree.root = node
+        return tree
@@ -0,0 +1,159 @@
+from collections import namedtuple
+
+import numpy as np
+
+from source.jass.player.mcts.selection import SelectionPolicy
+
+# statistics of a child of the root, with the same attributes as Node, for the code that evaluates the root
+ArrayTreeChild = namedtuple('ArrayTreeChild', ['card', 'visit_count'])
+
+
+class ArrayTree:
+    """
+    Search tree stored in flat numpy arrays instead of one Node object per node.
+
+    Every node is an index into the arrays, which contain the parent, the first child and the number of children,
+    the card that leads to the node, and the visit and win counts. The children of a node are always stored in
+    consecutive entries, so the statistics of all children are a slice of the arrays and the scores of all
+    children are calculated by one vectorized call of the selection policy. The arrays are allocated in advance and
+    doubled in size when they are full.
+
+    Optionally, the tree also stores the zobrist hash of the state of each node and shares the statistics of the
+    nodes of the same state in a TranspositionTable: the selection then uses the statistics of the table, which
+    include the simulations of all transpositions of a state.
+
+    The tree has the attributes visit_count, childs and round of the root Node, so it can be used in place of a root
+    node by the code that evaluates the result of a search (MCTSThreaded, MCTSProcessPool) and in TreeCache.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: the initial number of nodes that can be stored
+        """
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.child_count = np.zeros(capacity, dtype=np.int8)
+        self.card = np.full(capacity, -1, dtype=np.int8)
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.wins = np.zeros(capacity, dtype=np.int32)
+        # zobrist hash of the state of the node, only used with a transposition table
+        self.key = np.zeros(capacity, dtype=np.uint64)
+
+        # node 0 is the initial root, the root changes when the tree is advanced
+        self.size = 1
+        self.root = 0
+        # the sampled round of the search, in the state of the root
+        self.round = None
+        # the transposition table (TranspositionTable) or None
+        self.table = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self.parent)
+
+    @property
+    def visit_count(self) -> int:
+        return int(self.visits[self.root])
+
+    @property
+    def childs(self) -> list:
+        start, end = self.children(self.root)
+        return [ArrayTreeChild(int(card), int(visits))
+                for card, visits in zip(self.card[start:end], self.visits[start:end])]
+
+    def _grow(self, capacity: int) -> None:
+        for name, fill in (('parent', -1), ('first_child', -1), ('child_count', 0), ('card', -1), ('visits', 0),
+                           ('wins', 0), ('key', 0)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[0:self.size] = old[0:self.size]
+            setattr(self, name, new)
+
+    def add_children(self, node: int, cards, keys=None) -> int:
+        """
+        Add the children for the cards to a node that has no children yet.
+
+        Args:
+            node: the node
+            cards: the cards of the children
+            keys: the hashes of the states of the children, or None
+
+        Returns:
+            the index of the first child
+        """
+        nr_children = len(cards)
+        if self.size + nr_children > self.capacity:
+            capacity = self.capacity
+            while self.size + nr_children > capacity:
+                capacity *= 2
+            self._grow(capacity)
+        start = self.size
+        end = start + nr_children
+        self.parent[start:end] = node
+        self.card[start:end] = cards
+        if keys is not None:
+            self.key[start:end] = keys
+        self.first_child[node] = start
+        self.child_count[node] = nr_children
+        self.size = end
+        return start
+
+    def children(self, node: int) -> (int, int):
+        """
+        Get the range of the children of a node.
+
+        Returns:
+            start and end (exclusive) index of the children
+        """
+        start = int(self.first_child[node])
+        return start, start + int(self.child_count[node])
+
+    def is_leaf(self, node: int) -> bool:
+        return self.child_count[node] == 0
+
+    def get_child(self, node: int, card: int) -> int or None:
+        start, end = self.children(node)
+        index = np.flatnonzero(self.card[start:end] == card)
+        if len(index) == 0:
+            return None
+        return start + int(index[0])
+
+    def select_child(self, node: int, policy: SelectionPolicy) -> int:
+        """
+        Get the child of the node with the best score of the selection policy. With a transposition table, the
+        statistics of the table are used if they include more simulations than the node.
+
+        Args:
+            node: the node, which must have children
+            policy: the selection policy
+
+        Returns:
+            the index of the selected child
+        """
+        start, end = self.children(node)
+        wins = self.wins[start:end]
+        visits = self.visits[start:end]
+        parent_visits = int(self.visits[node])
+        if self.table is not None:
+            table_visits, table_wins = self.table.lookup(self.key[start:end])
+            use_table = table_visits > visits
+            wins = np.where(use_table, table_wins, wins)
+            visits = np.where(use_table, table_visits, visits)
+            parent_visits = max(parent_visits, int(visits.sum()))
+        return start + policy.select(wins, visits, parent_visits)
+
+    def get_child_with_max_visit_count(self, node: int) -> int:
+        start, end = self.children(node)
+        return start + int(np.argmax(self.visits[start:end]))
+
+    def path_cards(self, node: int) -> list:
+        """
+        Get the cards played from the root to the node.
+        """
+        cards = []
+        while node != self.root:
+            cards.append(int(self.card[node]))
+            node = int(self.parent[node])
+        cards.reverse()
+        return cards
@@ -0,0 +1,148 @@
+import random
+
+import numpy as np
+
+from source.jass.base.bitboard import convert_bits_to_int_encoded_list
+from source.jass.base.fast_round import FastRound
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.rule_schieber import RuleSchieber
+from source.jass.player.constraint_sampler import DeterminizationGenerator
+from source.jass.player.mcts.ismcts_node import ISMCTSNode
+from source.jass.player.mcts.selection import SelectionPolicy, UCB1
+from source.jass.player.search_budget import SearchBudget
+
+# number of determinizations sampled at once
+_DETERMINIZATION_BATCH_SIZE = 64
+
+
+class ISMCTS:
+    """
+    Single observer information set monte carlo tree search (SO-ISMCTS).
+
+    In contrast to MCTS, which searches one fixed sample of the hands of the other players, every iteration uses a
+    new determinization (a sample of the hands that is consistent with the information of the player). All
+    iterations share one tree, whose nodes are the information sets of the observing player, so the statistics are
+    aggregated over all the samples. As a card is only valid in some of the determinizations, the selection uses
+    the number of times a node was available instead of the visits of the parent in the UCB formula.
+    """
+
+    @staticmethod
+    def search(player_rnd: PlayerRound, run_time_seconds=9, ucb_c=1.0, budget: SearchBudget = None,
+               root_node: ISMCTSNode = None, policy: SelectionPolicy = None) -> ISMCTSNode:
+        """
+        Search the tree for the current player of the player round.
+
+        Args:
+            player_rnd: the round from the view of the player to play
+            run_time_seconds: the time to search, if no budget is given
+            ucb_c: exploration constant of the UCB formula
+            budget: the started budget for the search
+            root_node: the root of a tree from a previous search to continue (see advance_root), or None
+            policy: the selection policy, or None for UCB1 with the constant ucb_c
+
+        Returns:
+            the root node of the tree
+        """
+        if policy is None:
+            policy = UCB1(ucb_c)
+        if budget is None:
+            budget = SearchBudget(time_seconds=run_time_seconds, early_stop=False).start()
+        # the hands of the other players are set by the determinization
+        root_rnd = FastRound.from_player_round(player_rnd, np.zeros([4, 36], dtype=np.int32))
+        if root_rnd.rule is None:
+            root_rnd.rule = RuleSchieber()
+        if root_node is None:
+            root_node = ISMCTSNode(player_nr=None)
+        start_visits = root_node.visit_count
+        # the determinizations are sampled in batches, which is much faster than sampling them one by one
+        generator = DeterminizationGenerator(player_rnd)
+        determinizations = []
+
+        while not budget.is_done(root_node.visit_count - start_visits,
+                                 *SearchBudget.best_two(child.visit_count for child in root_node.childs.values())):
+            if len(determinizations) == 0:
+                determinizations = generator.hands_bits(_DETERMINIZATION_BATCH_SIZE).tolist()
+            rnd = root_rnd.clone()
+            rnd.hands = determinizations.pop()
+            ISMCTS._iterate(root_node, rnd, policy)
+
+        return root_node
+
+    @staticmethod
+    def advance_root(root_node: ISMCTSNode, cards: list) -> ISMCTSNode or None:
+        """
+        Advance the root of a tree from a previous search through the cards played since then, for the use in
+        TreeCache. As the nodes are information sets, the statistics of the subtree remain valid.
+
+        Args:
+            root_node: the root of the tree
+            cards: the cards played since the search
+
+        Returns:
+            the node reached by the cards as new root, or None if the cards are not in the tree
+        """
+        node = root_node
+        for card in cards:
+            node = node.get_child(card)
+            if node is None:
+                return None
+        node.parent = None
+        return node
+
+    @staticmethod
+    def _iterate(root_node: ISMCTSNode, rnd: FastRound, policy: SelectionPolicy) -> None:
+        """
+        One iteration (selection, expansion, simulation and back propagation) on one determinization.
+        """
+        node = root_node
+
+        # selection: descend as long as all the valid cards of the determinization have been expanded
+        while rnd.nr_played_cards < 36:
+            valid_cards = convert_bits_to_int_encoded_list(rnd.get_valid_cards())
+            untried = [card for card in valid_cards if card not in node.childs]
+            if len(untried) > 0:
+                # expansion
+                card = random.choice(untried)
+                for valid_card in valid_cards:
+                    if valid_card in node.childs:
+                        node.childs[valid_card].availability_count += 1
+                node = node.add_child(card, rnd.player)
+                node.availability_count += 1
+                rnd.play(card)
+                break
+            node = ISMCTS._select_child(node, valid_cards, policy)
+            rnd.play(node.card)
+
+        # simulation
+        while rnd.nr_played_cards < 36:
+            rnd.play(random.choice(convert_bits_to_int_encoded_list(rnd.get_valid_cards())))
+
+        # back propagation
+        if rnd.points_team_0 > rnd.points_team_1:
+            winning_team = 0
+        elif rnd.points_team_1 > rnd.points_team_0:
+            winning_team = 1
+        else:
+            winning_team = None
+        while node is not root_node:
+            node.increment_visit()
+            if winning_team is None:
+                node.win_count += 0.5
+            elif node.player_nr % 2 == winning_team:
+                node.win_count += 1
+            node = node.parent
+        root_node.increment_visit()
+
+    @staticmethod
+    def _select_child(node: ISMCTSNode, valid_cards: list, policy: SelectionPolicy) -> ISMCTSNode:
+        """
+        Select the child with the best score among the children that are valid in the determinization and update
+        their availability. The availability of each child takes the place of the visits of the parent.
+        """
+        children = [node.childs[card] for card in valid_cards]
+        for child in children:
+            child.availability_count += 1
+        wins = np.array([child.win_count for child in children], dtype=np.float64)
+        visits = np.array([child.visit_count for child in children], dtype=np.int64)
+        availability = np.array([child.availability_count for child in children], dtype=np.int64)
+        return children[policy.select(wins, visits, availability)]
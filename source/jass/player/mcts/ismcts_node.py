@@ -0,0 +1,33 @@
+class ISMCTSNode:
+    """
+    Node of the tree of the information set monte carlo tree search. A node corresponds to the information set of
+    the observing player after the card of the node has been played, so the same node is used by all the
+    determinizations that are consistent with it.
+
+    The statistics are kept from the view of the player that played the card of the node: win_count counts the
+    simulations won by the team of that player.
+    """
+    def __init__(self, parent: 'ISMCTSNode' = None, card: int = None, player_nr: int = None) -> None:
+        self.parent = parent
+        self.childs = {}  # card -> ISMCTSNode
+        self.card = card
+        self.player_nr = player_nr
+        self.win_count = 0.0
+        self.visit_count = 0
+        # number of times the node was available for selection, i.e. its card was a valid card in the
+        # determinization used
+        self.availability_count = 0
+
+    def increment_visit(self):
+        self.visit_count += 1
+
+    def add_child(self, card: int, player_nr: int) -> 'ISMCTSNode':
+        node = ISMCTSNode(self, card, player_nr)
+        self.childs[card] = node
+        return node
+
+    def get_child(self, card: int) -> 'ISMCTSNode' or None:
+        return self.childs.get(card)
+
+    def get_child_with_max_visit_count(self) -> 'ISMCTSNode':
+        return max(self.childs.values(), key=lambda child: child.visit_count)
@@ -0,0 +1,50 @@
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.player.mcts.mcts_player import MCTSPlayer
+from source.jass.player.mcts.ismcts import ISMCTS
+from source.jass.player.mcts.selection import SelectionPolicy
+from source.jass.player.mcts.tree_cache import TreeCache
+from source.jass.player.search_budget import SearchBudget
+
+
+class ISMCTSPlayer(MCTSPlayer):
+    """
+    Implementation of a player to play Jass using information set Monte Carlo Tree Search. The trump is selected
+    as in MCTSPlayer.
+
+    The tree of the previous move is continued if it contains the cards played since then.
+    """
+
+    def __init__(self, ucb_c=0.7, budget: SearchBudget = None, reuse_tree=True, policy: SelectionPolicy = None):
+        super().__init__(ucb_c=ucb_c, threads=1, budget=budget, reuse_tree=reuse_tree, policy=policy)
+        self._tree_cache = TreeCache(ISMCTS.advance_root, max_trees=1) if reuse_tree else None
+
+    def play_card(self, player_rnd: PlayerRound, deadline: float = None) -> int:
+        """
+        Player returns a card to play based on the given round information.
+
+        Args:
+            player_rnd: current round
+            deadline: absolute time (as from time.time()) by which the card must be selected, in addition to the
+            budget of the player
+
+        Returns:
+            card to play, int encoded
+        """
+        valid_cards = np.flatnonzero(player_rnd.get_valid_cards())
+        if len(valid_cards) == 1:
+            self.last_simulations = 0
+            return valid_cards[0]
+
+        root_node = None
+        if self._tree_cache is not None:
+            root_node = self._tree_cache.take(player_rnd)
+        root_node = ISMCTS.search(player_rnd, ucb_c=self.ucb_c, budget=self.budget.start(deadline),
+                                  root_node=root_node, policy=self.policy)
+        if self._tree_cache is not None:
+            self._tree_cache.put(player_rnd, root_node)
+        self.last_simulations = root_node.visit_count
+        best_child = root_node.get_child_with_max_visit_count()
+        self._logger.debug('ISMCTS selected card {} with {} of {} visits'.format(
+            best_child.card, best_child.visit_count, root_node.visit_count))
+        return best_child.card
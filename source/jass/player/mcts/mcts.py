@@ -1,48 +1,118 @@
 from source.jass.base.const import *
 from source.jass.base.player_round import PlayerRound
+from source.jass.base.round import Round
 from source.jass.base.round_factory import get_round_from_player_round
 from source.jass.player.mcts.sampler import Sampler
 from source.jass.player.mcts.node import Node
 from source.jass.player.mcts.UCB import UCB
+from source.jass.player.mcts.selection import SelectionPolicy
 from source.jass.player.random_player_schieber import RandomPlayerSchieber
-import time
-import copy
+from source.jass.player.search_budget import SearchBudget
+from source.jass.player.endgame_solver import EndgameSolver
+from source.jass.base.fast_round import FastRound
 
 
 class MCTS:
     @staticmethod
-    def monte_carlo_tree_search(rnd: PlayerRound, run_time_seconds=9) -> (Node, int):
-        end_time = time.time() + run_time_seconds
+    def monte_carlo_tree_search(rnd: PlayerRound, run_time_seconds=9, ucb_c=1,
+                                budget: SearchBudget = None, root_node: Node = None,
+                                exact_cards: int = 0, policy: SelectionPolicy = None) -> (Node, int):
+        # without a budget, the search uses the whole run time
+        if budget is None:
+            budget = SearchBudget(time_seconds=run_time_seconds, early_stop=False).start()
 
-        sampled_round = Sampler.sample(rnd)
-        root_node = Node()
-        root_node.player_nr = rnd.player
-        root_node.round = sampled_round
+        # the sampled round is shared by the whole tree: it is moved to the state of a node by playing the cards
+        # along the path from the root (push_card) and moved back to the root afterwards (pop_card), so the nodes
+        # only need to store the card. The sampled round is kept in the root, so that the search can be continued
+        # on a tree from a previous search (see advance_root).
+        if root_node is None:
+            root_node = Node()
+            root_node.player_nr = rnd.player
+            root_node.round = Sampler.sample(rnd)
+        sampled_round = root_node.round
+        root_player = sampled_round.player
+        start_visits = root_node.visit_count
         simulated_rounds = 0
 
-        while time.time() < end_time:
-            promising_node, depth = MCTS._select_promising_node(root_node)
-            valid_cards = np.flatnonzero(promising_node.round.get_valid_cards())
-
-            for card in valid_cards:
-                win, played_round = MCTS._simulate_round(sampled_round, card, (((depth + sampled_round.player) % 2) == 0))
-                new_node = Node()
-                new_node.parent = promising_node
-                new_node.round = played_round
-                new_node.player_nr = ((promising_node.player_nr + 1) % 4)
-                new_node.card = card
-                promising_node.add_child(new_node)
-                MCTS._back_propagation(new_node, win)
+        # positions with at most exact_cards cards left are evaluated exactly instead of by a random playout, the
+        # solver is shared by all the evaluations, as they are all on the same sampled hands
+        solver = EndgameSolver() if exact_cards > 0 else None
+        ucb = UCB(ucb_c, policy)
+
+        while not budget.is_done(root_node.visit_count - start_visits,
+                                 *SearchBudget.best_two(child.visit_count for child in root_node.childs)):
+            promising_node, depth = MCTS._select_promising_node(root_node, ucb)
+            MCTS._push_path(sampled_round, promising_node)
+
+            if sampled_round.nr_played_cards == 36:
+                # terminal node, nothing to expand, so evaluate the result for the player of the last card
+                card = sampled_round.pop_card()
+                player = sampled_round.player
+                sampled_round.push_card(card)
+                win = MCTS._is_win(sampled_round, player, (((depth - 1 + root_player) % 2) == 0))
+                MCTS._back_propagation(promising_node, win)
+            else:
+                valid_cards = np.flatnonzero(sampled_round.get_valid_cards())
+                for card in valid_cards:
+                    win = MCTS._simulate_round(sampled_round, card, (((depth + root_player) % 2) == 0),
+                                               solver, exact_cards)
+                    new_node = Node()
+                    new_node.parent = promising_node
+                    new_node.player_nr = ((promising_node.player_nr + 1) % 4)
+                    new_node.card = card
+                    promising_node.add_child(new_node)
+                    MCTS._back_propagation(new_node, win)
+
+            for _ in range(depth):
+                sampled_round.pop_card()
             simulated_rounds += 1
 
         return root_node
 
     @staticmethod
-    def _select_promising_node(root_node: Node) -> (Node, int):
+    def advance_root(root_node: Node, cards: list) -> Node or None:
+        """
+        Advance the root of a tree from a previous search through the cards played since then, for the use in
+        TreeCache.
+
+        Args:
+            root_node: the root of the tree
+            cards: the cards played since the search
+
+        Returns:
+            the node reached by the cards as new root, or None if the tree can not be reused
+        """
+        # the results in the tree depend on the parity of the depth, which must not change
+        if len(cards) % 2 != 0:
+            return None
+        node = root_node
+        for card in cards:
+            node = node.get_child(card)
+            if node is None:
+                # the card was not possible in the sampled hands of this tree
+                return None
+        sampled_round = root_node.round
+        for card in cards:
+            sampled_round.push_card(card)
+        root_node.round = None
+        node.round = sampled_round
+        node.parent = None
+        return node
+
+    @staticmethod
+    def _push_path(rnd: Round, node: Node):
+        cards = []
+        while node.parent is not None:
+            cards.append(node.card)
+            node = node.parent
+        for card in reversed(cards):
+            rnd.push_card(card)
+
+    @staticmethod
+    def _select_promising_node(root_node: Node, ucb: UCB) -> (Node, int):
         node = root_node
         depth = 0
         while len(node.childs) != 0:
-            ucb = UCB()
             node = ucb.find_best_node_ucb(node)
             depth += 1
         return node, depth
@@ -59,32 +129,44 @@ class MCTS:
             node.add_child(new_node)
 
     @staticmethod
-    def _simulate_round(round: PlayerRound, card, my_play) -> (bool, PlayerRound):
-        rnd = get_round_from_player_round(round, round.hands)
+    def _simulate_round(rnd: Round, card, my_play, solver: EndgameSolver = None, exact_cards: int = 0) -> bool:
         player = rnd.player
-        rnd.action_play_card(card)
-        played_round = copy.deepcopy(rnd)
+        rnd.push_card(card)
         cards = rnd.nr_played_cards
+        if solver is not None and 36 - cards <= exact_cards:
+            win = MCTS._is_win_points(solver.solve(FastRound.from_round(rnd)), player, my_play)
+            rnd.pop_card()
+            return win
         random_player = RandomPlayerSchieber()
-        while cards < 36:
-            player_rnd = PlayerRound()
-            player_rnd.set_from_round(rnd)
+        player_rnd = PlayerRound()
+        while rnd.nr_played_cards < 36:
+            player_rnd.set_from_round_shared(rnd)
             card_action = random_player.play_card(player_rnd)
-            rnd.action_play_card(card_action)
-            cards += 1
+            rnd.push_card(card_action)
+
+        win = MCTS._is_win(rnd, player, my_play)
 
-        max_points = rnd.points_team_0 + rnd.points_team_1
-        my_points = rnd.get_points_for_player(player)
-        enemy_points = max_points - my_points
+        # restore the round to the state before the card was played
+        while rnd.nr_played_cards >= cards:
+            rnd.pop_card()
+        return win
+
+    @staticmethod
+    def _is_win(rnd: Round, player: int, my_play: bool) -> bool:
+        return MCTS._is_win_points((rnd.points_team_0, rnd.points_team_1), player, my_play)
+
+    @staticmethod
+    def _is_win_points(points: (int, int), player: int, my_play: bool) -> bool:
+        my_points = points[player % 2]
+        enemy_points = points[1 - player % 2]
 
-        win = (my_points > enemy_points and my_play) or (enemy_points > my_points and not my_play)
-        return win, played_round
+        return (my_points > enemy_points and my_play) or (enemy_points > my_points and not my_play)
 
     @staticmethod
     def _back_propagation(node: Node, win: bool):
         temp_node = node
         while temp_node:
-            temp_node.incr_visit()
+            temp_node.increment_visit()
             if win:
                 temp_node.win_count += 1
             else:
@@ -1,7 +1,5 @@
 import math
 import random
-import time
-import copy
 from cpython cimport bool
 
 from jass.base.const import *
@@ -9,44 +7,97 @@ from jass.base.player_round import PlayerRound
 from jass.base.player_round_cheating import PlayerRoundCheating
 from jass.base.round_factory import get_round_from_player_round
 from jass.player.random_player_schieber import RandomPlayerSchieber
+from jass.player.search_budget import SearchBudget
+from jass.player.endgame_solver import EndgameSolver
+from jass.player.constraint_sampler import sample_hands
+from jass.player.mcts.selection import log_visits
+from jass.base.fast_round import FastRound
 
 
-def monte_carlo_tree_search(rnd: PlayerRound, int run_time_seconds=9, int c=1) -> (Node, int):
-    cdef double end_time
+def monte_carlo_tree_search(rnd: PlayerRound, int run_time_seconds=9, int c=1, budget=None,
+                            root_node=None, int exact_cards=0, policy=None) -> (Node, int):
     cdef int depth
-    end_time = time.time() + run_time_seconds
-
-    sampled_round = _sample(rnd)
-    root_node = Node()
-    root_node.player_nr = rnd.player
-    root_node.round = sampled_round
+    # without a budget, the search uses the whole run time
+    if budget is None:
+        budget = SearchBudget(time_seconds=run_time_seconds, early_stop=False).start()
+
+    # the sampled round is shared by the whole tree: it is moved to the state of a node by playing the cards
+    # along the path from the root (push_card) and moved back to the root afterwards (pop_card), so the nodes
+    # only need to store the card. The sampled round is kept in the root, so that the search can be continued
+    # on a tree from a previous search (see advance_root).
+    if root_node is None:
+        root_node = Node()
+        root_node.player_nr = rnd.player
+        root_node.round = _sample(rnd)
+    sampled_round = root_node.round
+    cdef int root_player
+    root_player = sampled_round.player
+    cdef int start_visits
+    start_visits = root_node.visit_count
     cdef int simulated_rounds
     simulated_rounds = 0
-    while time.time() < end_time:
-        promising_node, depth = _select_promising_node(root_node, c)
-        valid_cards = np.flatnonzero(promising_node.round.get_valid_cards())
-
-        for card in valid_cards:
-            win, played_round = _simulate_round(sampled_round, card, (((depth + sampled_round.player) % 2) == 0))
-            new_node = Node()
-            new_node.parent = promising_node
-            new_node.round = played_round
-            new_node.player_nr = ((promising_node.player_nr + 1) % 4)
-            new_node.card = card
-            promising_node.add_child(new_node)
-            _back_propagation(new_node, win)
+
+    # positions with at most exact_cards cards left are evaluated exactly instead of by a random playout, the
+    # solver is shared by all the evaluations, as they are all on the same sampled hands
+    solver = EndgameSolver() if exact_cards > 0 else None
+    cdef int i
+    while not budget.is_done(root_node.visit_count - start_visits,
+                             *SearchBudget.best_two(child.visit_count for child in root_node.childs)):
+        promising_node, depth = _select_promising_node(root_node, c, policy)
+        _push_path(sampled_round, promising_node)
+
+        if sampled_round.nr_played_cards == 36:
+            # terminal node, nothing to expand, so evaluate the result for the player of the last card
+            card = sampled_round.pop_card()
+            player = sampled_round.player
+            sampled_round.push_card(card)
+            win = _is_win(sampled_round, player, (((depth - 1 + root_player) % 2) == 0))
+            _back_propagation(promising_node, win)
+        else:
+            valid_cards = np.flatnonzero(sampled_round.get_valid_cards())
+            for card in valid_cards:
+                win = _simulate_round(sampled_round, card, (((depth + root_player) % 2) == 0), solver, exact_cards)
+                new_node = Node()
+                new_node.parent = promising_node
+                new_node.player_nr = ((promising_node.player_nr + 1) % 4)
+                new_node.card = card
+                promising_node.add_child(new_node)
+                _back_propagation(new_node, win)
+
+        for i in range(depth):
+            sampled_round.pop_card()
         simulated_rounds += 1
     #winner = root_node.get_child_with_max_visit_count()
     #print(f"{simulated_rounds} rounds simulated in {run_time_seconds} seconds")
     #print(f"winner: {winner.card} with visit count {winner.visit_count} ({round(winner.visit_count/simulated_rounds, 3)}), valid cards: {np.flatnonzero(sampled_round.get_valid_cards())}")
     return root_node
 
-def _select_promising_node(root_node: Node, int c) -> Node:
+def advance_root(root_node, cards):
+    # advance the root of a tree from a previous search through the cards played since then (see MCTS.advance_root)
+    if len(cards) % 2 != 0:
+        return None
+    node = root_node
+    for card in cards:
+        node = node.get_child(card)
+        if node is None:
+            return None
+    sampled_round = root_node.round
+    for card in cards:
+        sampled_round.push_card(card)
+    root_node.round = None
+    node.round = sampled_round
+    node.parent = None
+    return node
+
+def _select_promising_node(root_node: Node, int c, policy=None) -> Node:
     node = root_node
     cdef int depth
     depth = 0
     while len(node.childs) != 0:
-        node = _find_best_node_ucb(node, c)
+        if policy is None:
+            node = _find_best_node_ucb(node, c)
+        else:
+            node = _find_best_node_policy(node, policy)
         depth += 1
     return node, depth
 
@@ -61,38 +112,55 @@ def _select_promising_node(root_node: Node, int c) -> Node:
 #         new_node.card = card
 #         node.add_child(new_node)
 
-def _simulate_round(round: PlayerRound, int card, my_play) -> (bool, PlayerRound):
+def _push_path(rnd, node: Node):
+    cards = []
+    while node.parent is not None:
+        cards.append(node.card)
+        node = node.parent
+    for card in reversed(cards):
+        rnd.push_card(card)
+
+def _simulate_round(rnd, int card, my_play, solver=None, int exact_cards=0) -> bool:
     cdef int player
     cdef int cards
     cdef int card_action
-    rnd = get_round_from_player_round(round, round.hands)
     player = rnd.player
-    rnd.action_play_card(card)
-    played_round = copy.deepcopy(rnd)
+    rnd.push_card(card)
     cards = rnd.nr_played_cards
+    if solver is not None and 36 - cards <= exact_cards:
+        win = _is_win_points(solver.solve(FastRound.from_round(rnd)), player, my_play)
+        rnd.pop_card()
+        return win
     random_player = RandomPlayerSchieber()
-    while cards < 36:
-        player_rnd = PlayerRound()
-        player_rnd.set_from_round(rnd)
+    player_rnd = PlayerRound()
+    while rnd.nr_played_cards < 36:
+        player_rnd.set_from_round_shared(rnd)
         card_action = random_player.play_card(player_rnd)
-        rnd.action_play_card(card_action)
-        cards += 1
+        rnd.push_card(card_action)
+
+    win = _is_win(rnd, player, my_play)
+
+    # restore the round to the state before the card was played
+    while rnd.nr_played_cards >= cards:
+        rnd.pop_card()
+    return win
+
+def _is_win(rnd, int player, my_play) -> bool:
+    return _is_win_points((rnd.points_team_0, rnd.points_team_1), player, my_play)
 
-    cdef int max_points
+def _is_win_points(points, int player, my_play) -> bool:
     cdef int my_points
     cdef int enemy_points
 
-    max_points = rnd.points_team_0 + rnd.points_team_1
-    my_points = rnd.get_points_for_player(player)
-    enemy_points = max_points - my_points
+    my_points = points[player % 2]
+    enemy_points = points[1 - player % 2]
 
-    win = (my_points > enemy_points and my_play) or (enemy_points > my_points and not my_play)
-    return win, played_round
+    return (my_points > enemy_points and my_play) or (enemy_points > my_points and not my_play)
 
 def _back_propagation(node: Node, win):
     temp_node = node
     while temp_node:
-        temp_node.incr_visit()
+        temp_node.increment_visit()
         if win:
             temp_node.win_count += 1
         else:
@@ -100,37 +168,16 @@ def _back_propagation(node: Node, win):
         temp_node = temp_node.parent
 
 def _sample(rnd: PlayerRound) -> PlayerRoundCheating:
-    sampled_cards = np.ones(36, int)
-    np.ma.masked_where(rnd.hand == 1, sampled_cards).filled(0)
-    hands = np.zeros(shape=[4, 36], dtype=np.int)
-
-    # give the own player the correct hand and the other players sampled hands
-    cdef int i
-    for i in range(0, 4):
-        if i == rnd.player:
-            hands[i] = rnd.hand
-        else:
-            new_hands, sampled_cards = __get_hands(sampled_cards)
-            hands[i] = new_hands
-
+    # the own player gets the correct hand, the other players the unknown cards, consistent with the cards
+    # they played so far (see constraint_sampler)
+    hands = sample_hands(rnd, 1)[0]
     return get_round_from_player_round(rnd, hands)
 
-def __get_hands(sampled_cards: np.array):
-    one_hand = np.zeros(shape=36, dtype=int)
-    cdef int card
-    cdef int i
-    for i in range(0, 9):
-        card = random.choice(np.flatnonzero(sampled_cards))
-        sampled_cards[card] = 0
-        one_hand[card] = 1
-
-    return one_hand, sampled_cards
-
 def _ucb_value(int total_visits, float node_win_count, int node_visits, int c) -> float:
     if node_visits == 0:
         return 2147483647
     cdef double ucb
-    ucb = (node_win_count / node_visits) + c * math.sqrt(math.log(total_visits, math.e) / node_visits)
+    ucb = (node_win_count / node_visits) + c * math.sqrt(log_visits(total_visits) / node_visits)
     return ucb
 
 def _find_best_node_ucb(node: Node, int c):
@@ -153,6 +200,11 @@ def _find_best_node_ucb(node: Node, int c):
     # print(f" best child: {best_child.card}, best score: {best_score}")
     return best_child
 
+def _find_best_node_policy(node: Node, policy):
+    wins = np.array([child.win_count for child in node.childs], dtype=np.float64)
+    visits = np.array([child.visit_count for child in node.childs], dtype=np.int64)
+    return node.childs[policy.select(wins, visits, node.visit_count)]
+
 class Node:
     def __init__(self) -> None:
         self.parent = None
@@ -168,6 +220,12 @@ class Node:
     def increment_visit(self):
         self.visit_count += 1
 
+    def get_child(self, int card):
+        for child in self.childs:
+            if child.card == card:
+                return child
+        return None
+
     def get_random_child(self) -> 'Node':
         return np.random.choice(self.childs)
 
@@ -2,8 +2,16 @@ from source.jass.base.const import *
 from source.jass.base.player_round import PlayerRound
 from source.jass.player.player import Player
 from source.jass.base.rule_schieber import RuleSchieber
-from source.jass.player.mcts.mcts_threaded import MCTSThreaded
+from source.jass.player.mcts.array_mcts import ArrayMCTS
+from source.jass.player.mcts.mcts_threaded import MCTSThreaded, mcts_search
+from source.jass.player.mcts.mcts_process_pool import MCTSProcessPool
+from source.jass.player.mcts.ponder import Ponderer
+from source.jass.player.mcts.selection import SelectionPolicy
+from source.jass.player.mcts.tree_cache import TreeCache
+from source.jass.player.search_budget import SearchBudget
 import logging
+import threading
+import uuid
 
 
 class MCTSPlayer(Player):
@@ -11,11 +19,69 @@ class MCTSPlayer(Player):
     Implementation of a player to play Jass using Monte Carlo Tree Search.
     """
 
-    def __init__(self, ucb_c=1, threads=10):
+    def __init__(self, ucb_c=1, threads=10, use_processes=True, budget: SearchBudget = None, reuse_tree=True,
+                 exact_cards=8, array_tree=False, policy: SelectionPolicy = None, transposition_bits=0,
+                 ponder=False, ponder_max_nodes=2000000):
+        """
+        Args:
+            ucb_c: exploration constant of the UCB formula
+            threads: number of independent searches that are run in parallel
+            use_processes: run the searches in a pool of worker processes instead of threads
+            budget: the budget for the search of each move, the default is 9 seconds with early stop
+            reuse_tree: continue the trees of the previous move of the same round, if they contain the cards
+            played since then
+            exact_cards: positions with at most this number of cards left are evaluated exactly by the endgame
+            solver instead of by random playouts (0 to always use random playouts)
+            array_tree: store the search trees in flat arrays (ArrayTree) instead of Node objects, which uses much
+            less memory per node
+            policy: the selection policy of the search (see selection), or None for UCB1 with the constant ucb_c
+            transposition_bits: share the statistics of transpositions (the same state reached by a different order
+            of the cards) in a table with 2 ** transposition_bits entries for each search, 0 for no table. The table
+            requires array_tree.
+            ponder: continue the trees in the background while it is not the turn of the player (see ponder and
+            Ponderer), which requires reuse_tree and use_processes=False, as the trees must be kept in the player.
+            In a player service, pondering only works if the decisions are taken in the requests
+            (PlayerServiceApp with nr_workers=0), the copies of the player in worker processes do not ponder
+            ponder_max_nodes: the maximal number of nodes of the pondered trees
+        """
+        if transposition_bits > 0 and not array_tree:
+            raise ValueError('The transposition table requires array_tree')
+        if ponder and (use_processes or not reuse_tree):
+            raise ValueError('Pondering requires reuse_tree and use_processes=False')
         self._logger = logging.getLogger(__name__)
         self._rule = RuleSchieber()
         self.ucb_c = ucb_c
         self.threads = threads
+        self.use_processes = use_processes
+        self.budget = budget if budget is not None else SearchBudget(time_seconds=9)
+        self.reuse_tree = reuse_tree
+        self.exact_cards = exact_cards
+        self.array_tree = array_tree
+        self.policy = policy
+        self.transposition_bits = transposition_bits
+        # the trees are kept in the player for threads and in the worker processes for processes
+        search = ArrayMCTS if array_tree else mcts_search
+        self._tree_cache = TreeCache(search.advance_root, max_trees=threads) if reuse_tree else None
+        self._tree_cache_id = uuid.uuid4().hex if reuse_tree else None
+        self._ponderer = None
+        if ponder:
+            self._ponderer = Ponderer(search, self._tree_cache, ucb_c, exact_cards, policy,
+                                      {'transposition_bits': transposition_bits} if array_tree else {},
+                                      max_nodes=ponder_max_nodes)
+        # held by the searches for the cards, so that pondering is not started during a search
+        self._search_lock = threading.Lock()
+        # the number of simulations of the search for the last card played (read by the metrics of the service)
+        self.last_simulations = 0
+
+    def __getstate__(self):
+        # the lock can not be pickled, for example to copy the player to the worker processes of a player service
+        state = self.__dict__.copy()
+        del state['_search_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._search_lock = threading.Lock()
 
     def select_trump(self, rnd: PlayerRound) -> int:
         """
@@ -115,12 +181,14 @@ class MCTSPlayer(Player):
             print(f"Selected trump {trump_strings_german_long[best_trump]} with score {max_score_in_trump} and {max_points_in_trump} points in the cards. hand: {rnd.hand}")
         return best_trump
 
-    def play_card(self, player_rnd: PlayerRound) -> int:
+    def play_card(self, player_rnd: PlayerRound, deadline: float = None) -> int:
         """
         Player returns a card to play based on the given round information.
 
         Args:
             player_rnd: current round
+            deadline: absolute time (as from time.time()) by which the card must be selected, in addition to the
+            budget of the player
 
         Returns:
             card to play, int encoded
@@ -129,9 +197,47 @@ class MCTSPlayer(Player):
         valid_cards = np.flatnonzero(player_rnd.get_valid_cards())
         print(f"valid cards: {valid_cards}, standard probability: {1/len(valid_cards)}")
         if len(valid_cards) == 1:
+            self.last_simulations = 0
             return valid_cards[0]
 
-        mcts_threaded = MCTSThreaded(player_rnd, self.threads, self.ucb_c)
-        best_card = mcts_threaded.run()
+        with self._search_lock:
+            if self._ponderer is not None:
+                self._ponderer.stop()
+            return self._search_card(player_rnd, deadline)
+
+    def ponder(self, rnd: PlayerRound, card: int = None) -> None:
+        """
+        Continue the trees of the round in the background, if the player was created with ponder. The trees of the
+        last search of the player are advanced to the state of the round (see Ponderer).
+
+        Args:
+            rnd: the state of the round from the view of the player
+            card: the card the player played in the state of the round, or None if the round is the current state
+        """
+        if self._ponderer is None:
+            return
+        # a request to ponder during a search is ignored, the trees are in use
+        if self._search_lock.acquire(blocking=False):
+            try:
+                self._ponderer.start(rnd, card)
+            finally:
+                self._search_lock.release()
+
+    def stop_pondering(self) -> None:
+        if self._ponderer is not None:
+            self._ponderer.stop()
+
+    def _search_card(self, player_rnd: PlayerRound, deadline: float = None) -> int:
+        budget = self.budget.start(deadline)
+        if self.use_processes:
+            mcts_parallel = MCTSProcessPool(player_rnd, self.threads, self.ucb_c, budget=budget,
+                                            tree_cache_id=self._tree_cache_id, exact_cards=self.exact_cards,
+                                            array_tree=self.array_tree, policy=self.policy,
+                                            transposition_bits=self.transposition_bits)
+        else:
+            mcts_parallel = MCTSThreaded(player_rnd, self.threads, self.ucb_c, budget, self._tree_cache,
+                                         self.exact_cards, self.array_tree, self.policy, self.transposition_bits)
+        best_card = mcts_parallel.run()
+        self.last_simulations = mcts_parallel.simulated_rounds
 
         return best_card
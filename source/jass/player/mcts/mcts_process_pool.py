@@ -0,0 +1,165 @@
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from source.jass.base.fast_round import FastRound
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.rule_factory import get_rule
+from source.jass.base.rule_schieber import RuleSchieber
+from source.jass.player.mcts.array_mcts import ArrayMCTS
+from source.jass.player.mcts.mcts_threaded import mcts_search
+from source.jass.player.mcts.tree_cache import TreeCache
+
+# the attributes of FastRound that are sent to the worker processes (the rule is created again in the worker)
+_COMPACT_SLOTS = [slot for slot in FastRound.__slots__ if slot != 'rule']
+
+# caches of the trees in the worker process, by the id of the cache given by the player
+_worker_tree_caches = {}
+
+# executor shared by all the players of the process, so the worker processes are only started once
+_executor = None
+_executor_workers = 0
+
+
+def get_executor(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Get the process pool used for the searches. The pool is created on the first call and reused afterwards; it is
+    only replaced if a larger number of workers is requested.
+
+    Args:
+        max_workers: the number of worker processes, or None for the number of cpus
+
+    Returns:
+        the executor
+    """
+    global _executor, _executor_workers
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    if _executor is None or max_workers > _executor_workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+        _executor_workers = max_workers
+    return _executor
+
+
+def compact_player_round(player_rnd: PlayerRound) -> tuple:
+    """
+    Convert the player round to a tuple of python ints and lists (the attributes of FastRound), which is much
+    smaller and faster to pickle than the numpy arrays of the player round.
+
+    Args:
+        player_rnd: the player round
+
+    Returns:
+        the compact form of the player round
+    """
+    fast_rnd = FastRound.from_player_round(player_rnd, np.zeros([4, 36], dtype=np.int32))
+    return tuple(getattr(fast_rnd, slot) for slot in _COMPACT_SLOTS)
+
+
+def expand_player_round(compact_rnd: tuple) -> PlayerRound:
+    """
+    Create the player round from the compact form created by compact_player_round.
+
+    Args:
+        compact_rnd: the compact form of the player round
+
+    Returns:
+        the player round
+    """
+    fast_rnd = FastRound()
+    for slot, value in zip(_COMPACT_SLOTS, compact_rnd):
+        setattr(fast_rnd, slot, value)
+    fast_rnd.rule = get_rule(fast_rnd.jass_type) if fast_rnd.jass_type is not None else RuleSchieber()
+    return fast_rnd.to_player_round()
+
+
+def _search(compact_rnd: tuple, run_time_seconds: float, ucb_c: float, budget, seed: int,
+            tree_cache_id: str = None, exact_cards: int = 0, array_tree: bool = False, policy=None,
+            transposition_bits: int = 0) -> (int, list):
+    # runs in the worker process: the random generators must be seeded, as forked workers inherit the same state
+    random.seed(seed)
+    np.random.seed(seed)
+    player_rnd = expand_player_round(compact_rnd)
+    search = ArrayMCTS if array_tree else mcts_search
+    array_tree_args = {'transposition_bits': transposition_bits} if array_tree else {}
+
+    # the trees stay in the worker process, a later search of the same round in the same worker continues them
+    tree_cache = None
+    root_node = None
+    if tree_cache_id is not None:
+        tree_cache = _worker_tree_caches.get(tree_cache_id)
+        if tree_cache is None:
+            tree_cache = TreeCache(search.advance_root)
+            _worker_tree_caches[tree_cache_id] = tree_cache
+        root_node = tree_cache.take(player_rnd)
+
+    root_node = search.monte_carlo_tree_search(player_rnd, run_time_seconds, ucb_c, budget, root_node, exact_cards,
+                                               policy=policy, **array_tree_args)
+    if tree_cache is not None:
+        tree_cache.put(player_rnd, root_node)
+    return root_node.visit_count, [(int(child.card), child.visit_count) for child in root_node.childs]
+
+
+class MCTSProcessPool:
+    """
+    Root parallel monte carlo tree search: several independent searches (each on its own sample of the hands) run
+    in worker processes and the visit counts of the cards at the root are added up. In contrast to MCTSThreaded,
+    the searches are not serialized on the global interpreter lock.
+    """
+    def __init__(self, player_rnd, search_count=None, ucb_c=1, run_time_seconds=9, max_workers=None, budget=None,
+                 tree_cache_id: str = None, exact_cards: int = 0, array_tree: bool = False, policy=None,
+                 transposition_bits: int = 0):
+        """
+        Args:
+            player_rnd: the player round to search
+            search_count: the number of independent searches, or None for the number of workers
+            ucb_c: exploration constant of the UCB formula
+            run_time_seconds: the time for each search, if no budget is given
+            max_workers: the number of worker processes, or None for the number of cpus
+            budget: the started budget (SearchBudget) for each search, its end time is absolute, so it is also
+            valid in the worker processes
+            tree_cache_id: id of the tree caches in the worker processes (unique for each player), or None to
+            not reuse the trees
+            exact_cards: number of remaining cards below which positions are evaluated exactly (see EndgameSolver)
+            array_tree: search on an ArrayTree (ArrayMCTS) instead of Node objects
+            policy: the selection policy (see selection), or None for UCB1 with the constant ucb_c
+            transposition_bits: size of the transposition table of each search (2 ** transposition_bits entries,
+            0 for no table), only with array_tree
+        """
+        self.simulated_rounds = 0
+        self.player_rnd = player_rnd
+        self.ucb_c = ucb_c
+        self.run_time_seconds = run_time_seconds
+        self.budget = budget
+        self.tree_cache_id = tree_cache_id
+        self.exact_cards = exact_cards
+        self.array_tree = array_tree
+        self.policy = policy
+        self.transposition_bits = transposition_bits
+        self.executor = get_executor(max_workers)
+        self.search_count = search_count if search_count is not None else _executor_workers
+        self.visit_counts = np.zeros(36, dtype=np.int64)
+        self._logger = logging.getLogger(__name__)
+
+    def run(self) -> int:
+        compact_rnd = compact_player_round(self.player_rnd)
+        seeds = np.random.randint(0, 2**31 - 1, size=self.search_count)
+        futures = [self.executor.submit(_search, compact_rnd, self.run_time_seconds, self.ucb_c, self.budget,
+                                       int(seed), self.tree_cache_id, self.exact_cards, self.array_tree, self.policy,
+                                       self.transposition_bits)
+                   for seed in seeds]
+        for future in futures:
+            visit_count, child_visits = future.result()
+            self.simulated_rounds += visit_count
+            for card, child_visit_count in child_visits:
+                self.visit_counts[card] += child_visit_count
+
+        winner = int(np.argmax(self.visit_counts))
+        self._logger.debug('winner from all processes: {} with visit_count {} after {} rounds of sampling'
+                           .format(winner, self.visit_counts[winner], self.simulated_rounds))
+        return winner
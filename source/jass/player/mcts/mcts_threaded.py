@@ -1,16 +1,35 @@
-from threading import Thread
+from threading import Thread, Lock
 from source.jass.player.mcts.mcts import MCTS
+from source.jass.player.mcts.array_mcts import ArrayMCTS
 from operator import itemgetter
-from source.jass.player.mcts import mcts_cythonized
+
+try:
+    from source.jass.player.mcts import mcts_cythonized as mcts_search
+except ImportError:
+    # the compiled module is not available for this platform, use the python implementation with the same interface
+    mcts_search = MCTS
 
 
 class MCTSThreaded:
-    def __init__(self, player_rnd, thread_count=10, ucb_c=1):
+    def __init__(self, player_rnd, thread_count=10, ucb_c=1, budget=None, tree_cache=None, exact_cards=0,
+                 array_tree=False, policy=None, transposition_bits=0):
         self.simulated_rounds = 0
+        self.budget = budget
+        # cache of the trees of the previous moves (TreeCache with advance_root of mcts_search), or None
+        self.tree_cache = tree_cache
+        # number of remaining cards below which positions are evaluated exactly (see EndgameSolver)
+        self.exact_cards = exact_cards
+        # search on an ArrayTree (ArrayMCTS) instead of Node objects
+        self.search = ArrayMCTS if array_tree else mcts_search
+        # the selection policy (see selection), or None for UCB1 with the constant ucb_c
+        self.policy = policy
+        # arguments that are only supported by the search on the ArrayTree
+        self.array_tree_args = {'transposition_bits': transposition_bits} if array_tree else {}
         self.player_rnd = player_rnd
         self.thread_count = thread_count
         self.winners = []
         self.ucb_c = ucb_c
+        self._lock = Lock()
 
     def run(self):
         threads = []
@@ -34,8 +53,17 @@ class MCTSThreaded:
         return winner[0]
 
     def _call_mcts(self):
-        root_node = mcts_cythonized.monte_carlo_tree_search(self.player_rnd, 9, self.ucb_c)
-        #root_node = MCTS.monte_carlo_tree_search(self.player_rnd)
-        self.simulated_rounds += root_node.visit_count
-        for card in root_node.childs:
-            self.winners.append(card)
+        root_node = None
+        if self.tree_cache is not None:
+            with self._lock:
+                root_node = self.tree_cache.take(self.player_rnd)
+        root_node = self.search.monte_carlo_tree_search(self.player_rnd, 9, self.ucb_c, self.budget, root_node,
+                                                        self.exact_cards, policy=self.policy,
+                                                        **self.array_tree_args)
+        # the results of the threads are merged under the lock, as += and append are not atomic
+        with self._lock:
+            if self.tree_cache is not None:
+                self.tree_cache.put(self.player_rnd, root_node)
+            self.simulated_rounds += root_node.visit_count
+            for card in root_node.childs:
+                self.winners.append(card)
@@ -16,6 +16,12 @@ class Node:
     def increment_visit(self):
         self.visit_count += 1
 
+    def get_child(self, card: int) -> 'Node' or None:
+        for child in self.childs:
+            if child.card == card:
+                return child
+        return None
+
     def get_random_child(self) -> 'Node':
         return np.random.choice(self.childs)
 
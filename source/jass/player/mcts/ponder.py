@@ -0,0 +1,174 @@
+import logging
+import threading
+
+from typing import List
+
+from source.jass.base.player_round import PlayerRound
+from source.jass.player.mcts.array_tree import ArrayTree
+from source.jass.player.mcts.tree_cache import TreeCache
+from source.jass.player.search_budget import SearchBudget
+
+
+def _keep_child(root, card: int):
+    """
+    Remove the children of the root except the child of the card, so the search only continues below the card.
+
+    Args:
+        root: the root Node or ArrayTree
+        card: the card
+
+    Returns:
+        the root, or None if the card is not a child of the root
+    """
+    if isinstance(root, ArrayTree):
+        child = root.get_child(root.root, card)
+        if child is None:
+            return None
+        root.first_child[root.root] = child
+        root.child_count[root.root] = 1
+        return root
+    child = root.get_child(card)
+    if child is None:
+        return None
+    root.childs = [child]
+    return root
+
+
+class Ponderer:
+    """
+    Continues the search trees of a round in a background thread while it is not the turn of the player, so that the
+    next search of the player starts with larger trees (speculative pondering).
+
+    The trees are taken from the tree cache of the player, advanced to the observed state of the round and searched
+    in short slices, one tree after the other, until the pondering is stopped or the trees reach the memory cap.
+    The trees are then put back into the cache, where the next search of the player takes them (see TreeCache).
+
+    The trees can only be advanced by an even number of cards (see advance_root of the searches). For a state after
+    an odd number of cards, the trees are advanced to the state before the last card and only the child of the last
+    card is kept at the root, so the search continues below the observed card. A tree is only taken from the cache if
+    it can be advanced this way, the trees of other rounds and states remain in the cache.
+
+    The number of nodes of a tree is about the visit count of its root, as every new node is visited once by the
+    simulation that creates it, so the memory cap is given as number of nodes and checked on the visit counts.
+    """
+
+    def __init__(self, search, tree_cache: TreeCache, ucb_c=1, exact_cards: int = 0, policy=None,
+                 search_args: dict = None, max_nodes: int = 2000000, slice_seconds: float = 0.05):
+        """
+        Args:
+            search: the search (MCTS or ArrayMCTS), with the functions monte_carlo_tree_search and advance_root
+            tree_cache: the tree cache of the player, with advance_root of the search
+            ucb_c: exploration constant of the search
+            exact_cards: exact_cards of the search
+            policy: the selection policy of the search
+            search_args: further arguments of monte_carlo_tree_search
+            max_nodes: the maximal number of nodes of all the trees of the round
+            slice_seconds: the time that a tree is searched before the next tree, which is also the maximal time
+            that stop() waits for the pondering to end
+        """
+        self._search = search
+        self._tree_cache = tree_cache
+        self._ucb_c = ucb_c
+        self._exact_cards = exact_cards
+        self._policy = policy
+        self._search_args = search_args if search_args is not None else {}
+        self.max_nodes = max_nodes
+        self.slice_seconds = slice_seconds
+
+        self._thread = None                             # type: threading.Thread
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        # the number of simulations of the last pondering
+        self.simulated_rounds = 0
+        self._logger = logging.getLogger(__name__)
+
+    def __getstate__(self):
+        # a copy does not ponder, the thread and the synchronization objects are created again
+        state = self.__dict__.copy()
+        for name in ['_thread', '_stop_event', '_lock']:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self, player_rnd: PlayerRound, card: int = None) -> None:
+        """
+        Start to ponder the trees of the round in the cache, at the state of the player round. A running pondering
+        is stopped first.
+
+        Args:
+            player_rnd: the state of the round from the view of the player
+            card: the card that was played in the state of the player round (by the player itself), None if the
+            state of the player round is the current state
+        """
+        with self._lock:
+            self._stop()
+            played_cards = TreeCache.played_cards(player_rnd)
+            if card is not None:
+                played_cards.append(int(card))
+            if len(played_cards) >= 36:
+                return
+            tree_cards = self._tree_cache.tree_cards(player_rnd, played_cards)
+            if tree_cards is None:
+                return
+            last_card = None
+            if (len(played_cards) - len(tree_cards)) % 2 != 0:
+                last_card = played_cards.pop()
+            roots = []
+            root = self._tree_cache.take(player_rnd, played_cards)
+            while root is not None:
+                if last_card is not None:
+                    root = _keep_child(root, last_card)
+                if root is not None:
+                    roots.append(root)
+                root = self._tree_cache.take(player_rnd, played_cards)
+            if len(roots) == 0:
+                return
+            self._stop_event.clear()
+            self.simulated_rounds = 0
+            self._thread = threading.Thread(target=self._ponder, args=(player_rnd, played_cards, roots),
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the pondering and wait until the trees are back in the cache.
+        """
+        with self._lock:
+            self._stop()
+
+    def _stop(self) -> None:
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def _ponder(self, player_rnd: PlayerRound, played_cards: List[int], roots: list) -> None:
+        max_visits = self.max_nodes // len(roots)
+        start_visits = sum(root.visit_count for root in roots)
+        try:
+            while not self._stop_event.is_set():
+                active = [i for i, root in enumerate(roots) if root.visit_count < max_visits]
+                if len(active) == 0:
+                    self._logger.debug('Pondering stopped at the memory cap of {} nodes'.format(self.max_nodes))
+                    break
+                for i in active:
+                    if self._stop_event.is_set():
+                        break
+                    budget = SearchBudget(time_seconds=self.slice_seconds, early_stop=False).start()
+                    roots[i] = self._search.monte_carlo_tree_search(player_rnd, 9, self._ucb_c, budget, roots[i],
+                                                                    self._exact_cards, policy=self._policy,
+                                                                    **self._search_args)
+        finally:
+            self.simulated_rounds = sum(root.visit_count for root in roots) - start_visits
+            for root in roots:
+                self._tree_cache.put(player_rnd, root, played_cards)
@@ -0,0 +1,118 @@
+"""
+Selection policies for the tree searches: the score of all the children of a node is calculated by one vectorized
+call from arrays of the win and visit counts of the children, and the child with the best score is selected.
+
+The logarithm of the visit count of the parent is needed for every node on the path of every iteration, so the
+logarithms of small numbers are taken from a precomputed table.
+"""
+import math
+
+import numpy as np
+
+# size of the table of precomputed logarithms
+LOG_TABLE_SIZE = 1 << 16
+
+# log(n) for n < LOG_TABLE_SIZE, with log(0) defined as 0, as numpy array and as list (for fast scalar access)
+log_table = np.log(np.maximum(np.arange(LOG_TABLE_SIZE, dtype=np.float64), 1.0))
+_log_list = log_table.tolist()
+
+
+def log_visits(n: int) -> float:
+    """
+    Get log(n) of a visit count, from the table for small n (log(0) is 0).
+    """
+    if n < LOG_TABLE_SIZE:
+        return _log_list[n]
+    return math.log(n)
+
+
+def log_visits_array(n: np.ndarray) -> np.ndarray:
+    """
+    Get log(n) of an array of visit counts, from the table for small n (log(0) is 0).
+    """
+    n = np.asarray(n)
+    return np.where(n < LOG_TABLE_SIZE, log_table[np.minimum(n, LOG_TABLE_SIZE - 1)], np.log(np.maximum(n, 1)))
+
+
+class SelectionPolicy:
+    """
+    Base class of the selection policies.
+    """
+
+    def scores(self, wins: np.ndarray, visits: np.ndarray, parent_visits, priors: np.ndarray = None) -> np.ndarray:
+        """
+        Calculate the scores of the children of a node.
+
+        Args:
+            wins: the win counts of the children
+            visits: the visit counts of the children
+            parent_visits: the visit count of the node, or an array with the number of times each child was
+            available (for information set searches)
+            priors: the prior probabilities of the children, or None for a uniform prior (only used by PUCT)
+
+        Returns:
+            the scores of the children
+        """
+        raise NotImplementedError()
+
+    def select(self, wins: np.ndarray, visits: np.ndarray, parent_visits, priors: np.ndarray = None) -> int:
+        """
+        Select the child with the largest score.
+
+        Returns:
+            the index of the selected child
+        """
+        return int(np.argmax(self.scores(wins, visits, parent_visits, priors)))
+
+
+class UCB1(SelectionPolicy):
+    """
+    UCB1: the win rate plus c * sqrt(log(N) / n), children that have not been visited are selected first.
+    """
+
+    def __init__(self, c: float = 1.0):
+        self.c = c
+
+    def scores(self, wins: np.ndarray, visits: np.ndarray, parent_visits, priors: np.ndarray = None) -> np.ndarray:
+        visits = np.asarray(visits)
+        log_parent = log_visits_array(parent_visits)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(visits == 0, np.inf, wins / visits + self.c * np.sqrt(log_parent / visits))
+
+
+class UCB1Tuned(SelectionPolicy):
+    """
+    UCB1-tuned: the exploration term uses an upper bound of the variance of the results of a child instead of the
+    constant 1/4. The results of the searches are wins and losses, so the variance is p * (1 - p) for the win rate p.
+    The exploration term is scaled by c (1 for the original formula).
+    """
+
+    def __init__(self, c: float = 1.0):
+        self.c = c
+
+    def scores(self, wins: np.ndarray, visits: np.ndarray, parent_visits, priors: np.ndarray = None) -> np.ndarray:
+        visits = np.asarray(visits)
+        log_parent = log_visits_array(parent_visits)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = wins / visits
+            variance_bound = win_rate * (1.0 - win_rate) + np.sqrt(2.0 * log_parent / visits)
+            exploration = np.sqrt(log_parent / visits * np.minimum(0.25, variance_bound))
+            return np.where(visits == 0, np.inf, win_rate + self.c * exploration)
+
+
+class PUCT(SelectionPolicy):
+    """
+    PUCT (as in AlphaZero): the win rate plus c * prior * sqrt(N) / (1 + n). Children that have not been visited
+    have a win rate of 0, so they are selected by their prior.
+    """
+
+    def __init__(self, c: float = 1.0):
+        self.c = c
+
+    def scores(self, wins: np.ndarray, visits: np.ndarray, parent_visits, priors: np.ndarray = None) -> np.ndarray:
+        visits = np.asarray(visits)
+        if priors is None:
+            priors = np.full(len(visits), 1.0 / len(visits))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = np.where(visits == 0, 0.0, wins / visits)
+        return win_rate + self.c * priors * np.sqrt(parent_visits) / (1.0 + visits)
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class TranspositionTable:
+    """
+    Bounded table of the statistics (visits and wins) of the states of a search, by the zobrist hash of the state
+    (see jass.base.zobrist). States that are reached by different orders of the cards have the same hash, so they
+    share their statistics in the table, while they are different nodes in the tree.
+
+    The table has a fixed number of slots (a power of 2), the slot of a state is given by the lower bits of its hash.
+    If the slot of a new state is used by another state, the entry with more visits is kept, so that the most
+    valuable statistics survive, except that entries from earlier searches (see new_search) are always replaced.
+
+    All operations work on arrays of hashes, as the states of a whole path of the search are updated at once.
+    """
+
+    def __init__(self, size_bits: int = 16):
+        """
+        Args:
+            size_bits: the table has 2 ** size_bits slots
+        """
+        size = 1 << size_bits
+        self._mask = np.uint64(size - 1)
+        self.keys = np.zeros(size, dtype=np.uint64)
+        self.visits = np.zeros(size, dtype=np.int32)
+        self.wins = np.zeros(size, dtype=np.int32)
+        self.generation = np.zeros(size, dtype=np.int32)
+        # empty slots have generation 0, so they count as entries of an earlier search
+        self.current_generation = 1
+
+    def new_search(self) -> None:
+        """
+        Start a new search, the entries of the previous searches are kept until they are replaced.
+        """
+        self.current_generation += 1
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        return (keys & self._mask).astype(np.intp)
+
+    def lookup(self, keys: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Get the statistics of the states.
+
+        Args:
+            keys: the hashes of the states
+
+        Returns:
+            the visits and wins of the states, 0 for states that are not in the table
+        """
+        slots = self._slots(keys)
+        found = self.keys[slots] == keys
+        return np.where(found, self.visits[slots], 0), np.where(found, self.wins[slots], 0)
+
+    def add(self, keys: np.ndarray, visits, wins) -> None:
+        """
+        Add the results of simulations to the statistics of the states.
+
+        Args:
+            keys: the hashes of the states
+            visits: the number of simulations for each state (or one number for all)
+            wins: the number of simulations won for each state (or one number for all)
+        """
+        slots = self._slots(keys)
+        visits = np.broadcast_to(visits, keys.shape)
+        wins = np.broadcast_to(wins, keys.shape)
+
+        same = self.keys[slots] == keys
+        update = slots[same]
+        self.visits[update] += visits[same]
+        self.wins[update] += wins[same]
+        self.generation[update] = self.current_generation
+
+        replace = ~same & ((self.generation[slots] != self.current_generation) | (self.visits[slots] <= visits))
+        update = slots[replace]
+        self.keys[update] = keys[replace]
+        self.visits[update] = visits[replace]
+        self.wins[update] = wins[replace]
+        self.generation[update] = self.current_generation
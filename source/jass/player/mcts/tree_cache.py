@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from typing import List
+
+from source.jass.base.bitboard import convert_one_hot_encoded_cards_to_bits
+from source.jass.base.player_round import PlayerRound
+
+
+class TreeCache:
+    """
+    Cache of search trees of the rounds a player is currently playing, so that the tree of the previous move can be
+    reused for the next move of the same round.
+
+    A round is identified by the dealer, the trump, the player and the cards the player was dealt. The cache stores
+    the root of each tree together with the cards played before the search. When a tree is taken for a later move,
+    its root is advanced through the cards played since then (using the advance function supplied by the search
+    algorithm), so only the subtree of the observed cards and its statistics are kept. Trees that can not be
+    advanced (for example because the observed cards are not in the tree or not possible in the determinization
+    of the tree) are dropped.
+
+    The number of rounds (least recently used are dropped first) and the number of trees per round are bounded.
+    """
+
+    def __init__(self, advance, max_rounds: int = 8, max_trees: int = 16):
+        """
+        Args:
+            advance: function (root, cards) -> root or None, that returns the node reached from the root by
+            playing the cards with the node as new root, or None if the tree can not be reused
+            max_rounds: maximal number of rounds in the cache
+            max_trees: maximal number of trees per round
+        """
+        self._advance = advance
+        self._max_rounds = max_rounds
+        self._max_trees = max_trees
+        # round key -> list of (played cards, root)
+        self._trees = OrderedDict()
+
+    @staticmethod
+    def played_cards(player_rnd: PlayerRound) -> List[int]:
+        """
+        Get the cards played so far, in the order they were played.
+        """
+        return player_rnd.tricks.flatten()[0:player_rnd.nr_played_cards].tolist()
+
+    @staticmethod
+    def round_key(player_rnd: PlayerRound) -> tuple:
+        """
+        Get the key that identifies the round for the player: the dealer, trump, player and the cards the player
+        was dealt (the cards of the hand and the cards the player has played).
+        """
+        dealt_cards = convert_one_hot_encoded_cards_to_bits(player_rnd.hand)
+        for nr_trick in range(player_rnd.nr_tricks + 1):
+            first_player = player_rnd.trick_first_player[nr_trick]
+            if first_player < 0:
+                continue
+            # the players play in the order of next_player, i.e. the i-th card is played by first_player - i
+            for i in range(4):
+                card = player_rnd.tricks[nr_trick, i]
+                if card >= 0 and (first_player - i) % 4 == player_rnd.player:
+                    dealt_cards |= 1 << int(card)
+        return player_rnd.dealer, player_rnd.trump, player_rnd.declared_trump, player_rnd.player, dealt_cards
+
+    def tree_cards(self, player_rnd: PlayerRound, played_cards: List[int] = None) -> List[int] or None:
+        """
+        Get the cards played before the search of the most recent tree of the round that can be advanced to the
+        state of the player round (if the number of cards since then allows it), without taking the tree.
+
+        Args:
+            player_rnd: the player round
+            played_cards: the cards played in the round, by default the cards of the player round
+
+        Returns:
+            the cards played before the search of the tree, or None if there is no tree of the round at the state
+            or before it
+        """
+        entries = self._trees.get(TreeCache.round_key(player_rnd))
+        if entries is None:
+            return None
+        if played_cards is None:
+            played_cards = TreeCache.played_cards(player_rnd)
+        for cards, _ in reversed(entries):
+            if played_cards[0:len(cards)] == cards:
+                return list(cards)
+        return None
+
+    def take(self, player_rnd: PlayerRound, played_cards: List[int] = None):
+        """
+        Take a tree of the round from the cache and advance it to the state of the player round.
+
+        Args:
+            player_rnd: the player round for the next search
+            played_cards: the cards played in the round, by default the cards of the player round
+
+        Returns:
+            the root of the advanced tree, or None if no tree can be reused
+        """
+        key = TreeCache.round_key(player_rnd)
+        entries = self._trees.get(key)
+        if entries is None:
+            return None
+        self._trees.move_to_end(key)
+        if played_cards is None:
+            played_cards = TreeCache.played_cards(player_rnd)
+        while len(entries) > 0:
+            cards, root = entries.pop()
+            if played_cards[0:len(cards)] != cards:
+                continue
+            root = self._advance(root, played_cards[len(cards):])
+            if root is not None:
+                return root
+        return None
+
+    def put(self, player_rnd: PlayerRound, root, played_cards: List[int] = None) -> None:
+        """
+        Put the tree searched for the player round into the cache.
+
+        Args:
+            player_rnd: the player round that was searched
+            root: the root of the tree
+            played_cards: the cards played before the search, by default the cards of the player round
+        """
+        key = TreeCache.round_key(player_rnd)
+        entries = self._trees.setdefault(key, [])
+        self._trees.move_to_end(key)
+        if played_cards is None:
+            played_cards = TreeCache.played_cards(player_rnd)
+        entries.append((list(played_cards), root))
+        if len(entries) > self._max_trees:
+            del entries[0]
+        while len(self._trees) > self._max_rounds:
+            self._trees.popitem(last=False)
+
+    def clear(self) -> None:
+        self._trees.clear()
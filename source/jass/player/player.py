@@ -1,3 +1,5 @@
+from typing import List
+
 from jass.base.player_round import PlayerRound
 
 
@@ -27,3 +29,37 @@ class Player:
             card to play, int encoded as defined in jass.base.const
         """
         raise NotImplementedError()
+
+    def play_cards_batch(self, rnds: List[PlayerRound]) -> List[int]:
+        """
+        Player returns the cards to play for a number of rounds at once. This is used by arenas that play many
+        rounds in parallel (see jass.arena.batched_arena) and can be overridden by players that can evaluate many
+        rounds at once more efficiently (for example in one call of a network). By default, play_card is called
+        for each round.
+
+        Args:
+            rnds: the current rounds
+
+        Returns:
+            the card to play for each round, int encoded as defined in jass.base.const
+        """
+        return [self.play_card(rnd) for rnd in rnds]
+
+    def ponder(self, rnd: PlayerRound, card: int = None) -> None:
+        """
+        Player may think about the round in the background, while it is not its turn, so that the next decision
+        starts with the results. The round is the view of the player, i.e. it contains the hand of the player, but
+        the next card might be played by another player. The default implementation does nothing.
+
+        Args:
+            rnd: the state of the round from the view of the player
+            card: the card the player played in the state of the round, if the round is the state of its last
+            decision, or None if the round is the current state
+        """
+        pass
+
+    def stop_pondering(self) -> None:
+        """
+        Stop thinking in the background, for example at the end of a round. The default implementation does nothing.
+        """
+        pass
@@ -0,0 +1,126 @@
+import copy
+import time
+
+# the rate of the simulations is only estimated after this number of simulations or this time since the start, before
+# that (for example when a search continues a tree from a previous move) the remaining simulations are unknown
+_MIN_RATE_SIMULATIONS = 20
+_MIN_RATE_SECONDS = 0.05
+
+
+class SearchBudget:
+    """
+    Budget for an anytime search (like monte carlo tree search). The search can be limited by the time used, by an
+    absolute deadline (for example given by the per move timeout of the server) and by the number of simulations.
+    The search stops as soon as one of the limits is reached.
+
+    With early_stop, the search also stops if the best card can not change anymore: if the lead of the most visited
+    child of the root over the second most visited child is larger than the number of simulations that can still be
+    carried out in the remaining budget (estimated from the rate so far), more simulations would not change the
+    selected card. The simulations are counted from the start of the budget, so a search on a tree from a previous
+    move only stops early once it has measured its own rate.
+
+    A budget object is a template that is started for each move by start(), which returns a new object, so the same
+    template can be used for several searches at the same time. A started budget is not changed by is_done, so it can
+    be shared by the threads or processes of a parallel search.
+    """
+
+    def __init__(self, time_seconds: float = None, simulations: int = None, deadline: float = None,
+                 early_stop: bool = True):
+        """
+        Args:
+            time_seconds: the time for the search, measured from start(), or None for no limit
+            simulations: the maximal number of simulations, or None for no limit
+            deadline: absolute time (as from time.time()) when the search must be finished, or None for no limit
+            early_stop: stop when the most visited child can not be overtaken in the remaining budget
+        """
+        self.time_seconds = time_seconds
+        self.simulations = simulations
+        self.deadline = deadline
+        self.early_stop = early_stop
+
+        # set by start()
+        self.start_time = None
+        self.end_time = None
+
+    def start(self, deadline: float = None) -> 'SearchBudget':
+        """
+        Start the budget for a search.
+
+        Args:
+            deadline: absolute deadline for this search, in addition to the deadline of the budget
+
+        Returns:
+            a new started budget
+        """
+        budget = copy.copy(self)
+        budget.start_time = time.time()
+        end_times = [d for d in (self.deadline, deadline) if d is not None]
+        if self.time_seconds is not None:
+            end_times.append(budget.start_time + self.time_seconds)
+        budget.end_time = min(end_times) if len(end_times) > 0 else None
+        return budget
+
+    def remaining_simulations(self, simulations: int) -> float:
+        """
+        Estimate the number of simulations that can still be carried out.
+
+        Args:
+            simulations: the number of simulations carried out so far
+
+        Returns:
+            the estimated number of remaining simulations (infinite if there is no limit, or if the rate is not
+            known yet)
+        """
+        remaining = float('inf')
+        if self.simulations is not None:
+            remaining = self.simulations - simulations
+        if self.end_time is not None:
+            now = time.time()
+            elapsed = now - self.start_time
+            if elapsed > 0.0 and (simulations >= _MIN_RATE_SIMULATIONS or elapsed >= _MIN_RATE_SECONDS):
+                remaining = min(remaining, simulations / elapsed * (self.end_time - now))
+        return remaining
+
+    def is_done(self, simulations: int, best_visits: int = 0, second_visits: int = 0) -> bool:
+        """
+        Check if the search must stop.
+
+        Preconditions:
+            start() has been called to create this budget
+
+        Args:
+            simulations: the number of simulations carried out so far
+            best_visits: the visit count of the most visited child of the root
+            second_visits: the visit count of the second most visited child of the root
+
+        Returns:
+            True if the search should stop
+        """
+        if self.simulations is not None and simulations >= self.simulations:
+            return True
+        if self.end_time is not None and time.time() >= self.end_time:
+            return True
+        if self.early_stop and best_visits > 0:
+            return best_visits - second_visits > self.remaining_simulations(simulations)
+        return False
+
+    @staticmethod
+    def best_two(visit_counts) -> (int, int):
+        """
+        Get the largest and the second largest of the visit counts (0 if there are not enough).
+
+        Args:
+            visit_counts: iterable of the visit counts of the children of the root
+
+        Returns:
+            tuple of the largest and second largest visit count
+        """
+        best = 0
+        second = 0
+        for visits in visit_counts:
+            if visits > best:
+                second = best
+                best = visits
+            elif visits > second:
+                second = visits
+        return best, second
@@ -0,0 +1,102 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Cache of the decisions of the players of a player service, so that a request that is sent again (for example by the
+server after a network error) is answered with the previous decision instead of a new search.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from source.jass.base.player_round import PlayerRound
+
+
+class DecisionCache:
+    """
+    Bounded cache of decisions (least recently used are dropped first), by player, method and state of the round.
+
+    The cache stores the future of each decision, which is added before the decision is taken, so a request that is
+    sent again while the first request is still running waits for the same decision. Decisions that fail are removed,
+    so they are taken again by the next request.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: the maximal number of decisions in the cache
+        """
+        self._max_entries = max_entries
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    @staticmethod
+    def round_key(rnd: PlayerRound) -> tuple:
+        """
+        Get the canonical key of the state of a player round, which contains everything a player can observe: the
+        dealer, the trump declaration, the played cards in order with the first players of the tricks, the hand, the
+        current player and the jass type. The other information of a player round follows from these.
+        """
+        return (rnd.jass_type, rnd.dealer, rnd.player, rnd.trump, rnd.forehand, rnd.nr_played_cards,
+                rnd.tricks.tobytes(), rnd.trick_first_player.tobytes(), rnd.hand.tobytes())
+
+    def get_or_reserve(self, player_name: str, method: str, rnd: PlayerRound) -> (Future, bool):
+        """
+        Get the decision for the request, or reserve a new entry for it.
+
+        Args:
+            player_name: the name of the player
+            method: the method of the player, 'select_trump' or 'play_card'
+            rnd: the round of the request
+
+        Returns:
+            the future of the decision, and True if the entry is new, in which case the caller must take the
+            decision and complete the future with set_result or fail
+        """
+        key = (player_name, method, DecisionCache.round_key(rnd))
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                self._futures.move_to_end(key)
+                self._hits += 1
+                return future, False
+            self._misses += 1
+            future = Future()
+            self._futures[key] = future
+            while len(self._futures) > self._max_entries:
+                self._futures.popitem(last=False)
+            return future, True
+
+    def fail(self, future: Future, exception: BaseException) -> None:
+        """
+        Remove a reserved entry, whose decision failed, and pass the exception to the requests waiting for it.
+
+        Args:
+            future: the future returned by get_or_reserve
+            exception: the exception of the decision
+        """
+        with self._lock:
+            # failures are rare, so the entry is searched instead of keeping the keys of the futures
+            for key, entry in self._futures.items():
+                if entry is future:
+                    del self._futures[key]
+                    break
+        future.set_exception(exception)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._futures.clear()
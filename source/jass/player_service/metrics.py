@@ -0,0 +1,156 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+In-process metrics of the player service: histograms of the times and of the number of simulations of the
+decisions of each player, and counts of the errors and of the requests that were answered without a decision.
+
+A player reports the number of simulations of its last decision in the attribute last_simulations (if it has it),
+which is read after each play_card.
+"""
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+# upper bounds of the buckets of the histograms of times in seconds and of numbers of simulations
+TIME_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 7.5, 10.0, 15.0, 30.0]
+SIMULATION_BUCKETS = [10, 100, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000]
+
+# kinds of errors
+ERROR_INVALID_REQUEST = 'invalid_request'
+ERROR_BUSY = 'busy'
+ERROR_DECISION = 'decision'
+ERROR_TIMEOUT = 'timeout'
+
+# kinds of requests answered without a decision of the player, and requests that were not in the decision cache
+EVENT_CACHE_HIT = 'cache_hit'
+EVENT_CACHE_MISS = 'cache_miss'
+EVENT_SINGLE_VALID_CARD = 'single_valid_card'
+
+
+class Histogram:
+    """
+    Histogram with fixed buckets, which counts the observed values that are at most the upper bound of each bucket
+    (and larger than the bound of the previous bucket), and the values larger than the last bound.
+    """
+
+    def __init__(self, bounds: List[float]):
+        """
+        Args:
+            bounds: the upper bounds of the buckets, in increasing order
+        """
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._count if self._count > 0 else 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value.
+        """
+        bucket = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._count += 1
+            self._sum += value
+
+    def to_dict(self) -> dict:
+        """
+        Get the histogram as dict, with the bounds and counts of the buckets (the last bound is None for the values
+        above the largest bound), the number and the sum of the values.
+        """
+        with self._lock:
+            return dict(buckets=[[bound, count] for bound, count in zip(self._bounds + [None], self._counts)],
+                        count=self._count,
+                        sum=self._sum)
+
+
+class PlayerMetrics:
+    """
+    Metrics of one player.
+    """
+
+    def __init__(self):
+        # time to parse the request
+        self.parse_seconds = Histogram(TIME_BUCKETS)
+        # time waiting for a free slot of the player and for a worker process
+        self.queue_wait_seconds = Histogram(TIME_BUCKETS)
+        # time of the decision of the player (select_trump or play_card)
+        self.decision_seconds = Histogram(TIME_BUCKETS)
+        # simulations of the search for each card played, for players that report them
+        self.simulations = Histogram(SIMULATION_BUCKETS)
+        self._errors = defaultdict(int)
+        self._events = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add_error(self, kind: str) -> None:
+        """
+        Count an error of the kind (ERROR_INVALID_REQUEST, ERROR_BUSY, ERROR_DECISION or ERROR_TIMEOUT).
+        """
+        with self._lock:
+            self._errors[kind] += 1
+
+    def add_event(self, kind: str) -> None:
+        """
+        Count an event of the kind (EVENT_CACHE_HIT, EVENT_CACHE_MISS or EVENT_SINGLE_VALID_CARD).
+        """
+        with self._lock:
+            self._events[kind] += 1
+
+    @property
+    def errors(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._errors)
+
+    @property
+    def events(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._events)
+
+    def to_dict(self) -> dict:
+        return dict(parse_seconds=self.parse_seconds.to_dict(),
+                    queue_wait_seconds=self.queue_wait_seconds.to_dict(),
+                    decision_seconds=self.decision_seconds.to_dict(),
+                    simulations=self.simulations.to_dict(),
+                    errors=self.errors,
+                    events=self.events)
+
+
+class ServiceMetrics:
+    """
+    Metrics of all the players of a service.
+    """
+
+    def __init__(self):
+        self._players = {}                              # type: Dict[str, PlayerMetrics]
+        self._lock = threading.Lock()
+
+    def player(self, player_name: str) -> PlayerMetrics:
+        """
+        Get the metrics of a player, which are created on the first call.
+        """
+        metrics = self._players.get(player_name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._players.setdefault(player_name, PlayerMetrics())
+        return metrics
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            players = dict(self._players)
+        return dict(players={name: metrics.to_dict() for name, metrics in players.items()})
@@ -6,6 +6,7 @@
 Example how to use flask to create a service for one or more players
 """
 import logging
+import os
 
 from source.jass.player_service.player_service_app import PlayerServiceApp
 from source.jass.player.random_player_schieber import RandomPlayerSchieber
@@ -24,18 +25,31 @@ def create_app():
     """
     logging.basicConfig(level=logging.DEBUG)
 
-    # create and configure the app
-    app = PlayerServiceApp('my_player_service')
+    # create and configure the app, the decisions are taken in one worker process per core, so several games can
+    # request moves at the same time
+    app = PlayerServiceApp('my_player_service', nr_workers=os.cpu_count())
 
     # you could use a configuration file to load additional variables
     # app.config.from_pyfile('my_player_service.cfg', silent=False)
 
-    # add some players
-    app.add_player('DeAentlibuecherUCB14', MCTSPlayer(ucb_c=1.4))
-    app.add_player('DeAentlibuecher', MCTSPlayer())
-    app.add_player('DeAentlibuecherUCB75', MCTSPlayer(ucb_c=0.75))
-    app.add_player('DeAentlibuecher2T', MCTSPlayer(threads=2))
+    # add some players, the searches run in the thread of the worker process (not in a pool of their own), each
+    # player can take as many decisions at the same time as there are workers, with some more waiting
+    nr_concurrent = os.cpu_count()
+    app.add_player('DeAentlibuecherUCB14', MCTSPlayer(ucb_c=1.4, use_processes=False),
+                   max_concurrent=nr_concurrent, queue_depth=2 * nr_concurrent)
+    app.add_player('DeAentlibuecher', MCTSPlayer(use_processes=False),
+                   max_concurrent=nr_concurrent, queue_depth=2 * nr_concurrent)
+    app.add_player('DeAentlibuecherUCB75', MCTSPlayer(ucb_c=0.75, use_processes=False),
+                   max_concurrent=nr_concurrent, queue_depth=2 * nr_concurrent)
+    app.add_player('DeAentlibuecher2T', MCTSPlayer(threads=2, use_processes=False),
+                   max_concurrent=nr_concurrent, queue_depth=2 * nr_concurrent)
     # app.add_player('stdin', StdinPlayerSchieber())
+
+    # pondering (thinking during the moves of the other players) and the reuse of the trees of a round only work if
+    # the decisions are taken in the requests, i.e. with a separate app created with nr_workers=0:
+    # app = PlayerServiceApp('my_player_service')
+    # app.add_player('DeAentlibuecherPonder', MCTSPlayer(use_processes=False, ponder=True), max_concurrent=1)
     app.add_player('random', RandomPlayerSchieber())
 
+    app.start_workers()
     return app
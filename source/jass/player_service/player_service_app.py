@@ -3,12 +3,46 @@
 # Created by Thomas Koller on 12.10.18
 #
 
+import concurrent.futures
+import time
+
 from flask import Flask
+from source.jass.base.player_round import PlayerRound
 from source.jass.player.player import Player
 from source.jass.player_service.player_service_route import players
+from source.jass.player_service.decision_cache import DecisionCache
+from source.jass.player_service.metrics import ServiceMetrics, PlayerMetrics, ERROR_BUSY, ERROR_DECISION, \
+    ERROR_TIMEOUT, EVENT_CACHE_HIT, EVENT_CACHE_MISS
+from source.jass.player_service.worker_pool import Decision, DecisionLimiter, PlayerBusyError, PlayerWorkerPool, \
+    take_decision
 
 
 class PlayerServiceApp(Flask):
+    """
+    Flask app for the players of a player service.
+
+    By default, the decisions of the players are taken in the thread of the request. With nr_workers > 0, the
+    decisions are taken in a pool of worker processes (see PlayerWorkerPool) and the request only waits for the
+    result, so long searches do not block the server. The pool is started with the first decision (or by
+    start_workers), all players must be added before.
+
+    For each player, the number of decisions that run at the same time and the number of decisions that wait for
+    them can be limited, further requests are rejected (see DecisionLimiter). A decision of a worker that takes
+    longer than the decision timeout fails the request, but it counts as running until the worker finished it.
+
+    The decisions are kept in a cache (see DecisionCache), so a request that is sent again gets the same decision
+    without a new search.
+
+    The times of the requests and decisions and the errors of each player are collected in metrics (see
+    ServiceMetrics).
+
+    Pondering (see Player.ponder) only works with nr_workers=0: the players are then asked to ponder after they
+    played a card and when they are informed about the cards of the other players (game_info), so they can think
+    while the other players decide. With worker processes, every worker has its own copy of the player and the next
+    decision of a round might be taken by another copy, so the players are never asked to ponder, and the trees a
+    player keeps between the moves of a round (for example with MCTSPlayer(reuse_tree=True)) are only reused if the
+    next decision happens to be taken by the same worker.
+    """
     def __init__(self, import_name,
                  static_url_path=None,
                  static_folder='static',
@@ -17,7 +51,18 @@ class PlayerServiceApp(Flask):
                  template_folder='templates',
                  instance_path=None,
                  instance_relative_config=False,
-                 root_path=None):
+                 root_path=None,
+                 nr_workers: int = 0,
+                 decision_timeout: float = None,
+                 decision_cache_size: int = 1024):
+        """
+        Args:
+            import_name: the name of the application package (see Flask), the other arguments up to root_path are
+            passed to Flask as well
+            nr_workers: the number of worker processes for the decisions, 0 to take the decisions in the request
+            decision_timeout: the maximal time in seconds to wait for a decision of a worker, None for no limit
+            decision_cache_size: the maximal number of decisions in the cache, 0 for no cache
+        """
         super(PlayerServiceApp, self).__init__(import_name,
                                                static_url_path=static_url_path,
                                                static_folder=static_folder,
@@ -29,10 +74,135 @@ class PlayerServiceApp(Flask):
                                                instance_relative_config=instance_relative_config,
                                                root_path=root_path)
         self.players = {}
+        self.limiters = {}
+        self.metrics = ServiceMetrics()
+        self.decision_timeout = decision_timeout
+        self.decision_cache = DecisionCache(decision_cache_size) if decision_cache_size > 0 else None
+        self.worker_pool = None
+        if nr_workers > 0:
+            self.worker_pool = PlayerWorkerPool(self.players, max_workers=nr_workers)
         self.register_blueprint(players)
 
-    def add_player(self, player_name: str, player: Player):
+    def add_player(self, player_name: str, player: Player, max_concurrent: int = None, queue_depth: int = None):
+        """
+        Add a player.
+
+        Args:
+            player_name: the name of the player in the requests
+            player: the player
+            max_concurrent: the maximal number of decisions of the player that run at the same time, None for no
+            limit
+            queue_depth: the maximal number of decisions that wait for a running decision, None for no limit
+        """
+        if self.worker_pool is not None and self.worker_pool.is_started:
+            raise RuntimeError('Players must be added before the worker processes are started')
         self.players[player_name] = player
+        self.limiters[player_name] = DecisionLimiter(max_concurrent, queue_depth)
+
+    def start_workers(self) -> None:
+        """
+        Start the worker processes (if the app uses them), so they are ready for the first request.
+        """
+        if self.worker_pool is not None:
+            self.worker_pool.start()
+
+    def select_trump(self, player_name: str, rnd: PlayerRound) -> int:
+        """
+        Get the trump selected by a player.
+
+        Raises:
+            PlayerBusyError: if the player has too many decisions running and waiting
+        """
+        return self._decide(player_name, 'select_trump', rnd)
+
+    def play_card(self, player_name: str, rnd: PlayerRound) -> int:
+        """
+        Get the card played by a player.
+
+        Raises:
+            PlayerBusyError: if the player has too many decisions running and waiting
+        """
+        return self._decide(player_name, 'play_card', rnd)
+
+    def ponder(self, player_name: str, rnd: PlayerRound, card: int = None) -> None:
+        """
+        Let a player ponder about the state of a round, if the decisions are taken in the requests.
+
+        Args:
+            player_name: the name of the player
+            rnd: the state of the round from the view of the player
+            card: the card the player played in the state of the round, or None if the round is the current state
+        """
+        if self.worker_pool is None:
+            self.players[player_name].ponder(rnd, card)
+
+    def stop_pondering(self, player_name: str) -> None:
+        """
+        Stop the pondering of a player, for example at the end of the round.
+        """
+        if self.worker_pool is None:
+            self.players[player_name].stop_pondering()
+
+    def _decide(self, player_name: str, method: str, rnd: PlayerRound) -> int:
+        metrics = self.metrics.player(player_name)
+        if self.decision_cache is None:
+            return self._take_decision(player_name, method, rnd, metrics)
+
+        future, is_new = self.decision_cache.get_or_reserve(player_name, method, rnd)
+        if not is_new:
+            metrics.add_event(EVENT_CACHE_HIT)
+            return future.result(timeout=self.decision_timeout)
+        metrics.add_event(EVENT_CACHE_MISS)
+        try:
+            result = self._take_decision(player_name, method, rnd, metrics)
+        except Exception as e:
+            self.decision_cache.fail(future, e)
+            raise
+        future.set_result(result)
+        return result
+
+    def _take_decision(self, player_name: str, method: str, rnd: PlayerRound, metrics: PlayerMetrics) -> int:
+        request_time = time.time()
+        try:
+            if self.worker_pool is None:
+                with self.limiters[player_name]:
+                    decision = take_decision(self.players[player_name], method, rnd)
+            else:
+                decision = self._take_worker_decision(player_name, method, rnd)
+        except PlayerBusyError:
+            metrics.add_error(ERROR_BUSY)
+            raise
+        except concurrent.futures.TimeoutError:
+            metrics.add_error(ERROR_TIMEOUT)
+            raise
+        except Exception:
+            metrics.add_error(ERROR_DECISION)
+            raise
+        metrics.queue_wait_seconds.observe(max(0.0, decision.start_time - request_time))
+        metrics.decision_seconds.observe(decision.seconds)
+        if decision.simulations is not None:
+            metrics.simulations.observe(decision.simulations)
+        if method == 'play_card':
+            # the other players decide next, which is the time to ponder about the round
+            self.ponder(player_name, rnd, decision.result)
+        return decision.result
+
+    def _take_worker_decision(self, player_name: str, method: str, rnd: PlayerRound) -> Decision:
+        limiter = self.limiters[player_name]
+        limiter.acquire()
+        try:
+            future = self.worker_pool.submit(player_name, method, rnd)
+        except BaseException:
+            limiter.release()
+            raise
+        # the decision is running until the worker finished it, even if the request does not wait for it anymore
+        future.add_done_callback(lambda _: limiter.release())
+        try:
+            return future.result(timeout=self.decision_timeout)
+        except concurrent.futures.TimeoutError:
+            # a decision that has not started yet is not taken anymore
+            future.cancel()
+            raise
 
     def get_player_for_name(self, player_name: str):
         return self.players[player_name] if player_name in self.players else None
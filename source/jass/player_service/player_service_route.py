@@ -10,23 +10,41 @@ This file handles requests like select_trump and play_card and delegates them to
 """
 
 import logging
+import time
 from http import HTTPStatus
 
+import numpy as np
 from flask import request, jsonify, Blueprint, current_app
 
 from source.jass.base.const import card_strings
 from source.jass.ion.round_serializer import RoundSerializer
-from source.jass.player_service.request_parser import PlayerRoundParser
+from source.jass.player_service.metrics import ERROR_INVALID_REQUEST, EVENT_SINGLE_VALID_CARD
+from source.jass.player_service.request_parser import PlayerRoundParser, loads_request, player_view_from_request
+from source.jass.player_service.worker_pool import PlayerBusyError
 
 
 JASS_PATH_PREFIX = '/jass-service/players/'
 SELECT_TRUMP_PATH_PREFIX = '/select_trump'
 PLAY_CARD_PATH_PREFIX = '/play_card'
 SEND_INFO_PREFIX = '/game_info'
+METRICS_PATH = '/metrics'
 
 players = Blueprint(JASS_PATH_PREFIX, __name__)
 
 
+def _parse_request(player_name: str) -> PlayerRoundParser:
+    # decode and parse the request and add the time and errors of parsing to the metrics of the player (if it exists)
+    start = time.perf_counter()
+    parser = PlayerRoundParser(loads_request(request.get_data()))
+    seconds = time.perf_counter() - start
+    if current_app.get_player_for_name(player_name) is not None:
+        metrics = current_app.metrics.player(player_name)
+        metrics.parse_seconds.observe(seconds)
+        if not parser.is_valid_request():
+            metrics.add_error(ERROR_INVALID_REQUEST)
+    return parser
+
+
 @players.route('/<string:player_name>' + PLAY_CARD_PATH_PREFIX, methods=['POST'])
 def play_card(player_name: str):
     """
@@ -39,18 +57,26 @@ def play_card(player_name: str):
     if not request.is_json:
         return jsonify(error='json data expected'), HTTPStatus.UNSUPPORTED_MEDIA_TYPE
 
-    request_dict = request.get_json()
-    parser = PlayerRoundParser(request_dict)
+    parser = _parse_request(player_name)
     if parser.is_valid_request():
         player = current_app.get_player_for_name(player_name)
         if player is None:
             return jsonify(error='player not found'), HTTPStatus.BAD_REQUEST
         try:
             rnd = parser.get_parsed_round()
-            card = player.play_card(rnd)
+            valid_cards = np.flatnonzero(rnd.get_valid_cards())
+            if len(valid_cards) == 1:
+                # there is nothing to decide, the player does not need to be asked
+                current_app.metrics.player(player_name).add_event(EVENT_SINGLE_VALID_CARD)
+                card = valid_cards[0]
+            else:
+                card = current_app.play_card(player_name, rnd)
             # card is returned as string
             data = dict(card=card_strings[card])
             return jsonify(data), HTTPStatus.OK
+        except PlayerBusyError as e:
+            logging.warning('Player {} busy: {}'.format(player_name, e))
+            return jsonify(error='player busy'), HTTPStatus.SERVICE_UNAVAILABLE
         except Exception as e:
             logging.error(e)
             return jsonify(error=str(e)), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -72,13 +98,21 @@ def select_trump(player_name: str):
     if not request.is_json:
         return jsonify(error='json data expected'), HTTPStatus.UNSUPPORTED_MEDIA_TYPE
 
-    request_dict = request.get_json()
-    parser = PlayerRoundParser(request_dict)
+    parser = _parse_request(player_name)
     if parser.is_valid_request():
         player = current_app.get_player_for_name(player_name)
-        trump = player.select_trump(parser.get_parsed_round())
-        data = dict(trump=trump)
-        return jsonify(data), HTTPStatus.OK
+        if player is None:
+            return jsonify(error='player not found'), HTTPStatus.BAD_REQUEST
+        try:
+            trump = current_app.select_trump(player_name, parser.get_parsed_round())
+            data = dict(trump=int(trump))
+            return jsonify(data), HTTPStatus.OK
+        except PlayerBusyError as e:
+            logging.warning('Player {} busy: {}'.format(player_name, e))
+            return jsonify(error='player busy'), HTTPStatus.SERVICE_UNAVAILABLE
+        except Exception as e:
+            logging.error(e)
+            return jsonify(error=str(e)), HTTPStatus.INTERNAL_SERVER_ERROR
     else:
         logging.error(parser.get_error_message())
         return jsonify(parser.get_error_message()), HTTPStatus.BAD_REQUEST
@@ -101,16 +135,39 @@ def game_info(player_name: str):
     if not request.is_json:
         return jsonify(error='json data expected'), HTTPStatus.UNSUPPORTED_MEDIA_TYPE
 
-    request_dict = request.get_json()
-    # currently this is a round that is sent only at the end of the game, to test this
-    # we parse it directly
+    request_dict = loads_request(request.get_data())
+    if current_app.get_player_for_name(player_name) is None:
+        return jsonify(error='player not found'), HTTPStatus.BAD_REQUEST
+
+    # the state of a round from the view of the player, while other players play cards, which the player can use to
+    # ponder about the round
+    rnd = player_view_from_request(request_dict) if isinstance(request_dict, dict) else None
+    if rnd is not None:
+        current_app.ponder(player_name, rnd)
+        return jsonify(''), HTTPStatus.OK
+
+    # the complete round at the end of the game, after which there is nothing to ponder about
     try:
-        rnd = RoundSerializer.round_from_dict(request_dict)
+        RoundSerializer.round_from_dict(request_dict)
+        current_app.stop_pondering(player_name)
         return jsonify(''), HTTPStatus.OK
     except:
         logging.warning('Could not parse game_info request')
         return jsonify(''), HTTPStatus.BAD_REQUEST
 
+@players.route(METRICS_PATH, methods=['GET'])
+def metrics():
+    """
+    Provides the metrics of all players: histograms of the times to parse the requests, to wait for the decisions
+    and to take them, of the simulations for each card played, and the counts of errors and of the requests
+    answered from the decision cache or without a decision.
+
+    Returns:
+        the metrics as json
+    """
+    return jsonify(current_app.metrics.to_dict()), HTTPStatus.OK
+
+
 @players.route('/<string:player_name>', methods=['GET'])
 def smoke_test(player_name: str):
     """
@@ -4,17 +4,152 @@
 #
 """
 Code for the validation and parsing of requests to a Jass player service.
+
+The parsing is paid on every request, so PlayerRoundParser maps the request directly into a PlayerRound in a single
+pass, instead of going through PlayerRoundSerializer. The json data of the requests is decoded with orjson if it is
+installed.
 """
 
+import json
 import logging
+from itertools import chain
 
 from source.jass.base.const import *
 from source.jass.base.player_round import PlayerRound
+from source.jass.base.rule_factory import get_rule
 from source.jass.ion.player_round_serializer import PlayerRoundSerializer
 
+try:
+    import orjson
+except ImportError:
+    # the faster decoder is optional, use the decoder of the standard library
+    orjson = None
+
 ERROR_MSG_PREFIX = 'Request Parse Error: '
 VALID_JASS_TYPES = ['SCHIEBER_1000', 'SCHIEBER_2500']
 
+# the rules do not have a state, so the rounds of all requests of a jass type use the same rule
+_rules = {jass_type: get_rule(jass_type) for jass_type in VALID_JASS_TYPES}
+
+# lookup of the card ids from the card strings
+_card_id = card_ids.__getitem__
+
+# empty player round, that is copied for each request, as copying the arrays is faster than creating them
+_empty_round = PlayerRound()
+
+
+def loads_request(data: bytes or str):
+    """
+    Decode the json data of a request, with orjson if it is available.
+
+    Args:
+        data: the json data
+
+    Returns:
+        the decoded data, or None if the data is not valid json
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+def _player_round_from_request(request_dict: dict) -> PlayerRound:
+    """
+    Create the player round of a request in one pass over the data, the cards of all tricks and of the hand are
+    converted to ids at once.
+
+    Raises:
+        KeyError, TypeError, ValueError or IndexError if the data of the request is not complete
+    """
+    dealer = request_dict['dealer']
+    trump = request_dict.get('trump')
+    if request_dict.get('tss') == 1:
+        forehand = False
+        declared_trump = partner_player[next_player[dealer]]
+    elif trump is not None:
+        forehand = True
+        declared_trump = next_player[dealer]
+    else:
+        forehand = None
+        declared_trump = None
+    jass_type = request_dict['jassTyp']
+    rnd = PlayerRound.__new__(PlayerRound)
+    rnd.__dict__.update({name: value.copy() if isinstance(value, np.ndarray) else value
+                         for name, value in _empty_round.__dict__.items()})
+    rnd.dealer = dealer
+    rnd.player = request_dict['currentPlayer']
+    rnd.trump = trump
+    rnd.forehand = forehand
+    rnd.declared_trump = declared_trump
+    rnd.jass_type = jass_type
+    rnd.rule = _rules[jass_type]
+
+    tricks = request_dict['tricks']
+    nr_played_cards = 0
+    points = [0, 0]
+    for i, trick in enumerate(tricks):
+        nr_cards = len(trick['cards'])
+        nr_played_cards += nr_cards
+        winner = trick.get('win', -1)
+        trick_points = trick.get('points', 0)
+        rnd.trick_winner[i] = winner
+        rnd.trick_points[i] = trick_points
+        if 'first' in trick:
+            rnd.trick_first_player[i] = trick['first']
+        else:
+            logging.getLogger(__name__).error('No first player set in trick {}'.format(i))
+        if nr_cards == 4:
+            # a trick with unknown winner is counted for team 1 as in calculate_points_from_tricks
+            points[winner % 2] += trick_points
+        elif nr_cards > 4 or i < len(tricks) - 1:
+            raise ValueError('Trick {} with {} cards'.format(i, nr_cards))
+    rnd.points_team_0, rnd.points_team_1 = points
+
+    # all tricks except the last are complete, so the played cards are the first entries of the flat tricks
+    rnd.tricks.reshape(-1)[:nr_played_cards] = np.fromiter(
+        map(_card_id, chain.from_iterable(trick['cards'] for trick in tricks)), dtype=np.int32, count=nr_played_cards)
+    rnd.nr_played_cards = nr_played_cards
+    rnd.nr_tricks, rnd.nr_cards_in_trick = divmod(nr_played_cards, 4)
+    if rnd.nr_tricks < 9:
+        rnd.current_trick = rnd.tricks[rnd.nr_tricks]
+    else:
+        rnd.current_trick = None
+
+    for player_data in request_dict['player']:
+        hand = player_data.get('hand')
+        if hand:
+            rnd.hand[np.fromiter(map(_card_id, hand), dtype=np.int32, count=len(hand))] = 1
+    return rnd
+
+
+def player_view_from_request(request_dict: dict) -> PlayerRound or None:
+    """
+    Create the view of a player of a round from a request in the format of a player round, where the hand is given
+    for the player, but the next card might be played by another player (see
+    PlayerRoundSerializer.player_round_to_dict_for_other_player), as sent with game_info.
+
+    Args:
+        request_dict: the request
+
+    Returns:
+        the player round with the hand and the number of the player that has a hand in the request as player, or None
+        if the request is not in the format of a player round or does not contain a hand
+    """
+    try:
+        if not isinstance(request_dict.get('player'), list) or request_dict['jassTyp'] not in VALID_JASS_TYPES:
+            return None
+        seats = [i for i, player_data in enumerate(request_dict['player']) if player_data.get('hand')]
+        if len(seats) != 1:
+            return None
+        rnd = _player_round_from_request(request_dict)
+    except (AttributeError, KeyError, TypeError, ValueError, IndexError):
+        return None
+    rnd.player = seats[0]
+    return rnd
+
 
 class BasicRequestParser:
     """
@@ -95,11 +230,20 @@ class PlayerRoundParser(BasicRequestParser):
             self._logger.error(self._error_msg)
             return
 
-        # use (new) Serializer class to handle actual parsing
-        player_round = PlayerRoundSerializer.player_round_from_dict(self._request_dict)
+        version = self._request_dict.get('version', PlayerRoundSerializer.FORMAT_VERSION)
+        if version != PlayerRoundSerializer.FORMAT_VERSION:
+            self._error_msg = ERROR_MSG_PREFIX + 'Unexpected \"version\": \"{}\"'.format(version)
+            self._logger.error(self._error_msg)
+            return
 
-        # during debugging
-        player_round.assert_invariants()
+        try:
+            player_round = _player_round_from_request(self._request_dict)
+            player_round.assert_invariants()
+        except (KeyError, TypeError, ValueError, IndexError, AssertionError) as e:
+            self._error_msg = ERROR_MSG_PREFIX + 'inconsistent round ({}: {}) in entry: {}'.format(
+                type(e).__name__, e, self._request_dict)
+            self._logger.error(self._error_msg)
+            return
         self._rnd = player_round
         self._valid_request = True
 
@@ -0,0 +1,219 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Pool of worker processes that take the decisions (select_trump and play_card) of the players of a player service,
+so that long searches do not run in the threads that serve the http requests.
+"""
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+from source.jass.base.player_round import PlayerRound
+from source.jass.player.player import Player
+
+# result of a decision, with the time (as from time.time()) when the decision started, the time it took and the number
+# of simulations of the player for play_card (from the attribute last_simulations of the player, None if it has none)
+Decision = namedtuple('Decision', ['result', 'start_time', 'seconds', 'simulations'])
+
+# the players of the worker process, created by _init_worker
+_worker_players = None                                  # type: Dict[str, Player]
+
+
+def _init_worker(players: Dict[str, Player]) -> None:
+    global _worker_players
+    _worker_players = players
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def take_decision(player: Player, method: str, rnd: PlayerRound) -> Decision:
+    """
+    Take a decision of a player and measure it.
+
+    Args:
+        player: the player
+        method: the method of the player, 'select_trump' or 'play_card'
+        rnd: the round for the decision
+
+    Returns:
+        the decision
+    """
+    start_time = time.time()
+    start = time.perf_counter()
+    result = getattr(player, method)(rnd)
+    seconds = time.perf_counter() - start
+    simulations = getattr(player, 'last_simulations', None) if method == 'play_card' else None
+    return Decision(int(result), start_time, seconds, simulations)
+
+
+def _decide(player_name: str, method: str, rnd: PlayerRound) -> Decision:
+    # the current trick is a view into the tricks, which is lost when the round is pickled
+    if rnd.nr_tricks < 9:
+        rnd.current_trick = rnd.tricks[rnd.nr_tricks]
+    return take_decision(_worker_players[player_name], method, rnd)
+
+
+class PlayerBusyError(Exception):
+    """
+    Raised if a player can not accept another decision, because the maximal number of decisions is running and
+    the queue of the player is full.
+    """
+
+
+class DecisionLimiter:
+    """
+    Limits the number of decisions of a player that are running at the same time. Further decisions wait until
+    a running decision is finished, up to a maximal number of waiting decisions (the queue depth), after which
+    new decisions are rejected with a PlayerBusyError.
+    """
+
+    def __init__(self, max_concurrent: int = None, queue_depth: int = None):
+        """
+        Args:
+            max_concurrent: the maximal number of running decisions, None for no limit
+            queue_depth: the maximal number of waiting decisions, None for no limit
+        """
+        self._max_concurrent = max_concurrent
+        self._queue_depth = queue_depth
+        self._nr_running = 0
+        self._nr_waiting = 0
+        self._condition = threading.Condition()
+
+    @property
+    def nr_running(self) -> int:
+        return self._nr_running
+
+    @property
+    def nr_waiting(self) -> int:
+        return self._nr_waiting
+
+    def acquire(self) -> None:
+        """
+        Wait until the decision can run.
+
+        Raises:
+            PlayerBusyError: if the decision can not run and the queue is full
+        """
+        with self._condition:
+            if self._max_concurrent is not None and self._nr_running >= self._max_concurrent:
+                if self._queue_depth is not None and self._nr_waiting >= self._queue_depth:
+                    raise PlayerBusyError('{} decisions running and {} waiting'.format(self._nr_running,
+                                                                                      self._nr_waiting))
+                self._nr_waiting += 1
+                try:
+                    self._condition.wait_for(lambda: self._nr_running < self._max_concurrent)
+                finally:
+                    self._nr_waiting -= 1
+            self._nr_running += 1
+
+    def release(self) -> None:
+        """
+        Finish a running decision.
+        """
+        with self._condition:
+            self._nr_running -= 1
+            self._condition.notify()
+
+    def __enter__(self) -> 'DecisionLimiter':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
+class PlayerWorkerPool:
+    """
+    Pool of worker processes for the decisions of players.
+
+    Every worker process has its own copy of all the players, which are sent to the process (pickled) when it
+    is started, so the players must be picklable and all players must be known when the pool is started. The
+    workers are started by start(), so they are ready (and the modules of the players are imported) when the first
+    request arrives.
+
+    As the players are copies, state that a player keeps between decisions (for example search trees of the previous
+    moves) is only available if the next decision of the round is taken by the same worker process.
+
+    If a worker process terminates abruptly (for example when it runs out of memory), the executor is broken: the
+    running decisions fail and the worker processes are started again for the next decision.
+    """
+
+    def __init__(self, players: Dict[str, Player], max_workers: int = None):
+        """
+        Args:
+            players: the players by name, the dict is sent to the workers when they are started
+            max_workers: the number of worker processes, None for the number of cpus
+        """
+        self._players = players
+        self._max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self._executor = None                           # type: ProcessPoolExecutor
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def is_started(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """
+        Start the worker processes, if they are not started yet.
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers, initializer=_init_worker,
+                                                 initargs=(self._players,))
+            # the executor starts the processes when tasks are submitted
+            pids = {future.result() for future in [self._executor.submit(_ping) for _ in range(self._max_workers)]}
+            self._logger.info('Started {} worker processes'.format(len(pids)))
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def submit(self, player_name: str, method: str, rnd: PlayerRound) -> Future:
+        """
+        Submit a decision to the workers.
+
+        Args:
+            player_name: the name of the player
+            method: the method of the player, 'select_trump' or 'play_card'
+            rnd: the round for the decision
+
+        Returns:
+            the future of the Decision
+        """
+        self.start()
+        executor = self._executor
+        try:
+            return executor.submit(_decide, player_name, method, rnd)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return self._executor.submit(_decide, player_name, method, rnd)
+
+    def _restart(self, broken_executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # another thread might have started the workers again already
+            if self._executor is broken_executor:
+                self._logger.warning('Worker process terminated abruptly, starting the worker processes again')
+                broken_executor.shutdown(wait=False)
+                self._executor = None
+        self.start()
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from source.jass.base.const import JASS_SCHIEBER_1000, JASS_HEARTS, NORTH
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.arena.batched_arena import BatchedArena
+from source.jass.arena.trump_selection_players_strategy import TrumpPlayerStrategy
+from source.jass.player.player import Player
+from source.jass.player.random_player_schieber import RandomPlayerSchieber
+
+
+class RecordingPlayer(RandomPlayerSchieber):
+    """
+    Random player that plays the cards of a batch at once and records the batch sizes and the last tricks.
+    """
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+        self.last_tricks = []
+
+    def play_cards_batch(self, rnds):
+        self.batch_sizes.append(len(rnds))
+        cards = [self.play_card(rnd) for rnd in rnds]
+        for rnd, card in zip(rnds, cards):
+            if rnd.nr_played_cards == 35:
+                tricks = rnd.tricks.copy()
+                tricks[8, 3] = card
+                self.last_tricks.append((rnd.dealer, rnd.trump, rnd.trick_first_player[0], tricks))
+        return cards
+
+
+class BatchedArenaTestCase(unittest.TestCase):
+
+    def test_play_rounds_batch(self):
+        arena = BatchedArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), batch_size=8)
+        player = RecordingPlayer()
+        arena.set_players(player, player, player, player)
+
+        points = arena.play_rounds_batch(NORTH, 8)
+        self.assertEqual((8, 2), points.shape)
+        np.testing.assert_array_equal(157, points.sum(axis=1))
+        self.assertGreater(max(player.batch_sizes), 1)
+
+        # replay the rounds with the rules of RoundSchieber
+        self.assertEqual(8, len(player.last_tricks))
+        replayed_points = []
+        for dealer, trump, first_player, tricks in player.last_tricks:
+            rnd = RoundSchieber(dealer=dealer)
+            rnd.trump = trump
+            rnd.player = first_player
+            rnd.trick_first_player[0] = first_player
+            for trick in tricks:
+                for card in trick:
+                    # give the card to the player just before it is played
+                    rnd.hands[rnd.player, card] = 1
+                    rnd.action_play_card(card)
+            replayed_points.append([rnd.points_team_0, rnd.points_team_1])
+        self.assertEqual(sorted(replayed_points), sorted(points.tolist()))
+
+    def test_play_all_games(self):
+        arena = BatchedArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), nr_rounds=4,
+                             batch_size=4, print_every_x_games=100)
+        player = RandomPlayerSchieber()
+        arena.set_players(player, player, player, player)
+        arena.nr_games_to_play = 6
+        arena.play_all_games()
+
+        self.assertEqual(6, arena.nr_games_played)
+        self.assertEqual(arena.nr_wins_team_0 + arena.nr_wins_team_1 + arena.nr_draws, arena.nr_games_played)
+
+    def test_invalid_card(self):
+        class FirstCardPlayer(RandomPlayerSchieber):
+            def play_card(self, rnd):
+                return int(np.flatnonzero(rnd.hand)[0])
+
+        arena = BatchedArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), batch_size=16)
+        player = FirstCardPlayer()
+        arena.set_players(player, player, player, player)
+        with self.assertRaises(AssertionError):
+            arena.play_rounds_batch(NORTH, 16)
+
+    def test_jass_type(self):
+        with self.assertRaises(ValueError):
+            BatchedArena(jass_type=JASS_HEARTS, trump_strategy=TrumpPlayerStrategy())
+
+    def test_play_cards_batch_default(self):
+        class ConstantPlayer(Player):
+            def play_card(self, rnd):
+                return rnd.nr_played_cards
+
+        self.assertEqual([1, 2], ConstantPlayer().play_cards_batch([_Rnd(1), _Rnd(2)]))
+
+
+class _Rnd:
+    def __init__(self, nr_played_cards):
+        self.nr_played_cards = nr_played_cards
+
+
+if __name__ == '__main__':
+    unittest.main()
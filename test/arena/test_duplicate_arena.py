@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from source.jass.base.const import JASS_SCHIEBER_1000, DIAMONDS, card_values
+from source.jass.arena.duplicate_arena import DuplicateArena
+from source.jass.arena.trump_selection_players_strategy import TrumpPlayerStrategy
+from source.jass.player.player import Player
+
+
+class FirstCardPlayer(Player):
+    def select_trump(self, rnd):
+        return DIAMONDS
+
+    def play_card(self, rnd):
+        return int(np.flatnonzero(rnd.get_valid_cards())[0])
+
+
+class GreedyPlayer(FirstCardPlayer):
+    def play_card(self, rnd):
+        valid_cards = np.flatnonzero(rnd.get_valid_cards())
+        return int(valid_cards[np.argmax(card_values[rnd.trump, valid_cards])])
+
+
+class DuplicateArenaTestCase(unittest.TestCase):
+
+    def test_generate_deals(self):
+        arena = DuplicateArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), nr_rounds=4,
+                               seed=5)
+        deals = arena.generate_deals(3)
+        self.assertEqual((4, 4, 36), deals.shape)
+        np.testing.assert_array_equal(9, deals.sum(axis=2))
+        np.testing.assert_array_equal(1, deals.sum(axis=1))
+        np.testing.assert_array_equal(deals, arena.generate_deals(3))
+        self.assertFalse(np.array_equal(deals, arena.generate_deals(4)))
+
+    def test_same_players_draw(self):
+        # deterministic players get the same points with the same cards, so the paired difference is 0
+        arena = DuplicateArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), seed=1,
+                               print_every_x_games=100)
+        player = FirstCardPlayer()
+        arena.set_players(player, player, player, player)
+        arena.nr_games_to_play = 3
+        arena.play_all_games()
+
+        self.assertEqual(3, arena.nr_games_played)
+        self.assertEqual(3, arena.nr_draws)
+        self.assertEqual(0, arena.mean_difference)
+        self.assertFalse(arena.is_significant)
+
+    def test_early_stop(self):
+        arena = DuplicateArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), seed=1,
+                               early_stop=True, min_games=5, print_every_x_games=100)
+        greedy = GreedyPlayer()
+        first_card = FirstCardPlayer()
+        arena.set_players(greedy, first_card, greedy, first_card)
+        arena.nr_games_to_play = 100
+        arena.play_all_games()
+
+        self.assertLess(arena.nr_games_played, 100)
+        self.assertTrue(arena.is_significant)
+        # the early stop uses a higher confidence, as the interval is checked after every game
+        self.assertTrue(arena.statistics.is_significant(0.999))
+        self.assertEqual(arena.nr_games_played, arena.early_stop_test.statistics.nr_samples)
+        self.assertEqual(arena.nr_games_played, arena.statistics.nr_samples)
+        self.assertEqual(arena.delta_points, arena.mean_difference * arena.nr_games_played)
+
+        # the seats are restored after the games
+        self.assertIs(greedy, arena.north)
+        self.assertIs(first_card, arena.east)
+
+
+if __name__ == '__main__':
+    unittest.main()
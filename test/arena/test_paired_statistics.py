@@ -0,0 +1,43 @@
+import math
+import unittest
+
+import numpy as np
+
+from source.jass.arena.paired_statistics import PairedStatistics
+
+
+class PairedStatisticsTestCase(unittest.TestCase):
+
+    def test_mean_std(self):
+        differences = np.random.RandomState(3).normal(2.0, 5.0, size=200)
+        statistics = PairedStatistics()
+        for difference in differences:
+            statistics.add(difference)
+        self.assertEqual(200, statistics.nr_samples)
+        self.assertAlmostEqual(differences.mean(), statistics.mean)
+        self.assertAlmostEqual(differences.std(ddof=1), statistics.std)
+        self.assertAlmostEqual(differences.std(ddof=1) / math.sqrt(200), statistics.std_error)
+
+    def test_confidence_interval(self):
+        statistics = PairedStatistics()
+        self.assertFalse(statistics.is_significant())
+        statistics.add(1.0)
+        self.assertEqual(math.inf, statistics.std_error)
+        self.assertFalse(statistics.is_significant())
+
+        for difference in [-1.0, 1.0, -1.0]:
+            statistics.add(difference)
+        low, high = statistics.confidence_interval(0.95)
+        self.assertAlmostEqual(-high, low)
+        self.assertAlmostEqual(1.96 * statistics.std_error, high, places=2)
+        self.assertFalse(statistics.is_significant())
+
+        for _ in range(20):
+            statistics.add(1.0)
+        self.assertTrue(statistics.is_significant())
+        self.assertGreater(statistics.confidence_interval(0.99)[1] - statistics.confidence_interval(0.99)[0],
+                           statistics.confidence_interval(0.9)[1] - statistics.confidence_interval(0.9)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
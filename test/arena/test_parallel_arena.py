@@ -0,0 +1,44 @@
+import unittest
+from source.jass.base.const import JASS_SCHIEBER_1000
+from source.jass.arena.arena import Arena
+from source.jass.arena.parallel_arena import ParallelArena
+from source.jass.arena.trump_selection_players_strategy import TrumpPlayerStrategy
+from source.jass.arena.play_game_nr_rounds_strategy import PlayNrRoundsStrategy
+from source.jass.player.random_player_schieber import RandomPlayerSchieber
+
+
+def create_arena():
+    return Arena(jass_type=JASS_SCHIEBER_1000,
+                 trump_strategy=TrumpPlayerStrategy(),
+                 play_game_strategy=PlayNrRoundsStrategy(2),
+                 print_every_x_games=1000)
+
+
+def create_players():
+    player = RandomPlayerSchieber()
+    return [player, player, player, player]
+
+
+class ParallelArenaTestCase(unittest.TestCase):
+
+    def test_play_all_games(self):
+        arena = ParallelArena(create_arena, create_players, nr_games_to_play=6, seed=1, max_workers=2,
+                              print_progress=False)
+        arena.play_all_games()
+
+        self.assertEqual(6, arena.nr_games_played)
+        self.assertEqual(arena.nr_wins_team_0 + arena.nr_wins_team_1 + arena.nr_draws, arena.nr_games_played)
+        self.assertEqual(sum(delta for _, delta in arena.results), arena.delta_points)
+
+    def test_deterministic(self):
+        arena_1 = ParallelArena(create_arena, create_players, nr_games_to_play=4, seed=3, max_workers=2,
+                                games_per_task=1, print_progress=False)
+        arena_1.play_all_games()
+        arena_2 = ParallelArena(create_arena, create_players, nr_games_to_play=4, seed=3, max_workers=1,
+                                games_per_task=4, print_progress=False)
+        arena_2.play_all_games()
+        self.assertEqual(arena_1.results, arena_2.results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import math
+import unittest
+
+import numpy as np
+
+from source.jass.base.const import JASS_SCHIEBER_1000, DIAMONDS, card_values
+from source.jass.arena.duplicate_arena import DuplicateArena
+from source.jass.arena.sequential_arena import SequentialArena
+from source.jass.arena.sequential_testing import SPRT, ConfidenceIntervalTest, TEAM_0_BETTER, TEAM_1_BETTER, \
+    NO_DIFFERENCE
+from source.jass.arena.trump_selection_players_strategy import TrumpPlayerStrategy
+from source.jass.player.player import Player
+
+
+class FirstCardPlayer(Player):
+    def select_trump(self, rnd):
+        return DIAMONDS
+
+    def play_card(self, rnd):
+        return int(np.flatnonzero(rnd.get_valid_cards())[0])
+
+
+class GreedyPlayer(FirstCardPlayer):
+    def play_card(self, rnd):
+        valid_cards = np.flatnonzero(rnd.get_valid_cards())
+        return int(valid_cards[np.argmax(card_values[rnd.trump, valid_cards])])
+
+
+class SequentialArenaTestCase(unittest.TestCase):
+
+    def test_sprt(self):
+        test = SPRT(p0=0.5, p1=0.6, alpha=0.05, beta=0.05)
+        lower, upper = test.bounds
+        self.assertAlmostEqual(-math.log(19), lower)
+        self.assertAlmostEqual(math.log(19), upper)
+
+        nr_wins = math.ceil(upper / math.log(0.6 / 0.5))
+        for _ in range(nr_wins - 1):
+            test.add_game(0, 10)
+        self.assertIsNone(test.decision)
+        test.add_game(0, 10)
+        self.assertEqual(TEAM_0_BETTER, test.decision)
+
+        test = SPRT(p0=0.5, p1=0.6)
+        for _ in range(100):
+            test.add_game(1, -10)
+            if test.decision is not None:
+                break
+        self.assertEqual(NO_DIFFERENCE, test.decision)
+
+        with self.assertRaises(ValueError):
+            SPRT(p0=0.6, p1=0.5)
+
+    def test_sprt_draws(self):
+        test = SPRT(p0=0.5, p1=0.6)
+        test.add_game(None, 0)
+        test.add_game(0, 10)
+        test.add_game(1, -10)
+        self.assertAlmostEqual(1.5 * (math.log(1.2) + math.log(0.8)), test.llr)
+
+    def test_confidence_interval_test(self):
+        test = ConfidenceIntervalTest(confidence=0.95, min_games=5, margin=1.0)
+        for _ in range(4):
+            test.add_game(1, -10)
+        self.assertIsNone(test.decision)
+        test.add_game(1, -12)
+        self.assertEqual(TEAM_1_BETTER, test.decision)
+
+        test = ConfidenceIntervalTest(confidence=0.95, min_games=5, margin=0.1, on_points=False)
+        for winner in [0, 1] * 50:
+            test.add_game(winner, 0)
+        self.assertIsNone(test.decision)
+        for _ in range(300):
+            test.add_game(None, 0)
+        self.assertEqual(NO_DIFFERENCE, test.decision)
+
+    def test_play_until_decision(self):
+        arena = DuplicateArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), seed=1)
+        greedy = GreedyPlayer()
+        first_card = FirstCardPlayer()
+        arena.set_players(greedy, first_card, greedy, first_card)
+
+        driver = SequentialArena(arena, ConfidenceIntervalTest(confidence=0.95, min_games=5), chunk_size=5,
+                                 max_games=100)
+        decision = driver.play_until_decision()
+        self.assertEqual(TEAM_1_BETTER, decision)
+        self.assertEqual(0, driver.nr_games_played % 5)
+        self.assertLess(driver.nr_games_played, 100)
+        self.assertEqual(arena.nr_games_played, driver.nr_games_played)
+        self.assertAlmostEqual(arena.mean_difference, driver.test.statistics.mean)
+
+    def test_max_games(self):
+        arena = DuplicateArena(jass_type=JASS_SCHIEBER_1000, trump_strategy=TrumpPlayerStrategy(), seed=1)
+        player = FirstCardPlayer()
+        arena.set_players(player, player, player, player)
+
+        driver = SequentialArena(arena, ConfidenceIntervalTest(min_games=2), chunk_size=2, max_games=3)
+        self.assertIsNone(driver.play_until_decision())
+        self.assertEqual(3, driver.nr_games_played)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.batch_playout import get_valid_cards_batch, calc_winners_batch, calc_points_batch, \
+    play_random_batch
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.player_round import PlayerRound
+
+
+class BatchPlayoutTestCase(unittest.TestCase):
+    def _random_round(self, trump: int) -> RoundSchieber:
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(trump)
+        return rnd
+
+    def test_valid_cards_and_tricks(self):
+        for trump in range(MAX_TRUMP + 1):
+            rounds = [self._random_round(trump) for _ in range(20)]
+            for nr_played_cards in range(36):
+                move_nr = nr_played_cards % 4
+                hands = np.array([rnd.hands[rnd.player, :] for rnd in rounds])
+                tricks = np.array([rnd.current_trick for rnd in rounds])
+                valid_cards = get_valid_cards_batch(hands, tricks, move_nr, trump)
+                for i, rnd in enumerate(rounds):
+                    self.assertTrue(np.all(rnd.get_valid_cards() == valid_cards[i]))
+
+                first_players = np.array([rnd.trick_first_player[rnd.nr_tricks] for rnd in rounds])
+                for rnd in rounds:
+                    rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+
+                if move_nr == 3:
+                    nr_trick = nr_played_cards // 4
+                    tricks = np.array([rnd.tricks[nr_trick, :] for rnd in rounds])
+                    winners = calc_winners_batch(tricks, first_players, trump)
+                    points = calc_points_batch(tricks, nr_played_cards == 35, trump)
+                    for i, rnd in enumerate(rounds):
+                        self.assertEqual(rnd.trick_winner[nr_trick], winners[i])
+                        self.assertEqual(rnd.trick_points[nr_trick], points[i])
+
+    def test_play_random_batch(self):
+        rnd = self._random_round(SPADES)
+        for _ in range(6):
+            rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        player_rnd = PlayerRound()
+        player_rnd.set_from_round(rnd)
+
+        hands = np.repeat(rnd.hands[np.newaxis, :, :], 50, axis=0)
+        points = play_random_batch(player_rnd, hands, np.random.default_rng(1))
+        self.assertEqual((50, 2), points.shape)
+        self.assertTrue(np.all(points.sum(axis=1) == 157))
+
+        # same seed gives the same results
+        points_2 = play_random_batch(player_rnd, hands, np.random.default_rng(1))
+        self.assertTrue(np.all(points == points_2))
+
+    def test_play_last_trick(self):
+        rnd = self._random_round(OBE_ABE)
+        for _ in range(32):
+            rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        player_rnd = PlayerRound()
+        player_rnd.set_from_round(rnd)
+        points = play_random_batch(player_rnd, rnd.hands[np.newaxis, :, :])
+        for _ in range(4):
+            rnd.action_play_card(np.flatnonzero(rnd.get_valid_cards())[0])
+        self.assertEqual([rnd.points_team_0, rnd.points_team_1], points[0].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.bitboard import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.round_hearts import RoundHeartsTeam
+
+
+class BitboardTestCase(unittest.TestCase):
+    def test_conversions(self):
+        cards = get_cards_encoded([DA, H10, SJ, C6])
+        bits = convert_one_hot_encoded_cards_to_bits(cards)
+        self.assertEqual(get_cards_bits([DA, H10, SJ, C6]), bits)
+        self.assertEqual([DA, H10, SJ, C6], convert_bits_to_int_encoded_list(bits))
+        self.assertEqual(4, count_cards(bits))
+        self.assertTrue(np.all(cards == convert_bits_to_one_hot_encoded_cards(bits)))
+        self.assertEqual(DA, lowest_card(bits))
+        self.assertEqual(C6, highest_card(bits))
+
+        self.assertEqual(ALL_CARDS, convert_one_hot_encoded_cards_to_bits(np.ones(36, np.int32)))
+        self.assertEqual(0, convert_bits_to_one_hot_encoded_cards(EMPTY).sum())
+
+    def test_masks(self):
+        for color in range(4):
+            self.assertEqual(9, count_cards(color_masks_bits[color]))
+        self.assertEqual(ALL_CARDS, color_masks_bits[0] | color_masks_bits[1] | color_masks_bits[2] |
+                         color_masks_bits[3])
+        self.assertEqual(get_cards_bits([DJ, D9]), higher_trump_bits[DA])
+        self.assertEqual(0, higher_trump_bits[SJ])
+
+    def test_card_values(self):
+        for trump in range(MAX_TRUMP + 1):
+            self.assertEqual(152, sum_card_values_bits(ALL_CARDS, trump))
+
+    def _play_random_round(self, rnd):
+        rnd.deal_cards()
+        rnd.action_trump(np.random.randint(0, MAX_TRUMP + 1))
+        for _ in range(36):
+            hand = rnd.hands[rnd.player, :]
+            valid_cards = rnd.get_valid_cards()
+            valid_cards_bits = rnd.rule.get_valid_cards_bits(convert_one_hot_encoded_cards_to_bits(hand),
+                                                             rnd.current_trick, rnd.nr_cards_in_trick, rnd.trump)
+            self.assertTrue(np.all(valid_cards == convert_bits_to_one_hot_encoded_cards(valid_cards_bits)))
+
+            card = np.random.choice(np.flatnonzero(valid_cards))
+            trick = rnd.current_trick
+            first_player = rnd.trick_first_player[rnd.nr_tricks]
+            is_last = rnd.nr_played_cards == 35
+            rnd.action_play_card(card)
+
+            if rnd.nr_cards_in_trick == 0:
+                trick_bits = get_cards_bits(trick.tolist())
+                self.assertEqual(rnd.rule.calc_points(trick, is_last, rnd.trump),
+                                 rnd.rule.calc_points_bits(trick_bits, is_last, rnd.trump))
+                self.assertEqual(rnd.rule.calc_winner(trick, first_player, rnd.trump),
+                                 rnd.rule.calc_winner_bits(trick, first_player, rnd.trump))
+
+    def test_rule_schieber(self):
+        for _ in range(100):
+            self._play_random_round(RoundSchieber(dealer=NORTH))
+
+    def test_rule_hearts(self):
+        for _ in range(20):
+            self._play_random_round(RoundHeartsTeam(dealer=NORTH))
+
+
+if __name__ == '__main__':
+    unittest.main()
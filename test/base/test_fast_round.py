@@ -0,0 +1,71 @@
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.bitboard import convert_bits_to_int_encoded_list, convert_one_hot_encoded_cards_to_bits
+from source.jass.base.fast_round import FastRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.player_round_cheating import PlayerRoundCheating
+
+
+class FastRoundTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rnd = RoundSchieber(dealer=NORTH)
+        self.rnd.deal_cards()
+        self.rnd.action_trump(PUSH)
+        self.rnd.action_trump(HEARTS)
+
+    def test_play_same_as_round(self):
+        fast_rnd = FastRound.from_round(self.rnd)
+        self.assertEqual(self.rnd, fast_rnd.to_round())
+        for _ in range(36):
+            valid_cards = self.rnd.get_valid_cards()
+            self.assertEqual(convert_one_hot_encoded_cards_to_bits(valid_cards), fast_rnd.get_valid_cards())
+            card = np.random.choice(np.flatnonzero(valid_cards))
+            self.rnd.action_play_card(card)
+            fast_rnd.play(card)
+            self.assertEqual(self.rnd, fast_rnd.to_round())
+            fast_rnd.to_round().assert_invariants()
+        self.assertIsNone(fast_rnd.player)
+        self.assertEqual(157, fast_rnd.points_team_0 + fast_rnd.points_team_1)
+
+    def test_undo(self):
+        fast_rnd = FastRound.from_round(self.rnd)
+        rounds = []
+        cards = []
+        for _ in range(36):
+            rounds.append(fast_rnd.to_round())
+            card = np.random.choice(convert_bits_to_int_encoded_list(fast_rnd.get_valid_cards()))
+            cards.append(card)
+            fast_rnd.play(card)
+        for i in reversed(range(36)):
+            self.assertEqual(cards[i], fast_rnd.undo())
+            self.assertEqual(rounds[i], fast_rnd.to_round())
+
+    def test_clone(self):
+        fast_rnd = FastRound.from_round(self.rnd)
+        clone = fast_rnd.clone()
+        card = convert_bits_to_int_encoded_list(clone.get_valid_cards())[0]
+        clone.play(card)
+        self.assertEqual(self.rnd, fast_rnd.to_round())
+        self.assertEqual(1, clone.nr_played_cards)
+        self.assertEqual(0, fast_rnd.nr_played_cards)
+
+    def test_player_round(self):
+        for _ in range(13):
+            self.rnd.action_play_card(np.random.choice(np.flatnonzero(self.rnd.get_valid_cards())))
+
+        player_rnd = PlayerRound()
+        player_rnd.set_from_round(self.rnd)
+        fast_rnd = FastRound.from_player_round(player_rnd, self.rnd.hands)
+        self.assertEqual(self.rnd, fast_rnd.to_round())
+        self.assertEqual(player_rnd, fast_rnd.to_player_round())
+
+        player_rnd_cheating = PlayerRoundCheating()
+        player_rnd_cheating.set_from_round(self.rnd)
+        fast_rnd = FastRound.from_player_round(player_rnd_cheating)
+        self.assertEqual(player_rnd_cheating, fast_rnd.to_player_round_cheating())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 from source.jass.base.const import *
@@ -246,6 +247,24 @@ class RoundTestCase(unittest.TestCase):
 
         rnd.assert_invariants()
 
+    def test_push_pop_card(self):
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(SPADES)
+        rounds = []
+        for i in range(36):
+            rounds.append(copy.deepcopy(rnd))
+            rnd.push_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        rnd.assert_invariants()
+
+        for i in reversed(range(36)):
+            card = rnd.pop_card()
+            rnd.assert_invariants()
+            self.assertEqual(rounds[i], rnd)
+            self.assertEqual(rounds[i].hands[rnd.player, card], 1)
+            # current trick must still be a view into the tricks
+            self.assertTrue(np.shares_memory(rnd.current_trick, rnd.tricks))
+
 
 if __name__ == '__main__':
     unittest.main()
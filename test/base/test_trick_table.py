@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.round_hearts import RoundHeartsTeam
+from source.jass.base.rule_schieber import RuleSchieber
+from source.jass.base.rule_hearts import RuleHearts
+from source.jass.base.trick_table import get_trick_table_schieber, get_trick_table_hearts, TrickTable
+
+
+class TrickTableTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.table_schieber = get_trick_table_schieber(cls.directory.name)
+        cls.table_hearts = get_trick_table_hearts(cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_index(self):
+        self.assertEqual(0, TrickTable.index([DA, DA, DA, DA]))
+        self.assertEqual(36 ** 4 - 1, TrickTable.index(np.array([C6, C6, C6, C6])))
+
+    def test_loaded_once(self):
+        self.assertIs(self.table_schieber, get_trick_table_schieber(self.directory.name))
+
+    def _play_rounds(self, rnd_with_table, rnd):
+        rnd_with_table.set_hands(rnd.hands)
+        for _ in range(36):
+            card = np.random.choice(np.flatnonzero(rnd.get_valid_cards()))
+            rnd.action_play_card(card)
+            rnd_with_table.action_play_card(card)
+        self.assertTrue(rnd == rnd_with_table)
+
+    def test_schieber(self):
+        rule = RuleSchieber(trick_table=self.table_schieber)
+        for trump in range(MAX_TRUMP + 1):
+            for _ in range(10):
+                rnd = RoundSchieber(dealer=NORTH)
+                rnd.deal_cards()
+                rnd.action_trump(trump)
+                rnd_with_table = RoundSchieber(dealer=NORTH)
+                rnd_with_table.rule = rule
+                rnd_with_table.action_trump(trump)
+                self._play_rounds(rnd_with_table, rnd)
+
+    def test_hearts(self):
+        rule = RuleHearts(trick_table=self.table_hearts)
+        for _ in range(20):
+            rnd = RoundHeartsTeam(dealer=NORTH)
+            rnd.deal_cards()
+            rnd_with_table = RoundHeartsTeam(dealer=NORTH)
+            rnd_with_table.rule = rule
+            self._play_rounds(rnd_with_table, rnd)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.zobrist import calc_zobrist_hash
+
+
+class ZobristTestCase(unittest.TestCase):
+    def _deal(self, seed: int, trump: int) -> RoundSchieber:
+        np.random.seed(seed)
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(trump)
+        return rnd
+
+    def test_incremental(self):
+        for seed in range(MAX_TRUMP + 1):
+            rnd = self._deal(seed, seed)
+            hashes = []
+            while rnd.nr_played_cards < 36:
+                rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+                self.assertEqual(calc_zobrist_hash(rnd), rnd.zobrist_hash)
+                hashes.append(rnd.zobrist_hash)
+            # all states of a round are different
+            self.assertEqual(36, len(set(hashes)))
+
+            # taking back the cards restores the hashes
+            while rnd.nr_played_cards > 1:
+                self.assertEqual(hashes[rnd.nr_played_cards - 1], rnd.zobrist_hash)
+                rnd.pop_card()
+                self.assertEqual(calc_zobrist_hash(rnd), rnd.zobrist_hash)
+
+    def test_set_hands(self):
+        rnd = self._deal(1, HEARTS)
+        rnd.action_play_card(np.flatnonzero(rnd.get_valid_cards())[0])
+        self.assertIsNotNone(rnd.zobrist_hash)
+        rnd.set_hands(rnd.hands)
+        self.assertIsNone(rnd.zobrist_hash)
+
+    def test_transpositions(self):
+        # play the same deal with different random orders of the first two tricks, the states with the same hash
+        # must be the same
+        states = {}
+        nr_transpositions = 0
+        for seed in range(300):
+            rnd = self._deal(5, OBE_ABE)
+            np.random.seed(seed)
+            cards = []
+            for _ in range(8):
+                card = np.random.choice(np.flatnonzero(rnd.get_valid_cards()))
+                cards.append(card)
+                rnd.action_play_card(card)
+            state = (rnd.hands.tobytes(), rnd.points_team_0, rnd.player)
+            if rnd.zobrist_hash in states:
+                self.assertEqual(states[rnd.zobrist_hash][0], state)
+                if states[rnd.zobrist_hash][1] != cards:
+                    nr_transpositions += 1
+            else:
+                states[rnd.zobrist_hash] = (state, cards)
+        self.assertTrue(nr_transpositions > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
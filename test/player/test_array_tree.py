@@ -0,0 +1,82 @@
+import math
+import random
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.player.mcts.array_mcts import ArrayMCTS
+from source.jass.player.mcts.array_tree import ArrayTree
+from source.jass.player.mcts.selection import UCB1
+from source.jass.player.search_budget import SearchBudget
+
+
+class ArrayTreeTestCase(unittest.TestCase):
+    def test_add_children_grow(self):
+        tree = ArrayTree(capacity=4)
+        start = tree.add_children(tree.root, [3, 7, 11])
+        self.assertEqual((1, 4), tree.children(tree.root))
+        self.assertEqual(4, tree.capacity)
+        child = tree.get_child(tree.root, 7)
+        self.assertEqual(start + 1, child)
+        self.assertIsNone(tree.get_child(tree.root, 8))
+
+        # the arrays are doubled when full, keeping the nodes
+        tree.add_children(child, [20, 21, 22, 23, 24])
+        self.assertEqual(16, tree.capacity)
+        self.assertEqual(9, tree.size)
+        grandchild = tree.get_child(child, 22)
+        self.assertEqual([7, 22], tree.path_cards(grandchild))
+        self.assertEqual(child, tree.parent[grandchild])
+        self.assertTrue(tree.is_leaf(grandchild))
+
+    def test_select_child(self):
+        tree = ArrayTree()
+        start = tree.add_children(tree.root, [0, 1, 2])
+        tree.visits[tree.root] = 30
+        tree.visits[start:start + 3] = [10, 15, 5]
+        tree.wins[start:start + 3] = [6, 12, 1]
+        expected = [w / v + 1.5 * math.sqrt(math.log(30) / v) for w, v in ((6, 10), (12, 15), (1, 5))]
+        self.assertEqual(start + int(np.argmax(expected)), tree.select_child(tree.root, UCB1(1.5)))
+        self.assertEqual(start + 1, tree.get_child_with_max_visit_count(tree.root))
+
+        # children that have not been visited are selected first
+        tree.visits[start + 2] = 0
+        self.assertEqual(start + 2, tree.select_child(tree.root, UCB1(1.5)))
+
+    def test_search(self):
+        np.random.seed(1)
+        random.seed(1)
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(SPADES)
+        for _ in range(20):
+            rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        player_rnd = PlayerRound(jass_type=rnd.jass_type)
+        player_rnd.set_from_round(rnd)
+
+        budget = SearchBudget(simulations=200, early_stop=False).start()
+        tree = ArrayMCTS.monte_carlo_tree_search(player_rnd, budget=budget)
+        self.assertTrue(tree.visit_count >= 200)
+        self.assertEqual(tree.visit_count, sum(child.visit_count for child in tree.childs))
+        valid_cards = np.flatnonzero(player_rnd.get_valid_cards()).tolist()
+        self.assertEqual(sorted(valid_cards), sorted(child.card for child in tree.childs))
+        # the visits of every expanded node are the visits of its children and its own simulation
+        for node in range(1, tree.size):
+            if not tree.is_leaf(node):
+                start, end = tree.children(node)
+                self.assertEqual(tree.visits[node], tree.visits[start:end].sum() + 1)
+
+        # advance the tree by two cards, the sampled round follows the root
+        child = tree.get_child_with_max_visit_count(tree.root)
+        grandchild = tree.get_child_with_max_visit_count(child)
+        cards = tree.path_cards(grandchild)
+        nr_played_cards = tree.round.nr_played_cards
+        advanced = ArrayMCTS.advance_root(tree, cards)
+        self.assertEqual(grandchild, advanced.root)
+        self.assertEqual(nr_played_cards + 2, advanced.round.nr_played_cards)
+        self.assertIsNone(ArrayMCTS.advance_root(advanced, cards[0:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.rule_schieber import RuleSchieber
+from source.jass.player.constraint_sampler import get_possible_players, sample_hands, DeterminizationGenerator
+from player_rounds import player_view
+
+
+class ConstraintSamplerTestCase(unittest.TestCase):
+    def _rounds(self, nr_rounds: int):
+        # all the states of some random rounds with different trumps
+        for seed in range(nr_rounds):
+            np.random.seed(seed)
+            random.seed(seed)
+            rnd = RoundSchieber(dealer=NORTH)
+            rnd.deal_cards()
+            rnd.action_trump(seed % (MAX_TRUMP + 1))
+            while rnd.nr_played_cards < 36:
+                yield rnd
+                rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+
+    def _assert_consistent(self, player_rnd: PlayerRound, hands: np.ndarray):
+        # replay the round from the dealt hands (the sampled hands and the played cards), every card must be valid
+        played = player_rnd.tricks.flatten()[0:player_rnd.nr_played_cards]
+        dealt = hands.copy()
+        dealt[:, played] = 0
+        for nr_trick in range(player_rnd.nr_tricks + 1):
+            first_player = player_rnd.trick_first_player[nr_trick]
+            for i in range(4):
+                card = player_rnd.tricks[nr_trick, i]
+                if card >= 0:
+                    dealt[(first_player - i) % 4, card] = 1
+        self.assertTrue(np.all(dealt.sum(axis=0) == 1))
+        self.assertTrue(np.all(dealt.sum(axis=1) == 9))
+
+        rule = RuleSchieber()
+        for nr_trick in range(player_rnd.nr_tricks + 1):
+            first_player = player_rnd.trick_first_player[nr_trick]
+            trick = player_rnd.tricks[nr_trick]
+            for i in range(4):
+                if trick[i] < 0:
+                    break
+                player = (first_player - i) % 4
+                valid = rule.get_valid_cards(dealt[player], trick[0:i], i, player_rnd.trump)
+                self.assertEqual(1, valid[trick[i]])
+                dealt[player, trick[i]] = 0
+        np.testing.assert_array_equal(dealt, hands)
+
+    def test_samples_consistent(self):
+        for rnd in self._rounds(6):
+            player_rnd = player_view(rnd)
+            hands = sample_hands(player_rnd, 8)
+            self.assertEqual((8, 4, 36), hands.shape)
+            for sample in range(8):
+                np.testing.assert_array_equal(player_rnd.hand, hands[sample, player_rnd.player])
+                np.testing.assert_array_equal(rnd.hands.sum(axis=1), hands[sample].sum(axis=1))
+                self._assert_consistent(player_rnd, hands[sample])
+
+    def test_actual_hands_possible(self):
+        for rnd in self._rounds(6):
+            player_rnd = player_view(rnd)
+            cards, possible, nr_cards = get_possible_players(player_rnd)
+            for i, card in enumerate(cards):
+                self.assertTrue(possible[i, np.flatnonzero(rnd.hands[:, card])[0]])
+            self.assertEqual(len(cards), nr_cards.sum())
+
+    def test_void_color(self):
+        nr_voids = 0
+        for rnd in self._rounds(12):
+            if rnd.trump != OBE_ABE or rnd.nr_cards_in_trick != 0 or rnd.nr_tricks == 0:
+                continue
+            player_rnd = player_view(rnd)
+            hands = sample_hands(player_rnd, 8)
+            # players that did not follow the color of the last trick do not get any card of that color
+            trick = rnd.tricks[rnd.nr_tricks - 1]
+            first_player = rnd.trick_first_player[rnd.nr_tricks - 1]
+            color_played = color_of_card[trick[0]]
+            for i in range(1, 4):
+                player = (first_player - i) % 4
+                if color_of_card[trick[i]] != color_played and player != rnd.player:
+                    nr_voids += 1
+                    self.assertEqual(0, hands[:, player, color_masks[color_played, :] == 1].sum())
+        self.assertTrue(nr_voids > 0)
+
+    def test_seed(self):
+        rnd = next(iter(self._rounds(1)))
+        player_rnd = player_view(rnd)
+        hands_1 = sample_hands(player_rnd, 4, np.random.default_rng(5))
+        hands_2 = sample_hands(player_rnd, 4, np.random.default_rng(5))
+        np.testing.assert_array_equal(hands_1, hands_2)
+        hands_1 = DeterminizationGenerator(player_rnd, 7).hands(4)
+        hands_2 = DeterminizationGenerator(player_rnd, 7).hands(4)
+        np.testing.assert_array_equal(hands_1, hands_2)
+        self.assertEqual(np.uint8, hands_1.dtype)
+
+    def test_hands_bits(self):
+        for rnd in self._rounds(2):
+            player_rnd = player_view(rnd)
+            hands = DeterminizationGenerator(player_rnd, 3).hands(5)
+            bits = DeterminizationGenerator(player_rnd, 3).hands_bits(5)
+            self.assertEqual((5, 4), bits.shape)
+            for sample in range(5):
+                for player in range(4):
+                    self.assertEqual(int(bits[sample, player]),
+                                     sum(1 << int(card) for card in np.flatnonzero(hands[sample, player])))
+
+
+if __name__ == '__main__':
+    unittest.main()
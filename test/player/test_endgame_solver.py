@@ -0,0 +1,64 @@
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.fast_round import FastRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.player_round_cheating import PlayerRoundCheating
+from source.jass.player.endgame_solver import EndgameSolver
+
+
+class EndgameSolverTestCase(unittest.TestCase):
+    def _round(self, seed: int, trump: int, nr_cards_left: int) -> RoundSchieber:
+        np.random.seed(seed)
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(trump)
+        for _ in range(36 - nr_cards_left):
+            rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        return rnd
+
+    def _minimax(self, rnd: FastRound) -> int:
+        # points of team 0 with perfect play, without pruning
+        if rnd.nr_played_cards == 36:
+            return rnd.points_team_0
+        values = []
+        valid_cards = rnd.get_valid_cards()
+        for card in range(36):
+            if (valid_cards >> card) & 1:
+                rnd.play(card)
+                values.append(self._minimax(rnd))
+                rnd.undo()
+        return max(values) if rnd.player % 2 == 0 else min(values)
+
+    def test_solve(self):
+        solver = EndgameSolver()
+        for seed in range(12):
+            rnd = FastRound.from_round(self._round(seed, seed % (MAX_TRUMP + 1), 9 + seed % 4))
+            points_team_0, points_team_1 = solver.solve(rnd)
+            self.assertEqual(self._minimax(rnd), points_team_0)
+            self.assertEqual(157, points_team_0 + points_team_1)
+
+            card, best_points_team_0, _ = solver.best_card(rnd)
+            self.assertEqual(points_team_0, best_points_team_0)
+            self.assertTrue((rnd.get_valid_cards() >> card) & 1)
+
+    def test_solve_complete_round(self):
+        for seed in range(4):
+            rnd = self._round(seed, seed % (MAX_TRUMP + 1), 0)
+            self.assertEqual((rnd.points_team_0, rnd.points_team_1), EndgameSolver().solve(FastRound.from_round(rnd)))
+            self.assertEqual(157, rnd.points_team_0 + rnd.points_team_1)
+
+    def test_solve_round(self):
+        rnd = self._round(1, SPADES, 12)
+        nr_played_cards = rnd.nr_played_cards
+        points = EndgameSolver().solve_round(rnd)
+        self.assertEqual(nr_played_cards, rnd.nr_played_cards)
+        self.assertEqual(points, EndgameSolver().solve(FastRound.from_round(rnd)))
+
+        player_rnd = PlayerRoundCheating(jass_type=rnd.jass_type)
+        player_rnd.set_from_round(rnd)
+        self.assertEqual(points, EndgameSolver().solve_round(player_rnd))
+
+
+if __name__ == '__main__':
+    unittest.main()
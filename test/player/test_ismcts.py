@@ -0,0 +1,62 @@
+import random
+import unittest
+from unittest import mock
+
+from source.jass.base.bitboard import convert_one_hot_encoded_cards_to_bits
+from source.jass.base.const import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.player.mcts.ismcts import ISMCTS
+from source.jass.player.mcts.ismcts_player import ISMCTSPlayer
+from source.jass.player.search_budget import SearchBudget
+from player_rounds import player_view
+
+
+class ISMCTSTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(4)
+        random.seed(4)
+        self.rnd = RoundSchieber(dealer=WEST)
+        self.rnd.deal_cards()
+        self.rnd.action_trump(OBE_ABE)
+        self._play_random(9)
+
+    def _play_random(self, nr_cards: int):
+        for _ in range(nr_cards):
+            self.rnd.action_play_card(np.random.choice(np.flatnonzero(self.rnd.get_valid_cards())))
+
+    def test_determinizations(self):
+        player_rnd = player_view(self.rnd)
+        hand = convert_one_hot_encoded_cards_to_bits(player_rnd.hand)
+        played = 0
+        for card in player_rnd.tricks.flatten()[0:player_rnd.nr_played_cards]:
+            played |= 1 << int(card)
+
+        # the hands of each iteration, before the cards of the iteration are played
+        hands = []
+        iterate = ISMCTS._iterate
+
+        def record_hands(root_node, rnd, policy):
+            hands.append(list(rnd.hands))
+            iterate(root_node, rnd, policy)
+
+        with mock.patch.object(ISMCTS, '_iterate', staticmethod(record_hands)):
+            ISMCTS.search(player_rnd, budget=SearchBudget(simulations=100, early_stop=False).start())
+        self.assertEqual(100, len(hands))
+        for determinization in hands:
+            # the player has its own hand, the other players the remaining cards
+            self.assertEqual(hand, determinization[player_rnd.player])
+            self.assertEqual((1 << 36) - 1, played | sum(determinization))
+            self.assertEqual(0, played & sum(determinization))
+            self.assertEqual(36 - player_rnd.nr_played_cards, sum(bin(bits).count('1') for bits in determinization))
+
+    def test_play_card(self):
+        player = ISMCTSPlayer(budget=SearchBudget(simulations=100, early_stop=False))
+        while self.rnd.nr_played_cards < 36:
+            player_rnd = player_view(self.rnd)
+            card = player.play_card(player_rnd)
+            self.assertEqual(1, player_rnd.get_valid_cards()[card])
+            self.rnd.action_play_card(card)
+
+
+if __name__ == '__main__':
+    unittest.main()
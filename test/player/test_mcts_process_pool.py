@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.player.mcts.mcts_player import MCTSPlayer
+from source.jass.player.mcts.mcts_process_pool import MCTSProcessPool, compact_player_round, expand_player_round, \
+    get_executor
+from source.jass.player.search_budget import SearchBudget
+from player_rounds import player_view
+
+
+class MCTSProcessPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(2)
+        random.seed(2)
+        self.rnd = RoundSchieber(dealer=NORTH)
+        self.rnd.deal_cards()
+        self.rnd.action_trump(DIAMONDS)
+        for _ in range(6):
+            self.rnd.action_play_card(np.random.choice(np.flatnonzero(self.rnd.get_valid_cards())))
+
+    def test_compact_player_round(self):
+        player_rnd = player_view(self.rnd)
+        expanded = expand_player_round(compact_player_round(player_rnd))
+        self.assertEqual(player_rnd.player, expanded.player)
+        self.assertEqual(player_rnd.nr_played_cards, expanded.nr_played_cards)
+        np.testing.assert_array_equal(player_rnd.hand, expanded.hand)
+        np.testing.assert_array_equal(player_rnd.tricks, expanded.tricks)
+        np.testing.assert_array_equal(player_rnd.get_valid_cards(), expanded.get_valid_cards())
+
+    def test_get_executor(self):
+        executor = get_executor(1)
+        self.assertIs(executor, get_executor(1))
+
+    def test_search(self):
+        player_rnd = player_view(self.rnd)
+        budget = SearchBudget(simulations=50, early_stop=False).start()
+        search = MCTSProcessPool(player_rnd, search_count=2, max_workers=1, budget=budget, tree_cache_id='test')
+        card = search.run()
+        self.assertEqual(1, player_rnd.get_valid_cards()[card])
+        # each of the searches runs at least the simulations of the budget
+        self.assertTrue(search.simulated_rounds >= 100)
+        self.assertTrue(search.visit_counts.sum() > 0)
+
+    def test_player(self):
+        player = MCTSPlayer(threads=2, use_processes=True, budget=SearchBudget(simulations=50, early_stop=False),
+                            exact_cards=0)
+        player_rnd = player_view(self.rnd)
+        card = player.play_card(player_rnd)
+        self.assertEqual(1, player_rnd.get_valid_cards()[card])
+        self.assertTrue(player.last_simulations > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import json
+import pickle
+import random
+import time
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.ion.player_round_serializer import PlayerRoundSerializer
+from source.jass.ion.round_serializer import RoundSerializer
+from source.jass.player.mcts.mcts import MCTS
+from source.jass.player.mcts.mcts_player import MCTSPlayer
+from source.jass.player.mcts.ponder import Ponderer
+from source.jass.player.mcts.tree_cache import TreeCache
+from source.jass.player.search_budget import SearchBudget
+from source.jass.player_service.player_service_app import PlayerServiceApp
+from player_rounds import player_view
+
+
+class PonderTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        random.seed(5)
+        self.rnd = RoundSchieber(dealer=NORTH)
+        self.rnd.deal_cards()
+        self.rnd.action_trump(HEARTS)
+        self._play_random(16)
+
+    def _play_random(self, nr_cards: int):
+        for _ in range(nr_cards):
+            self.rnd.action_play_card(np.random.choice(np.flatnonzero(self.rnd.get_valid_cards())))
+
+    def _cache_with_tree(self) -> (TreeCache, PlayerRound, MCTS):
+        cache = TreeCache(MCTS.advance_root)
+        player_rnd = player_view(self.rnd)
+        root = MCTS.monte_carlo_tree_search(player_rnd, budget=SearchBudget(simulations=50, early_stop=False).start())
+        cache.put(player_rnd, root)
+        return cache, player_rnd, root
+
+    def _wait_for_simulations(self, ponderer: Ponderer, root, visits: int):
+        # the simulations of the pondering thread are visible in the root of the tree
+        end = time.time() + 30
+        while root.visit_count <= visits and time.time() < end:
+            time.sleep(0.01)
+
+    def test_ponder_and_stop(self):
+        cache, player_rnd, root = self._cache_with_tree()
+        visits = root.visit_count
+        ponderer = Ponderer(MCTS, cache, slice_seconds=0.01)
+        ponderer.start(player_rnd)
+        self.assertTrue(ponderer.is_running)
+        self._wait_for_simulations(ponderer, root, visits)
+        ponderer.stop()
+        self.assertFalse(ponderer.is_running)
+        self.assertTrue(ponderer.simulated_rounds > 0)
+
+        # the tree is back in the cache with the additional simulations
+        self.assertIs(root, cache.take(player_rnd))
+        self.assertTrue(root.visit_count > visits)
+
+    def test_memory_cap(self):
+        cache, player_rnd, root = self._cache_with_tree()
+        ponderer = Ponderer(MCTS, cache, max_nodes=root.visit_count + 20, slice_seconds=0.01)
+        ponderer.start(player_rnd)
+        end = time.time() + 30
+        while ponderer.is_running and time.time() < end:
+            time.sleep(0.01)
+        self.assertFalse(ponderer.is_running)
+        ponderer.stop()
+        self.assertIs(root, cache.take(player_rnd))
+
+    def test_advance_on_even_cards(self):
+        cache, player_rnd, root = self._cache_with_tree()
+        player = player_rnd.player
+        ponderer = Ponderer(MCTS, cache, slice_seconds=0.01)
+
+        # after one card, the tree remains at its state and only the child of the card is searched
+        self._play_random(1)
+        card = TreeCache.played_cards(player_view(self.rnd))[16]
+        ponderer.start(player_view(self.rnd, player))
+        ponderer.stop()
+        self.assertIs(root, cache.take(player_rnd))
+        self.assertEqual([card], [child.card for child in root.childs])
+        cache.put(player_rnd, root)
+
+        # after two cards, the tree is advanced to the new state
+        self._play_random(1)
+        cards = TreeCache.played_cards(player_view(self.rnd))[16:18]
+        child = root.get_child(cards[0]).get_child(cards[1])
+        ponderer.start(player_view(self.rnd, player))
+        ponderer.stop()
+        self.assertIs(child, cache.take(player_view(self.rnd, player)))
+
+    def test_own_card(self):
+        cache, player_rnd, root = self._cache_with_tree()
+        card = root.childs[-1].card
+        ponderer = Ponderer(MCTS, cache, slice_seconds=0.01)
+        ponderer.start(player_rnd, card)
+        ponderer.stop()
+        self.assertIs(root, cache.take(player_rnd))
+        self.assertEqual([card], [child.card for child in root.childs])
+
+    def test_trees_of_other_rounds_are_kept(self):
+        cache, player_rnd, root = self._cache_with_tree()
+        ponderer = Ponderer(MCTS, cache, slice_seconds=0.01)
+
+        # a state one card later, without a previous pondering of the round
+        self._play_random(1)
+        ponderer.start(player_view(self.rnd, player_rnd.player))
+        ponderer.stop()
+        self.assertEqual(1, len(cache._trees[TreeCache.round_key(player_rnd)]))
+
+        # a state of another round (another game of the same player)
+        other_rnd = RoundSchieber(dealer=EAST)
+        other_rnd.deal_cards()
+        other_rnd.action_trump(SPADES)
+        other_rnd.action_play_card(np.flatnonzero(other_rnd.get_valid_cards())[0])
+        ponderer.start(player_view(other_rnd))
+        self.assertFalse(ponderer.is_running)
+        self.assertIs(root, cache.take(player_rnd))
+
+    def test_player(self):
+        player = MCTSPlayer(threads=2, use_processes=False, budget=SearchBudget(simulations=50, early_stop=False),
+                            exact_cards=0, ponder=True)
+        player_rnd = player_view(self.rnd)
+        card = player.play_card(player_rnd)
+        self.assertEqual(1, player_rnd.get_valid_cards()[card])
+        player.ponder(player_rnd)
+        self.assertTrue(player._ponderer.is_running)
+
+        # the player can be copied to other processes while it ponders, the copy does not ponder
+        copy = pickle.loads(pickle.dumps(player))
+        self.assertFalse(copy._ponderer.is_running)
+
+        # the next search stops the pondering
+        player.play_card(player_rnd)
+        self.assertFalse(player._ponderer.is_running)
+        player.stop_pondering()
+
+        with self.assertRaises(ValueError):
+            MCTSPlayer(use_processes=True, ponder=True)
+
+    def test_game_info(self):
+        app = PlayerServiceApp('test_ponder')
+        player = MCTSPlayer(threads=1, use_processes=False, budget=SearchBudget(simulations=50, early_stop=False),
+                            exact_cards=0, ponder=True)
+        app.add_player('mcts', player)
+        client = app.test_client()
+
+        player_rnd = player_view(self.rnd)
+        response = client.post('/mcts/play_card', json=PlayerRoundSerializer.player_round_to_dict(player_rnd))
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(player._ponderer.is_running)
+
+        # the card of the next player, which must be in the sampled hands of a tree to continue it
+        card = card_ids[response.get_json()['card']]
+        player.stop_pondering()
+        roots = [root for _, root in player._tree_cache._trees[TreeCache.round_key(player_rnd)]]
+        self.assertEqual([[card]], [[child.card for child in root.childs] for root in roots])
+        self.rnd.action_play_card(card)
+        next_cards = [child.card for root in roots for child in root.get_child(card).childs]
+        self.rnd.action_play_card(next(c for c in next_cards if self.rnd.get_valid_cards()[c] == 1))
+        data = PlayerRoundSerializer.player_round_to_dict_for_other_player(player_view(self.rnd, player_rnd.player),
+                                                                          player_rnd.player)
+        response = client.post('/mcts/game_info', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(player._ponderer.is_running)
+
+        # the end of the round stops the pondering
+        self._play_random(36 - self.rnd.nr_played_cards)
+        response = client.post('/mcts/game_info', json=RoundSerializer.round_to_dict(self.rnd))
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(player._ponderer.is_running)
+
+
+if __name__ == '__main__':
+    unittest.main()
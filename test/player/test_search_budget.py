@@ -0,0 +1,71 @@
+import random
+import time
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.player.mcts.ismcts import ISMCTS
+from source.jass.player.mcts.mcts import MCTS
+from source.jass.player.search_budget import SearchBudget
+from player_rounds import player_view
+
+
+class SearchBudgetTestCase(unittest.TestCase):
+    def test_simulations(self):
+        budget = SearchBudget(simulations=100, early_stop=False).start()
+        self.assertFalse(budget.is_done(99))
+        self.assertTrue(budget.is_done(100))
+
+    def test_time(self):
+        budget = SearchBudget(time_seconds=0.05).start()
+        self.assertFalse(budget.is_done(0))
+        time.sleep(0.06)
+        self.assertTrue(budget.is_done(0))
+
+    def test_deadline(self):
+        budget = SearchBudget(time_seconds=100).start(deadline=time.time() - 1)
+        self.assertTrue(budget.is_done(0))
+        # the template is not changed by start
+        self.assertIsNone(SearchBudget(time_seconds=100).end_time)
+
+    def test_early_stop(self):
+        budget = SearchBudget(simulations=100).start()
+        # 40 simulations left, a lead of 40 can still be caught up, a lead of 41 not
+        self.assertFalse(budget.is_done(60, 50, 10))
+        self.assertTrue(budget.is_done(60, 51, 10))
+        budget = SearchBudget(simulations=100, early_stop=False).start()
+        self.assertFalse(budget.is_done(60, 51, 10))
+
+    def test_early_stop_unknown_rate(self):
+        budget = SearchBudget(time_seconds=10).start()
+        # no simulations yet, e.g. on the tree of a previous move with a clear lead
+        self.assertFalse(budget.is_done(0, 500, 10))
+        time.sleep(0.06)
+        self.assertTrue(budget.is_done(0, 500, 10))
+
+    def test_continue_tree_with_lead(self):
+        np.random.seed(3)
+        random.seed(3)
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(HEARTS)
+        player_rnd = player_view(rnd)
+        for search in [MCTS.monte_carlo_tree_search, ISMCTS.search]:
+            root = search(player_rnd, budget=SearchBudget(simulations=300, early_stop=False).start())
+            visits = root.visit_count
+            childs = root.childs.values() if isinstance(root.childs, dict) else root.childs
+            best, second = SearchBudget.best_two(child.visit_count for child in childs)
+            self.assertTrue(best > second)
+            # the search on the reused tree continues, although the lead can not be caught up at the rate of 0
+            root = search(player_rnd, budget=SearchBudget(time_seconds=1.0).start(), root_node=root)
+            self.assertTrue(root.visit_count > visits)
+
+    def test_best_two(self):
+        self.assertEqual((0, 0), SearchBudget.best_two([]))
+        self.assertEqual((7, 0), SearchBudget.best_two([7]))
+        self.assertEqual((7, 5), SearchBudget.best_two([3, 7, 5, 1]))
+        self.assertEqual((7, 7), SearchBudget.best_two([7, 7]))
+
+
+if __name__ == '__main__':
+    unittest.main()
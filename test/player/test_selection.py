@@ -0,0 +1,70 @@
+import math
+import unittest
+
+import numpy as np
+
+from source.jass.player.mcts.node import Node
+from source.jass.player.mcts.selection import log_visits, log_visits_array, LOG_TABLE_SIZE, UCB1, UCB1Tuned, PUCT
+from source.jass.player.mcts.UCB import UCB
+
+
+class SelectionTestCase(unittest.TestCase):
+    def test_log_visits(self):
+        self.assertEqual(0.0, log_visits(0))
+        self.assertEqual(0.0, log_visits(1))
+        self.assertAlmostEqual(math.log(1000), log_visits(1000))
+        self.assertAlmostEqual(math.log(LOG_TABLE_SIZE + 5), log_visits(LOG_TABLE_SIZE + 5))
+        n = np.array([0, 1, 7, LOG_TABLE_SIZE - 1, 3 * LOG_TABLE_SIZE])
+        np.testing.assert_allclose([log_visits(int(i)) for i in n], log_visits_array(n))
+
+    def test_ucb1(self):
+        wins = np.array([6, 12, 1])
+        visits = np.array([10, 15, 5])
+        scores = UCB1(1.5).scores(wins, visits, 30)
+        expected = [w / v + 1.5 * math.sqrt(math.log(30) / v) for w, v in zip(wins, visits)]
+        np.testing.assert_allclose(expected, scores)
+
+        # children that have not been visited are selected first
+        self.assertEqual(1, UCB1(1.5).select(np.array([6, 0, 1]), np.array([10, 0, 5]), 15))
+
+        # the visits of the parent can be different for each child
+        scores = UCB1(1.0).scores(wins, visits, np.array([30, 100, 30]))
+        self.assertAlmostEqual(12 / 15 + math.sqrt(math.log(100) / 15), scores[1])
+
+    def test_ucb1_tuned(self):
+        wins = np.array([5, 10, 0])
+        visits = np.array([10, 10, 0])
+        scores = UCB1Tuned().scores(wins, visits, 20)
+        # for p = 0.5 the variance bound is 1/4 as in UCB1 with c = 1/2
+        self.assertAlmostEqual(0.5 + math.sqrt(math.log(20) / 10 * 0.25), scores[0])
+        self.assertEqual(np.inf, scores[2])
+        # a child that always wins has a smaller variance and therefore a smaller exploration term
+        scores = UCB1Tuned().scores(np.array([500, 1000]), np.array([1000, 1000]), 2000)
+        self.assertTrue(scores[1] - 1.0 < scores[0] - 0.5)
+
+    def test_puct(self):
+        wins = np.array([5, 5, 0])
+        visits = np.array([10, 10, 0])
+        scores = PUCT(2.0).scores(wins, visits, 20)
+        np.testing.assert_allclose([0.5 + 2.0 / 3 * math.sqrt(20) / 11, 0.5 + 2.0 / 3 * math.sqrt(20) / 11,
+                                    2.0 / 3 * math.sqrt(20)], scores)
+        # the prior decides between children with the same statistics
+        self.assertEqual(1, PUCT(1.0).select(wins, visits, 20, np.array([0.2, 0.7, 0.1])))
+
+    def test_ucb_find_best_node(self):
+        parent = Node()
+        parent.visit_count = 25
+        for card, win_count, visit_count in ((3, 6, 10), (4, 12, 15)):
+            child = Node()
+            child.card = card
+            child.win_count = win_count
+            child.visit_count = visit_count
+            parent.add_child(child)
+        ucb = UCB(1.0)
+        best = ucb.find_best_node_ucb(parent)
+        expected = max(parent.childs, key=lambda child: ucb.ucb_value(25, child.win_count, child.visit_count))
+        self.assertEqual(expected.card, best.card)
+
+
+if __name__ == '__main__':
+    unittest.main()
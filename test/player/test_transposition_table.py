@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.player.mcts.array_mcts import ArrayMCTS
+from source.jass.player.mcts.transposition_table import TranspositionTable
+from source.jass.player.search_budget import SearchBudget
+
+
+class TranspositionTableTestCase(unittest.TestCase):
+    def test_add_lookup(self):
+        table = TranspositionTable(size_bits=4)
+        keys = np.array([3, 17, 100], dtype=np.uint64)
+        table.add(keys, 1, np.array([1, 0, 1]))
+        table.add(keys[0:2], 2, 1)
+        visits, wins = table.lookup(np.array([3, 17, 100, 5], dtype=np.uint64))
+        np.testing.assert_array_equal([3, 3, 1, 0], visits)
+        np.testing.assert_array_equal([2, 1, 1, 0], wins)
+
+    def test_replacement(self):
+        table = TranspositionTable(size_bits=4)
+        # 3, 19 and 35 use the same slot
+        table.add(np.array([3], dtype=np.uint64), 5, 2)
+        # the entry with more visits is kept
+        table.add(np.array([19], dtype=np.uint64), 1, 1)
+        np.testing.assert_array_equal([5, 0], table.lookup(np.array([3, 19], dtype=np.uint64))[0])
+        table.add(np.array([19], dtype=np.uint64), 6, 1)
+        np.testing.assert_array_equal([0, 6], table.lookup(np.array([3, 19], dtype=np.uint64))[0])
+        # entries of an earlier search are always replaced
+        table.new_search()
+        table.add(np.array([35], dtype=np.uint64), 1, 0)
+        np.testing.assert_array_equal([0, 1], table.lookup(np.array([19, 35], dtype=np.uint64))[0])
+
+    def test_search(self):
+        np.random.seed(1)
+        random.seed(1)
+        rnd = RoundSchieber(dealer=NORTH)
+        rnd.deal_cards()
+        rnd.action_trump(HEARTS)
+        for _ in range(16):
+            rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        player_rnd = PlayerRound(jass_type=rnd.jass_type)
+        player_rnd.set_from_round(rnd)
+
+        budget = SearchBudget(simulations=500, early_stop=False).start()
+        tree = ArrayMCTS.monte_carlo_tree_search(player_rnd, budget=budget, transposition_bits=12)
+        self.assertIsNotNone(tree.table)
+        # the table contains at least the visits of each node of the tree, if no other state uses the same slot
+        keys = tree.key[1:tree.size]
+        distinct_keys = np.unique(keys)
+        slots, counts = np.unique(distinct_keys & np.uint64(4095), return_counts=True)
+        unique_slot = np.isin(keys & np.uint64(4095), slots[counts == 1])
+        self.assertTrue(unique_slot.sum() > 0)
+        visits, _ = tree.table.lookup(keys)
+        self.assertTrue(np.all(visits[unique_slot] >= tree.visits[1:tree.size][unique_slot]))
+
+
+if __name__ == '__main__':
+    unittest.main()
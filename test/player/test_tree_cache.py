@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from source.jass.base.const import *
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.player.mcts.ismcts import ISMCTS
+from source.jass.player.mcts.tree_cache import TreeCache
+from source.jass.player.search_budget import SearchBudget
+from player_rounds import player_view
+
+
+class TreeCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self._deal(1, HEARTS)
+
+    def _deal(self, seed: int, trump: int):
+        np.random.seed(seed)
+        random.seed(seed)
+        self.rnd = RoundSchieber(dealer=NORTH)
+        self.rnd.deal_cards()
+        self.rnd.action_trump(trump)
+
+    def _play_random(self, nr_cards: int):
+        for _ in range(nr_cards):
+            self.rnd.action_play_card(np.random.choice(np.flatnonzero(self.rnd.get_valid_cards())))
+
+    def test_round_key(self):
+        player = self.rnd.player
+        key = TreeCache.round_key(player_view(self.rnd))
+        # the key remains the same when the player plays cards
+        while self.rnd.nr_tricks < 3:
+            self._play_random(1)
+            if self.rnd.player == player:
+                self.assertEqual(key, TreeCache.round_key(player_view(self.rnd)))
+
+    def test_reuse(self):
+        cache = TreeCache(ISMCTS.advance_root)
+        # search a round with 2 cards left for each player, in which the player plays again after 4 cards
+        for seed in range(100):
+            self._deal(seed, HEARTS)
+            self._play_random(28)
+            player = self.rnd.player
+            player_rnd = player_view(self.rnd)
+            root = ISMCTS.search(player_rnd, budget=SearchBudget(simulations=3000, early_stop=False).start())
+            self._play_random(4)
+            if self.rnd.player == player:
+                break
+        cache.put(player_rnd, root)
+
+        player_rnd = player_view(self.rnd)
+        reused = cache.take(player_rnd)
+        self.assertIsNotNone(reused)
+        self.assertIsNone(reused.parent)
+        self.assertTrue(reused.visit_count > 0)
+        cards = TreeCache.played_cards(player_rnd)[28:32]
+        self.assertIs(root.childs[cards[0]].childs[cards[1]].childs[cards[2]].childs[cards[3]], reused)
+
+        # the tree was taken from the cache
+        self.assertIsNone(cache.take(player_rnd))
+
+    def test_other_round(self):
+        cache = TreeCache(ISMCTS.advance_root)
+        player_rnd = player_view(self.rnd)
+        cache.put(player_rnd, ISMCTS.search(player_rnd, budget=SearchBudget(simulations=10).start()))
+        self._deal(1, SPADES)
+        self.assertIsNone(cache.take(player_view(self.rnd)))
+
+    def test_bounded(self):
+        cache = TreeCache(ISMCTS.advance_root, max_rounds=2)
+        for trump in range(3):
+            self.setUp()
+            player_rnd = player_view(self.rnd)
+            player_rnd.trump = trump
+            cache.put(player_rnd, ISMCTS.search(player_rnd, budget=SearchBudget(simulations=10).start()))
+        self.assertEqual(2, len(cache._trees))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Player rounds for the tests of the players and of the player service.
+"""
+import numpy as np
+
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round import Round
+from source.jass.base.round_schieber import RoundSchieber
+
+
+def player_view(rnd: Round, player: int = None) -> PlayerRound:
+    """
+    Get the player round of a round.
+
+    Args:
+        rnd: the round
+        player: the player whose view is returned, None for the current player of the round. The view of another
+        player is the state while the current player decides, as seen by the other player.
+
+    Returns:
+        the player round
+    """
+    player_rnd = PlayerRound(jass_type=rnd.jass_type)
+    player_rnd.set_from_round(rnd)
+    if player is not None:
+        player_rnd.player = player
+        player_rnd.hand = rnd.hands[player].copy()
+    return player_rnd
+
+
+def player_round(nr_played_cards: int, seed: int = 0) -> PlayerRound:
+    """
+    Get the player round of a deal of the seed (dealer NORTH, trump DIAMONDS), in which the players always played
+    their first valid card.
+
+    Args:
+        nr_played_cards: the number of cards played in the round
+        seed: the seed of the deal
+
+    Returns:
+        the player round of the current player
+    """
+    np.random.seed(seed)
+    rnd = RoundSchieber(dealer=0)
+    rnd.deal_cards()
+    rnd.action_trump(0)
+    for _ in range(nr_played_cards):
+        rnd.action_play_card(np.flatnonzero(rnd.get_valid_cards())[0])
+    return player_view(rnd)
@@ -0,0 +1,91 @@
+import threading
+import unittest
+
+from source.jass.base.player_round import PlayerRound
+from source.jass.ion.player_round_serializer import PlayerRoundSerializer
+from source.jass.player.random_player_schieber import RandomPlayerSchieber
+from source.jass.player_service.decision_cache import DecisionCache
+from source.jass.player_service.metrics import EVENT_CACHE_HIT, EVENT_CACHE_MISS, EVENT_SINGLE_VALID_CARD
+from source.jass.player_service.player_service_app import PlayerServiceApp
+from player_rounds import player_round
+
+
+class CountingPlayer(RandomPlayerSchieber):
+    def __init__(self):
+        self.nr_cards = 0
+
+    def play_card(self, rnd: PlayerRound) -> int:
+        self.nr_cards += 1
+        return super().play_card(rnd)
+
+
+class DecisionCacheTestCase(unittest.TestCase):
+
+    def test_round_key(self):
+        self.assertEqual(DecisionCache.round_key(player_round(5)), DecisionCache.round_key(player_round(5)))
+        self.assertNotEqual(DecisionCache.round_key(player_round(5)), DecisionCache.round_key(player_round(6)))
+        self.assertNotEqual(DecisionCache.round_key(player_round(5)),
+                            DecisionCache.round_key(player_round(5, seed=1)))
+
+    def test_hits_and_bound(self):
+        cache = DecisionCache(max_entries=2)
+        future, is_new = cache.get_or_reserve('a', 'play_card', player_round(1))
+        self.assertTrue(is_new)
+        future.set_result(3)
+        future, is_new = cache.get_or_reserve('a', 'play_card', player_round(1))
+        self.assertFalse(is_new)
+        self.assertEqual(3, future.result())
+        # other player or method
+        self.assertTrue(cache.get_or_reserve('b', 'play_card', player_round(1))[1])
+        self.assertTrue(cache.get_or_reserve('a', 'select_trump', player_round(1))[1])
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(3, cache.misses)
+
+    def test_fail(self):
+        cache = DecisionCache()
+        future, _ = cache.get_or_reserve('a', 'play_card', player_round(1))
+        waiting, is_new = cache.get_or_reserve('a', 'play_card', player_round(1))
+        self.assertFalse(is_new)
+        cache.fail(future, ValueError('failed'))
+        with self.assertRaises(ValueError):
+            waiting.result()
+        # the decision is taken again by the next request
+        self.assertTrue(cache.get_or_reserve('a', 'play_card', player_round(1))[1])
+
+    def test_waiting_for_running_decision(self):
+        cache = DecisionCache()
+        future, _ = cache.get_or_reserve('a', 'play_card', player_round(1))
+        results = []
+        waiting = threading.Thread(
+            target=lambda: results.append(cache.get_or_reserve('a', 'play_card', player_round(1))[0].result(5)))
+        waiting.start()
+        future.set_result(7)
+        waiting.join(timeout=5)
+        self.assertEqual([7], results)
+
+    def test_app_repeated_request(self):
+        app = PlayerServiceApp('test_decision_cache')
+        player = CountingPlayer()
+        app.add_player('counting', player)
+        client = app.test_client()
+        data = PlayerRoundSerializer.player_round_to_dict(player_round(4))
+        cards = [client.post('/counting/play_card', json=data).get_json()['card'] for _ in range(3)]
+        self.assertEqual(1, player.nr_cards)
+        self.assertEqual(1, len(set(cards)))
+        self.assertEqual({EVENT_CACHE_MISS: 1, EVENT_CACHE_HIT: 2}, app.metrics.player('counting').events)
+
+    def test_app_single_valid_card(self):
+        app = PlayerServiceApp('test_decision_cache', decision_cache_size=0)
+        player = CountingPlayer()
+        app.add_player('counting', player)
+        player_rnd = player_round(35)
+        response = app.test_client().post('/counting/play_card',
+                                          json=PlayerRoundSerializer.player_round_to_dict(player_rnd))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(0, player.nr_cards)
+        self.assertEqual({EVENT_SINGLE_VALID_CARD: 1}, app.metrics.player('counting').events)
+
+
+if __name__ == '__main__':
+    unittest.main()
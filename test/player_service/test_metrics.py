@@ -0,0 +1,69 @@
+import unittest
+
+from source.jass.base.player_round import PlayerRound
+from source.jass.ion.player_round_serializer import PlayerRoundSerializer
+from source.jass.player.random_player_schieber import RandomPlayerSchieber
+from source.jass.player_service.metrics import Histogram, ServiceMetrics, ERROR_BUSY, ERROR_INVALID_REQUEST
+from source.jass.player_service.player_service_app import PlayerServiceApp
+from player_rounds import player_round
+
+
+class HistogramTestCase(unittest.TestCase):
+
+    def test_buckets(self):
+        histogram = Histogram([1.0, 2.0])
+        for value in [0.5, 1.0, 1.5, 3.0, 4.0]:
+            histogram.observe(value)
+        self.assertEqual(5, histogram.count)
+        self.assertAlmostEqual(10.0, histogram.sum)
+        self.assertAlmostEqual(2.0, histogram.mean)
+        self.assertEqual([[1.0, 2], [2.0, 1], [None, 2]], histogram.to_dict()['buckets'])
+
+    def test_empty(self):
+        histogram = Histogram([1.0])
+        self.assertEqual(0, histogram.count)
+        self.assertEqual(0.0, histogram.mean)
+
+
+class ServiceMetricsTestCase(unittest.TestCase):
+
+    def test_to_dict(self):
+        metrics = ServiceMetrics()
+        self.assertIs(metrics.player('a'), metrics.player('a'))
+        metrics.player('a').decision_seconds.observe(0.1)
+        metrics.player('a').add_error(ERROR_BUSY)
+        metrics.player('a').add_error(ERROR_BUSY)
+        data = metrics.to_dict()
+        self.assertEqual(['a'], list(data['players'].keys()))
+        self.assertEqual(1, data['players']['a']['decision_seconds']['count'])
+        self.assertEqual({ERROR_BUSY: 2}, data['players']['a']['errors'])
+
+    def test_app_metrics(self):
+        app = PlayerServiceApp('test_metrics')
+        app.add_player('random', RandomPlayerSchieber())
+        client = app.test_client()
+        response = client.post('/random/play_card',
+                               json=PlayerRoundSerializer.player_round_to_dict(player_round(4)))
+        self.assertEqual(200, response.status_code)
+        response = client.post('/random/play_card', json=dict(dealer=0))
+        self.assertEqual(400, response.status_code)
+
+        response = client.get('/metrics')
+        self.assertEqual(200, response.status_code)
+        data = response.get_json()['players']['random']
+        self.assertEqual(2, data['parse_seconds']['count'])
+        self.assertEqual(1, data['decision_seconds']['count'])
+        self.assertEqual(1, data['queue_wait_seconds']['count'])
+        self.assertEqual({ERROR_INVALID_REQUEST: 1}, data['errors'])
+
+    def test_app_busy(self):
+        app = PlayerServiceApp('test_metrics')
+        app.add_player('random', RandomPlayerSchieber(), max_concurrent=0, queue_depth=0)
+        response = app.test_client().post('/random/play_card',
+                                          json=PlayerRoundSerializer.player_round_to_dict(player_round(4)))
+        self.assertEqual(503, response.status_code)
+        self.assertEqual({ERROR_BUSY: 1}, app.metrics.player('random').errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,12 @@
 import unittest
 import json
 
-from source.jass.player_service.request_parser import PlayerRoundParser
+import numpy as np
+
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.ion.player_round_serializer import PlayerRoundSerializer
+from source.jass.player_service.request_parser import PlayerRoundParser, loads_request
 
 
 class RequestValidatorTest(unittest.TestCase):
@@ -207,6 +212,35 @@ class RequestValidatorTest(unittest.TestCase):
 
         rnd.assert_invariants()
 
+    def test_parse_same_as_serializer(self):
+        np.random.seed(11)
+        for trump in range(6):
+            rnd = RoundSchieber(dealer=trump % 4)
+            rnd.deal_cards()
+            rnd.action_trump(trump)
+            for nr_played_cards in range(36):
+                player_rnd = PlayerRound()
+                player_rnd.set_from_round(rnd)
+                request_dict = loads_request(json.dumps(PlayerRoundSerializer.player_round_to_dict(player_rnd)))
+                parser = PlayerRoundParser(request_dict)
+                self.assertTrue(parser.is_valid_request())
+                self.assertEqual(PlayerRoundSerializer.player_round_from_dict(request_dict), parser.get_parsed_round())
+                self.assertEqual(player_rnd.points_team_0, parser.get_parsed_round().points_team_0)
+                self.assertEqual(player_rnd.points_team_1, parser.get_parsed_round().points_team_1)
+                rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+
+    def test_parse_invalid_card(self):
+        request_data = '{"dealer":0,"tss":1,"tricks":[],"currentPlayer":3,"player":[{"hand":[]},' \
+                       '{"hand":[]},{"hand":[]},{"hand":["HJ","S9","SJ","C7","C8","HA",' \
+                       '"C6","H7","XX"]}],"jassTyp":"SCHIEBER_1000"}'
+        parser = PlayerRoundParser(loads_request(request_data))
+        self.assertFalse(parser.is_valid_request())
+        self.assertIn('KeyError', parser.get_error_message())
+
+    def test_loads_request_no_json(self):
+        self.assertIsNone(loads_request(b'i am not a json string'))
+        self.assertEqual(dict(dealer=1), loads_request(b'{"dealer": 1}'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+from source.jass.base.const import card_strings
+from source.jass.base.player_round import PlayerRound
+from source.jass.ion.player_round_serializer import PlayerRoundSerializer
+from source.jass.player.random_player_schieber import RandomPlayerSchieber
+from source.jass.player_service.metrics import ERROR_TIMEOUT
+from source.jass.player_service.player_service_app import PlayerServiceApp
+from player_rounds import player_round
+from source.jass.player_service.worker_pool import DecisionLimiter, PlayerBusyError, PlayerWorkerPool
+
+
+class SleepingPlayer(RandomPlayerSchieber):
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def play_card(self, rnd: PlayerRound) -> int:
+        time.sleep(self.seconds)
+        return super().play_card(rnd)
+
+
+class ExitingPlayer(RandomPlayerSchieber):
+    def play_card(self, rnd: PlayerRound) -> int:
+        # terminates the worker process abruptly
+        os._exit(1)
+
+
+class DecisionLimiterTestCase(unittest.TestCase):
+
+    def test_queue_depth(self):
+        limiter = DecisionLimiter(max_concurrent=1, queue_depth=1)
+        limiter.acquire()
+        self.assertEqual(1, limiter.nr_running)
+
+        # the second decision waits, the third is rejected
+        waiting = threading.Thread(target=lambda: (limiter.acquire(), limiter.release()))
+        waiting.start()
+        while limiter.nr_waiting == 0:
+            time.sleep(0.001)
+        with self.assertRaises(PlayerBusyError):
+            limiter.acquire()
+
+        limiter.release()
+        waiting.join(timeout=5)
+        self.assertFalse(waiting.is_alive())
+        self.assertEqual(0, limiter.nr_running)
+        self.assertEqual(0, limiter.nr_waiting)
+
+    def test_no_limit(self):
+        limiter = DecisionLimiter()
+        for _ in range(10):
+            limiter.acquire()
+        self.assertEqual(10, limiter.nr_running)
+
+
+class PlayerWorkerPoolTestCase(unittest.TestCase):
+
+    def test_decisions(self):
+        pool = PlayerWorkerPool(dict(random=RandomPlayerSchieber()), max_workers=2)
+        try:
+            pool.start()
+            self.assertTrue(pool.is_started)
+            player_rnd = player_round(6)
+            card = pool.submit('random', 'play_card', player_rnd).result(timeout=30).result
+            self.assertEqual(1, player_rnd.get_valid_cards()[card])
+        finally:
+            pool.shutdown()
+        self.assertFalse(pool.is_started)
+
+    def test_broken_workers(self):
+        pool = PlayerWorkerPool(dict(exiting=ExitingPlayer(), random=RandomPlayerSchieber()), max_workers=1)
+        try:
+            player_rnd = player_round(6)
+            with self.assertRaises(BrokenProcessPool):
+                pool.submit('exiting', 'play_card', player_rnd).result(timeout=30)
+            # the worker processes are started again for the next decision
+            card = pool.submit('random', 'play_card', player_rnd).result(timeout=30).result
+            self.assertEqual(1, player_rnd.get_valid_cards()[card])
+        finally:
+            pool.shutdown()
+
+    def test_app_timeout(self):
+        app = PlayerServiceApp('test_worker_pool', nr_workers=1, decision_timeout=0.1, decision_cache_size=0)
+        app.add_player('sleeping', SleepingPlayer(1.0), max_concurrent=1, queue_depth=0)
+        try:
+            app.start_workers()
+            client = app.test_client()
+            data = PlayerRoundSerializer.player_round_to_dict(player_round(4))
+            self.assertEqual(500, client.post('/sleeping/play_card', json=data).status_code)
+            self.assertEqual({ERROR_TIMEOUT: 1}, app.metrics.player('sleeping').errors)
+
+            # the decision is still running in the worker and counts against the limit of the player
+            self.assertEqual(1, app.limiters['sleeping'].nr_running)
+            self.assertEqual(503, client.post('/sleeping/play_card', json=data).status_code)
+            end = time.time() + 30
+            while app.limiters['sleeping'].nr_running > 0 and time.time() < end:
+                time.sleep(0.01)
+            self.assertEqual(0, app.limiters['sleeping'].nr_running)
+        finally:
+            app.worker_pool.shutdown()
+
+    def test_app_routes(self):
+        app = PlayerServiceApp('test_worker_pool', nr_workers=1)
+        app.add_player('random', RandomPlayerSchieber(), max_concurrent=1, queue_depth=1)
+        try:
+            client = app.test_client()
+            player_rnd = player_round(4)
+            response = client.post('/random/play_card',
+                                   json=PlayerRoundSerializer.player_round_to_dict(player_rnd))
+            self.assertEqual(200, response.status_code)
+            card = card_strings.tolist().index(response.get_json()['card'])
+            self.assertEqual(1, player_rnd.get_valid_cards()[card])
+
+            with self.assertRaises(RuntimeError):
+                app.add_player('other', RandomPlayerSchieber())
+        finally:
+            app.worker_pool.shutdown()
+
+    def test_app_busy(self):
+        app = PlayerServiceApp('test_worker_pool')
+        app.add_player('random', RandomPlayerSchieber(), max_concurrent=0, queue_depth=0)
+        player_rnd = player_round(4)
+        response = app.test_client().post('/random/play_card',
+                                          json=PlayerRoundSerializer.player_round_to_dict(player_rnd))
+        self.assertEqual(503, response.status_code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,323 @@
+# HSLU
+#
+# Created on 18.10.2026
+#
+"""
+Benchmarks of the hot paths of the game core and of the searches.
+
+Each benchmark prepares its input with a fixed seed and measures the rate (operations per second) of one operation,
+the best rate of a number of repetitions is reported. The results are written as json and can be compared to the
+results of a previous run (the baseline), to see if a change is actually faster.
+
+Example (from the root of the repository):
+    PYTHONPATH=source:. python tools/benchmark.py --output baseline.json
+    PYTHONPATH=source:. python tools/benchmark.py --baseline baseline.json --max_regression 0.1
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from source.jass.base.batch_playout import play_random_batch
+from source.jass.base.const import *
+from source.jass.base.player_round import PlayerRound
+from source.jass.base.round_schieber import RoundSchieber
+from source.jass.base.rule_schieber import RuleSchieber
+from source.jass.ion.log_parser_swisslos import LogParserSwisslos
+from source.jass.ion.round_serializer import RoundSerializer
+from source.jass.player.constraint_sampler import sample_hands
+from source.jass.ion.player_round_serializer import PlayerRoundSerializer
+from source.jass.player.search_budget import SearchBudget
+from source.jass.player_service.request_parser import PlayerRoundParser, loads_request
+
+
+def _random_round(trump: int) -> RoundSchieber:
+    # a round with random cards, where the trump has been declared by the forehand player
+    rnd = RoundSchieber(dealer=random.randrange(4))
+    rnd.deal_cards()
+    rnd.action_trump(trump)
+    return rnd
+
+
+def _play_random_card(rnd: RoundSchieber) -> None:
+    rnd.action_play_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+
+
+def _complete_rounds(nr_rounds: int) -> list:
+    # complete rounds with random trumps and random valid cards
+    rounds = []
+    for _ in range(nr_rounds):
+        rnd = _random_round(random.randrange(MAX_TRUMP + 1))
+        for _ in range(36):
+            _play_random_card(rnd)
+        rounds.append(rnd)
+    return rounds
+
+
+def _player_rounds(nr_rounds: int, trump: int = None, nr_played_cards: int = None) -> list:
+    # player rounds of rounds with random valid cards, at random positions or after the number of cards
+    player_rnds = []
+    for _ in range(nr_rounds):
+        rnd = _random_round(random.randrange(MAX_TRUMP + 1) if trump is None else trump)
+        for _ in range(random.randrange(36) if nr_played_cards is None else nr_played_cards):
+            _play_random_card(rnd)
+        player_rnd = PlayerRound()
+        player_rnd.set_from_round(rnd)
+        player_rnds.append(player_rnd)
+    return player_rnds
+
+
+def bench_valid_cards(scale: float, trump: int):
+    """
+    RuleSchieber.get_valid_cards for the positions of random rounds with the trump.
+    """
+    rule = RuleSchieber()
+    positions = [(rnd.hand, rnd.current_trick, rnd.nr_cards_in_trick, rnd.trump)
+                 for rnd in _player_rounds(int(500 * scale), trump)]
+    nr_repetitions = 20
+    start = time.perf_counter()
+    for _ in range(nr_repetitions):
+        for hand, current_trick, move_nr, trump_of_round in positions:
+            rule.get_valid_cards(hand, current_trick, move_nr, trump_of_round)
+    return nr_repetitions * len(positions), time.perf_counter() - start, 'calls/s'
+
+
+def bench_round_play(scale: float):
+    """
+    Round.action_play_card, replaying complete rounds from the deal.
+    """
+    rounds = []
+    for rnd in _complete_rounds(int(200 * scale)):
+        hands = np.zeros([4, 36], dtype=np.int32)
+        for trick, first_player in zip(rnd.tricks, rnd.trick_first_player):
+            for i, card in enumerate(trick):
+                hands[(first_player - i) % 4, card] = 1
+        rounds.append((rnd.dealer, rnd.trump, hands, rnd.tricks.flatten().tolist()))
+
+    start = time.perf_counter()
+    for dealer, trump, hands, cards in rounds:
+        rnd = RoundSchieber(dealer=dealer)
+        rnd.set_hands(hands)
+        rnd.action_trump(trump)
+        for card in cards:
+            rnd.action_play_card(card)
+    return len(rounds), time.perf_counter() - start, 'rounds/s'
+
+
+def bench_player_round_from_complete_round(scale: float):
+    """
+    PlayerRound.from_complete_round for all the cards of complete rounds.
+    """
+    rounds = _complete_rounds(int(100 * scale))
+    start = time.perf_counter()
+    for rnd in rounds:
+        for cards_played in range(36):
+            PlayerRound.from_complete_round(rnd, cards_played)
+    return 36 * len(rounds), time.perf_counter() - start, 'player rounds/s'
+
+
+def bench_random_playouts(scale: float):
+    """
+    Random playouts to the end of the round with Round.push_card and pop_card (as used by the searches).
+    """
+    rounds = [_random_round(random.randrange(MAX_TRUMP + 1)) for _ in range(int(100 * scale))]
+    start = time.perf_counter()
+    for rnd in rounds:
+        for _ in range(36):
+            rnd.push_card(np.random.choice(np.flatnonzero(rnd.get_valid_cards())))
+        for _ in range(36):
+            rnd.pop_card()
+    return len(rounds), time.perf_counter() - start, 'playouts/s'
+
+
+def bench_random_playouts_batch(scale: float):
+    """
+    Vectorized random playouts of sampled hands with play_random_batch.
+    """
+    player_rnds = _player_rounds(int(20 * scale))
+    rng = np.random.default_rng(0)
+    hands = [sample_hands(player_rnd, 256, rng) for player_rnd in player_rnds]
+    start = time.perf_counter()
+    for player_rnd, hands_of_round in zip(player_rnds, hands):
+        play_random_batch(player_rnd, hands_of_round, rng)
+    return 256 * len(player_rnds), time.perf_counter() - start, 'playouts/s'
+
+
+def bench_mcts(scale: float):
+    """
+    Simulations of the monte carlo tree search of jass.player.mcts.
+    """
+    from source.jass.player.mcts.mcts import MCTS
+    player_rnds = _player_rounds(int(5 * scale), nr_played_cards=0)
+    nr_simulations = 0
+    start = time.perf_counter()
+    for player_rnd in player_rnds:
+        budget = SearchBudget(simulations=500, early_stop=False).start()
+        nr_simulations += MCTS.monte_carlo_tree_search(player_rnd, budget=budget).visit_count
+    return nr_simulations, time.perf_counter() - start, 'simulations/s'
+
+
+def bench_eva_mcts(scale: float):
+    """
+    Simulations of the monte carlo tree search of jass.player.eva_mcts.
+    """
+    from source.jass.player.eva_mcts.mcts import MCTS
+    player_rnds = _player_rounds(int(5 * scale), nr_played_cards=0)
+    nr_simulations = 0
+    start = time.perf_counter()
+    for player_rnd in player_rnds:
+        budget = SearchBudget(simulations=500, early_stop=False).start()
+        nr_simulations += MCTS.monte_carlo_tree_search(player_rnd, budget=budget).action.visit_count
+    return nr_simulations, time.perf_counter() - start, 'simulations/s'
+
+
+def bench_log_parsing(scale: float):
+    """
+    LogParserSwisslos.parse_rounds on a log file of random rounds in the format of Swisslos.
+    """
+    rounds = _complete_rounds(int(200 * scale))
+    file, filename = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(file, 'w') as log:
+            for rnd in rounds:
+                line = dict(rounds=[RoundSerializer.round_to_dict(rnd)], players=[1, 2, 3, 4])
+                log.write('24.10.17 13:15:50,779 | INFO |  |  |  |  | {}\n'.format(json.dumps(line)))
+        start = time.perf_counter()
+        nr_rounds = len(LogParserSwisslos.parse_rounds(filename))
+        return nr_rounds, time.perf_counter() - start, 'rows/s'
+    finally:
+        os.remove(filename)
+
+
+def _requests(scale: float) -> list:
+    # json data of play_card requests at random positions
+    return [json.dumps(PlayerRoundSerializer.player_round_to_dict(player_rnd)).encode()
+            for player_rnd in _player_rounds(int(500 * scale))]
+
+
+def bench_request_parsing_serializer(scale: float):
+    """
+    Decoding and parsing of play_card requests as before the fast parser: json and PlayerRoundSerializer.
+    """
+    requests = _requests(scale)
+    start = time.perf_counter()
+    for data in requests:
+        PlayerRoundSerializer.player_round_from_dict(json.loads(data)).assert_invariants()
+    return len(requests), time.perf_counter() - start, 'requests/s'
+
+
+def bench_request_parsing(scale: float):
+    """
+    Decoding and parsing of play_card requests with loads_request and PlayerRoundParser, as in the player service.
+    """
+    requests = _requests(scale)
+    start = time.perf_counter()
+    for data in requests:
+        PlayerRoundParser(loads_request(data))
+    return len(requests), time.perf_counter() - start, 'requests/s'
+
+
+BENCHMARKS = {
+    **{'valid_cards_{}'.format(trump_strings_short[trump]): (lambda scale, trump=trump: bench_valid_cards(scale, trump))
+       for trump in range(MAX_TRUMP + 1)},
+    'round_play': bench_round_play,
+    'player_round_from_complete_round': bench_player_round_from_complete_round,
+    'random_playouts': bench_random_playouts,
+    'random_playouts_batch': bench_random_playouts_batch,
+    'mcts': bench_mcts,
+    'eva_mcts': bench_eva_mcts,
+    'log_parsing': bench_log_parsing,
+    'request_parsing_serializer': bench_request_parsing_serializer,
+    'request_parsing': bench_request_parsing,
+}
+
+
+def run_benchmarks(names: [str], seed: int = 0, scale: float = 1.0, repeat: int = 3) -> dict:
+    """
+    Run benchmarks.
+
+    Args:
+        names: the names of the benchmarks (keys of BENCHMARKS)
+        seed: the seed of the random generators, set before each repetition
+        scale: factor for the size of the inputs of the benchmarks
+        repeat: the number of repetitions, the best rate is reported
+
+    Returns:
+        dict with the rate, unit, count and time of the best repetition for each benchmark
+    """
+    results = {}
+    for name in names:
+        best = None
+        for _ in range(repeat):
+            random.seed(seed)
+            np.random.seed(seed)
+            # the searches print information about each search
+            with contextlib.redirect_stdout(io.StringIO()):
+                count, seconds, unit = BENCHMARKS[name](scale)
+            rate = count / seconds if seconds > 0 else float('inf')
+            if best is None or rate > best['rate']:
+                best = dict(rate=rate, unit=unit, count=count, seconds=seconds)
+        results[name] = best
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict) -> dict:
+    """
+    Add the rate of the baseline and the speedup (rate / rate of the baseline) to the results of each benchmark
+    that is also in the baseline.
+    """
+    for name, result in results.items():
+        if name in baseline:
+            result['baseline_rate'] = baseline[name]['rate']
+            result['speedup'] = result['rate'] / baseline[name]['rate']
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the game core and the searches')
+    parser.add_argument('benchmarks', type=str, nargs='*', help='The benchmarks to run (default all): {}'.format(
+        ', '.join(BENCHMARKS.keys())))
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random generators')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor for the size of the benchmarks')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of repetitions, the best rate is reported')
+    parser.add_argument('--output', type=str, help='Write the results to this json file')
+    parser.add_argument('--baseline', type=str, help='Json file with the results to compare to')
+    parser.add_argument('--max_regression', type=float,
+                        help='Exit with an error if a rate is lower than the baseline by more than this fraction')
+    args = parser.parse_args()
+
+    names = args.benchmarks if args.benchmarks else list(BENCHMARKS.keys())
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error('Unknown benchmarks: {}'.format(', '.join(unknown)))
+
+    results = run_benchmarks(names, seed=args.seed, scale=args.scale, repeat=args.repeat)
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            compare_to_baseline(results, json.load(file)['results'])
+
+    report = dict(seed=args.seed, scale=args.scale, repeat=args.repeat,
+                  python=platform.python_version(), numpy=np.__version__, results=results)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline and args.max_regression is not None:
+        regressions = [name for name, result in results.items()
+                       if 'speedup' in result and result['speedup'] < 1 - args.max_regression]
+        if regressions:
+            print('Regressions: {}'.format(', '.join(regressions)), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()